@@ -0,0 +1,435 @@
+"""
+===========================================================
+ARMAZENAMENTO COLUNAR DE PRODUTOS
+
+Descrição:
+    Módulo que implementa o `ProductStore`, estrutura compacta
+    que guarda os produtos carregados do banco em colunas:
+
+    - codigos: array('q') ORDENADO com os códigos de busca
+    - precos: array('d') com os preços, alinhado aos códigos
+    - nomes: coluna codificada por dicionário (`NomesCodificados`):
+      tabela com os nomes distintos (e suas formas em minúsculas)
+      e um array('i') com o identificador do nome de cada linha.
+      Os nomes são combinações de tipo, marca e modelo, então
+      poucos milhares de strings atendem a milhões de linhas
+
+    Todas as consultas são feitas por POSIÇÃO: a posição de um
+    código na coluna `codigos` é a mesma do seu preço e do seu
+    nome nas demais colunas. Isso substitui as três estruturas
+    paralelas (lista, dicionário e lista de tuplas) usadas
+    anteriormente, evitando três cópias de cada linha como
+    objetos Python.
+
+Atualização incremental:
+    Cada produto é identificado por uma LINHA estável (índice
+    em `nomes` e `precos`), usada também pelos índices de nome.
+    Logo após a carga, a linha é a própria posição na coluna
+    ordenada. A primeira alteração estrutural (inserção,
+    remoção ou troca de código) materializa:
+
+    - linhas: array('i') posição ordenada -> linha
+    - codigos_linha: array('q') linha -> código
+
+    A partir daí, novos produtos são acrescentados ao fim das
+    colunas (linhas novas) e os removidos viram lápides (nome
+    vazio), enquanto `codigos`/`linhas` continuam ordenados por
+    código. Assim, as linhas já existentes nunca mudam e os
+    índices só precisam tratar os produtos alterados.
+
+===========================================================
+"""
+
+
+from array import array
+from bisect import bisect_left
+from src.buscas import busca_binaria, busca_linear, buscar_lote
+from src.metricas import cronometrar
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+# Acima deste número de posições alteradas, as colunas ordenadas
+# são reconstruídas em uma única passada (cópias de fatias), em
+# vez de um insert/del (deslocamento da coluna inteira) por item.
+LIMITE_ALTERACAO_INDIVIDUAL = 16
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES DAS COLUNAS ORDENADAS
+# ===========================================================
+
+
+def _excluir_posicoes(coluna, posicoes):
+    """
+    Retorna a coluna sem as posições (ordenadas, sem repetição).
+    """
+
+    if len(posicoes) <= LIMITE_ALTERACAO_INDIVIDUAL:
+        for posicao in reversed(posicoes):
+            del coluna[posicao]
+        return coluna
+
+    nova = array(coluna.typecode)
+    anterior = 0
+    for posicao in posicoes:
+        nova += coluna[anterior:posicao]
+        anterior = posicao + 1
+    nova += coluna[anterior:]
+    return nova
+
+
+def _inserir_posicoes(coluna, posicoes, valores):
+    """
+    Retorna a coluna com cada valor inserido antes da posição
+    correspondente da coluna original (posições não decrescentes).
+    """
+
+    if len(posicoes) <= LIMITE_ALTERACAO_INDIVIDUAL:
+        for deslocamento, (posicao, valor) in enumerate(zip(posicoes, valores)):
+            coluna.insert(posicao + deslocamento, valor)
+        return coluna
+
+    nova = array(coluna.typecode)
+    anterior = 0
+    for posicao, valor in zip(posicoes, valores):
+        nova += coluna[anterior:posicao]
+        nova.append(valor)
+        anterior = posicao
+    nova += coluna[anterior:]
+    return nova
+
+
+# ===========================================================
+# CLASSE: NomesCodificados
+# ===========================================================
+
+
+class NomesCodificados:
+    """
+    Coluna de nomes codificada por dicionário.
+
+    Comporta-se como uma sequência de strings (`nomes[linha]`),
+    mas guarda cada nome distinto uma única vez.
+
+    Atributos:
+        distintos (list): nome de cada identificador
+        minusculos (list): `distintos` em minúsculas (usado pela
+            busca textual, que confere cada nome distinto uma vez)
+        identificadores (array | memoryview): identificador do
+            nome de cada linha (int32)
+    """
+
+    def __init__(self, distintos=(), identificadores=None, minusculos=None):
+        """
+        Parâmetros:
+            distintos (iterable): tabela de nomes já pronta
+            identificadores (array | memoryview | None): coluna de
+                identificadores (ex.: visão de um snapshot)
+            minusculos (list | None): `distintos` já em minúsculas
+        """
+
+        self.distintos = list(distintos)
+        self.minusculos = [nome.lower() for nome in self.distintos] if minusculos is None else minusculos
+        self.identificadores = array("i") if identificadores is None else identificadores
+        # nome -> identificador, criado apenas na primeira escrita
+        self._indices = None
+
+    def __len__(self):
+        return len(self.identificadores)
+
+    def __getitem__(self, linha):
+        return self.distintos[self.identificadores[linha]]
+
+    def __setitem__(self, linha, nome):
+        self.identificadores[linha] = self.codificar(nome)
+
+    def __iter__(self):
+        return map(self.distintos.__getitem__, self.identificadores)
+
+    def _tabela(self):
+        """
+        Retorna o dicionário nome -> identificador (criado sob demanda).
+        """
+
+        if self._indices is None:
+            self._indices = {nome: indice for indice, nome in enumerate(self.distintos)}
+        return self._indices
+
+    def codificar(self, nome):
+        """
+        Retorna o identificador do nome, incluindo-o na tabela se
+        ainda não existir.
+        """
+
+        indices = self._tabela()
+        indice = indices.get(nome)
+        if indice is None:
+            # Minúsculas antes do nome: leitores em outras threads
+            # nunca veem um identificador sem forma minúscula
+            self.minusculos.append(nome.lower())
+            indice = indices[nome] = len(self.distintos)
+            self.distintos.append(nome)
+        return indice
+
+    def extend(self, nomes):
+        """
+        Acrescenta os nomes de várias linhas.
+        """
+
+        indices, codificar = self._tabela(), self.codificar
+        self.identificadores.extend([indices[nome] if nome in indices else codificar(nome) for nome in nomes])
+
+    def tornar_mutavel(self):
+        """
+        Copia para a memória os identificadores de um snapshot.
+        """
+
+        if not isinstance(self.identificadores, array):
+            self.identificadores = array("i", self.identificadores)
+
+
+# ===========================================================
+# CLASSE: ProductStore
+# ===========================================================
+
+
+class ProductStore:
+    """
+    Armazenamento colunar dos produtos, ordenado por código de busca.
+
+    Atributos:
+        codigos (array | memoryview): códigos de busca em ordem crescente
+        precos (array | memoryview): preço de cada linha
+        nomes (NomesCodificados): nome de cada linha
+        linhas (array | None): linha de cada posição ordenada (None
+            enquanto posição e linha coincidem)
+        versao (tuple | None): (época, versão) do registro de
+            alterações do banco refletido nos dados (ver
+            `src.atualizacao`)
+    """
+
+    def __init__(self, codigos=None, precos=None, nomes=None):
+        """
+        Parâmetros:
+            codigos, precos, nomes: colunas já prontas (por exemplo,
+                visões de um snapshot mapeado em memória). Quando
+                omitidas, o armazenamento começa vazio.
+        """
+
+        self.codigos = array("q") if codigos is None else codigos
+        self.precos = array("d") if precos is None else precos
+        self.nomes = NomesCodificados() if nomes is None else nomes
+        # mmap de origem quando as colunas vêm de um snapshot
+        self.mapa = None
+        self.linhas = None
+        self.codigos_linha = None
+        self.versao = None
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __iter__(self):
+        """
+        Percorre os produtos em ordem de código.
+
+        Retorna:
+            iterador de tuple(str, float, int): (nome, preço, código)
+        """
+
+        if self.linhas is None:
+            return zip(self.nomes, self.precos, self.codigos)
+        nomes, precos = self.nomes, self.precos
+        return ((nomes[linha], precos[linha], codigo) for codigo, linha in zip(self.codigos, self.linhas))
+
+    def adicionar_lote(self, linhas):
+        """
+        Acrescenta um lote de linhas ao final das colunas.
+
+        Parâmetros:
+            linhas (list): tuplas (codigo, nome, preco) já ordenadas
+                por código e maiores que qualquer código existente
+        """
+
+        # Os códigos são estendidos por último: enquanto a carga
+        # acontece em segundo plano, toda posição visível na coluna
+        # de códigos já possui nome e preço nas demais colunas.
+        self.nomes.extend([linha[1] for linha in linhas])
+        self.precos.extend(linha[2] for linha in linhas)
+        self.codigos.extend(linha[0] for linha in linhas)
+
+    def localizar(self, codigo):
+        """
+        Localiza a linha de um código pela coluna ordenada.
+
+        Parâmetros:
+            codigo (int): código de busca
+
+        Retorna:
+            int | None: linha do produto ou None se não existir
+        """
+
+        posicao = bisect_left(self.codigos, codigo)
+        if posicao < len(self.codigos) and self.codigos[posicao] == codigo:
+            return posicao if self.linhas is None else self.linhas[posicao]
+        return None
+
+    def produto(self, linha):
+        """
+        Retorna os dados do produto de uma linha.
+
+        Parâmetros:
+            linha (int): linha do produto (igual à posição enquanto
+                o armazenamento não sofreu alterações)
+
+        Retorna:
+            tuple(str, float, int): (nome, preço, código)
+        """
+
+        codigos = self.codigos if self.codigos_linha is None else self.codigos_linha
+        return self.nomes[linha], self.precos[linha], codigos[linha]
+
+    @cronometrar("busca_codigo", motor="linear")
+    def busca_linear(self, codigo, cancelado=None):
+        """
+        Busca linear do código na coluna ordenada (comparativo da interface).
+
+        Parâmetros:
+            cancelado (threading.Event | None): interrompe a varredura
+
+        Retorna:
+            tuple(bool, int): (encontrado, passos)
+        """
+
+        return busca_linear(self.codigos, codigo, cancelado)
+
+    @cronometrar("busca_codigo", motor="binaria")
+    def busca_binaria(self, codigo):
+        """
+        Busca binária do código na coluna ordenada (comparativo da interface).
+
+        Retorna:
+            tuple(bool, int): (encontrado, passos)
+        """
+
+        return busca_binaria(self.codigos, codigo)
+
+    @cronometrar("busca_codigo", motor="lote")
+    def buscar_lote(self, codigos):
+        """
+        Busca vários códigos de uma vez na coluna ordenada (`buscar_lote`).
+
+        Retorna:
+            tuple(list, int): produto (nome, preço, código) de cada
+                código, na ordem recebida (None se não existir), e
+                total de passos
+        """
+
+        _, posicoes, passos = buscar_lote(self.codigos, codigos)
+        linhas = self.linhas
+        return [None if posicao < 0 else self.produto(posicao if linhas is None else linhas[posicao])
+                for posicao in posicoes], passos
+
+    # -------------------------------------------------------
+    # Alterações incrementais
+    # -------------------------------------------------------
+
+    def _tornar_mutavel(self):
+        """
+        Copia para a memória as colunas de um snapshot (visões
+        somente leitura do arquivo).
+        """
+
+        if not isinstance(self.codigos, array):
+            codigos, precos = array("q"), array("d")
+            codigos.frombytes(self.codigos.cast("B"))
+            precos.frombytes(self.precos.cast("B"))
+            self.nomes.tornar_mutavel()
+            self.precos, self.codigos = precos, codigos
+            self.mapa = None
+
+    def _materializar_linhas(self):
+        """
+        Cria o mapeamento posição -> linha (e linha -> código)
+        antes da primeira alteração na ordem.
+        """
+
+        if self.linhas is None:
+            self.codigos_linha = array("q", self.codigos)
+            self.linhas = array("i", range(len(self.codigos)))
+
+    @cronometrar("atualizacao")
+    def aplicar_alteracoes(self, removidas=(), novas=(), alteradas=()):
+        """
+        Aplica um lote de alterações, com custo proporcional ao lote
+        (mais, no máximo, uma cópia das colunas ordenadas).
+
+        Parâmetros:
+            removidas (iterable): linhas removidas
+            novas (iterable): tuplas (codigo, nome, preco) inseridas
+            alteradas (iterable): tuplas (linha, codigo, nome, preco)
+                com os novos dados de produtos existentes
+
+        Retorna:
+            list: linhas atribuídas aos produtos novos, na ordem de `novas`
+        """
+
+        removidas, novas, alteradas = list(removidas), list(novas), list(alteradas)
+        if not (removidas or novas or alteradas):
+            return []
+
+        self._tornar_mutavel()
+
+        # Alterações de nome e preço não mexem na ordem
+        for linha, codigo, nome, preco in alteradas:
+            self.precos[linha] = preco
+            self.nomes[linha] = nome
+        reposicionadas = [(linha, codigo) for linha, codigo, _, _ in alteradas
+                          if codigo != self.produto(linha)[2]]
+        if not (removidas or novas or reposicionadas):
+            return []
+
+        self._materializar_linhas()
+
+        # 1. Retira da ordem as linhas removidas e as que trocaram de código
+        saindo = removidas + [linha for linha, _ in reposicionadas]
+        if saindo:
+            posicoes = sorted(bisect_left(self.codigos, self.codigos_linha[linha]) for linha in saindo)
+            self.codigos = _excluir_posicoes(self.codigos, posicoes)
+            self.linhas = _excluir_posicoes(self.linhas, posicoes)
+        for linha in removidas:
+            self.nomes[linha] = ""  # lápide: não gera tokens nos índices
+            self.codigos_linha[linha] = -1
+
+        # 2. Acrescenta as linhas novas ao fim das colunas
+        primeira = len(self.nomes)
+        linhas_novas = list(range(primeira, primeira + len(novas)))
+        self.nomes.extend([nome for _, nome, _ in novas])
+        self.precos.extend(preco for _, _, preco in novas)
+        self.codigos_linha.extend(codigo for codigo, _, _ in novas)
+        for linha, codigo in reposicionadas:
+            self.codigos_linha[linha] = codigo
+
+        # 3. Insere na ordem os códigos novos e os trocados
+        entrando = sorted([(codigo, linha) for linha, codigo in reposicionadas] +
+                          [(codigo, linha) for linha, (codigo, _, _) in zip(linhas_novas, novas)])
+        posicoes = [bisect_left(self.codigos, codigo) for codigo, _ in entrando]
+        self.codigos = _inserir_posicoes(self.codigos, posicoes, [codigo for codigo, _ in entrando])
+        self.linhas = _inserir_posicoes(self.linhas, posicoes, [linha for _, linha in entrando])
+        return linhas_novas
+
+    def compactado(self):
+        """
+        Retorna uma cópia sem lápides, com linha = posição ordenada
+        (formato esperado pelo snapshot).
+        """
+
+        if self.linhas is None:
+            return self
+        compacto = ProductStore()
+        compacto.adicionar_lote([(codigo, nome, preco) for nome, preco, codigo in self])
+        compacto.versao = self.versao
+        return compacto
@@ -0,0 +1,375 @@
+"""
+===========================================================
+ATUALIZAÇÃO INCREMENTAL DOS DADOS EM MEMÓRIA
+
+Descrição:
+    Módulo que reflete no `ProductStore` (e nos índices textual
+    e de preços) as alterações feitas no banco depois da carga, sem recarregar
+    a tabela inteira.
+
+    Rastreamento no banco:
+        Ativado explicitamente (`python -m src.atualizacao`); a
+        carga dos dados nunca altera o banco. Gatilhos em
+        'produtos' registram cada INSERT, UPDATE e
+        DELETE na tabela 'produtos_alteracoes', com uma versão
+        crescente (AUTOINCREMENT), o id_produto e o código de
+        busca anterior à alteração. A tabela
+        'produtos_rastreamento' guarda uma "época" aleatória,
+        sorteada quando o rastreamento é criado: se o banco for
+        recriado (popular_database.py), a época muda e a
+        atualização incremental deixa de ser possível.
+
+    Aplicação:
+        A carga registra em `produtos.versao` a (época, versão)
+        vista na mesma transação de leitura dos dados. Para
+        atualizar, leem-se apenas as entradas posteriores, os
+        produtos afetados são relidos pelo id_produto e o lote é
+        aplicado com `ProductStore.aplicar_alteracoes`. O custo
+        depende do número de produtos alterados, não do tamanho
+        da tabela.
+
+    A leitura (`ler_alteracoes`) pode rodar em segundo plano;
+    a aplicação (`aplicar_alteracoes`) deve ocorrer sem buscas
+    em andamento sobre os mesmos dados.
+
+    Limites do registro:
+        Acima de MAXIMO_ALTERACOES entradas pendentes (ex.: um
+        UPDATE em todo o catálogo), reler os produtos um a um
+        custa mais do que recarregar a tabela, e a leitura lança
+        `RecargaNecessaria`. Por isso o registro só é podado
+        (`podar_alteracoes`) quando passa de LIMITE_REGISTRO
+        entradas, mantendo as MAXIMO_ALTERACOES mais recentes:
+        todo processo que ainda poderia se atualizar continua
+        podendo, e abaixo do limite a atualização não grava nada
+        no banco (que, sem mudar, mantém o snapshot válido). Como
+        as versões restantes seguem contíguas, um processo com uma
+        versão mais antiga que a poda detecta a lacuna e também
+        recebe `RecargaNecessaria`.
+
+Uso:
+    python -m src.atualizacao                      # ativa em db/ecommerce.db
+    python -m src.atualizacao --banco outro.db
+    python -m src.atualizacao --podar              # poda o registro agora
+
+===========================================================
+"""
+
+
+import argparse
+import os
+import random
+import sqlite3
+from collections import namedtuple
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+TAMANHO_LOTE_IDS = 500
+MAXIMO_ALTERACOES = 100_000
+LIMITE_REGISTRO = 2 * MAXIMO_ALTERACOES
+
+ESQUEMA_RASTREAMENTO = [
+    """CREATE TABLE IF NOT EXISTS produtos_alteracoes (
+        versao INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_produto INTEGER NOT NULL,
+        codigo_antigo INTEGER
+    )""",
+    "CREATE TABLE IF NOT EXISTS produtos_rastreamento (epoca INTEGER NOT NULL)",
+    """CREATE TRIGGER IF NOT EXISTS produtos_alteracoes_ai AFTER INSERT ON produtos BEGIN
+        INSERT INTO produtos_alteracoes (id_produto, codigo_antigo) VALUES (new.id_produto, NULL);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS produtos_alteracoes_au AFTER UPDATE ON produtos BEGIN
+        INSERT INTO produtos_alteracoes (id_produto, codigo_antigo) VALUES (old.id_produto, old.codigo_busca);
+        INSERT INTO produtos_alteracoes (id_produto, codigo_antigo)
+        SELECT new.id_produto, NULL WHERE new.id_produto != old.id_produto;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS produtos_alteracoes_ad AFTER DELETE ON produtos BEGIN
+        INSERT INTO produtos_alteracoes (id_produto, codigo_antigo) VALUES (old.id_produto, old.codigo_busca);
+    END""",
+]
+
+
+# Alterações lidas do banco, prontas para aplicar:
+#   versao: (época, versão) alcançada após aplicá-las
+#   produtos: lista de (codigo_carregado, linha_atual), onde
+#       codigo_carregado é o código do produto quando os dados em
+#       memória foram lidos (None se ele ainda não existia) e
+#       linha_atual é (codigo, nome, preco) ou None se removido
+Alteracoes = namedtuple("Alteracoes", ["versao", "produtos"])
+
+
+class RecargaNecessaria(Exception):
+    """
+    Sinaliza que os dados não podem ser atualizados de forma
+    incremental (banco recriado, sem rastreamento, registro podado
+    ou alterações demais) e precisam ser recarregados com
+    `carregar_dados`.
+    """
+
+
+# ===========================================================
+# RASTREAMENTO NO BANCO
+# ===========================================================
+
+
+def preparar_rastreamento(caminho_db):
+    """
+    Cria a tabela de alterações e os gatilhos, se não existirem.
+
+    Retorna:
+        bool: True se o rastreamento está ativo (False se o banco
+            não pôde ser alterado, por exemplo, somente leitura)
+    """
+
+    conn = sqlite3.connect(caminho_db, isolation_level=None)
+    try:
+        # Nada é gravado quando tudo já existe (o banco não muda)
+        existentes = {nome for (nome,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'produtos_alteracoes%' "
+            "OR name = 'produtos_rastreamento'")}
+        if len(existentes) == 5:
+            return True
+        conn.execute("BEGIN")
+        for comando in ESQUEMA_RASTREAMENTO:
+            conn.execute(comando)
+        if "produtos_rastreamento" not in existentes:
+            conn.execute("INSERT INTO produtos_rastreamento (epoca) VALUES (?)", (random.getrandbits(62),))
+        conn.execute("COMMIT")
+        return True
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return False
+    finally:
+        conn.close()
+
+
+def ler_versao(conn):
+    """
+    Lê a (época, versão) atual do registro de alterações.
+
+    Retorna:
+        tuple | None: (época, última versão), ou None se o banco
+            não possui rastreamento
+    """
+
+    try:
+        epoca = conn.execute("SELECT epoca FROM produtos_rastreamento").fetchone()
+        versao = conn.execute("SELECT COALESCE(MAX(versao), 0) FROM produtos_alteracoes").fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+    return (epoca[0], versao) if epoca else None
+
+
+# ===========================================================
+# LEITURA E APLICAÇÃO DAS ALTERAÇÕES
+# ===========================================================
+
+
+def ler_alteracoes(produtos, caminho_db, maximo=MAXIMO_ALTERACOES):
+    """
+    Lê do banco as alterações posteriores à versão dos produtos.
+
+    Parâmetros:
+        produtos (ProductStore): dados carregados
+        caminho_db (str): banco de origem
+        maximo (int): entradas pendentes acima das quais a
+            recarga completa é exigida
+
+    Retorna:
+        Alteracoes: versão alcançada e produtos afetados
+
+    Lança:
+        RecargaNecessaria: se a versão carregada não é mais
+            comparável com o registro do banco (recriado ou podado
+            além dela) ou se há mais de `maximo` alterações
+    """
+
+    if produtos.versao is None:
+        raise RecargaNecessaria("os dados carregados não têm versão de rastreamento")
+
+    conn = sqlite3.connect(f"file:{caminho_db}?mode=ro", uri=True)
+    try:
+        conn.execute("BEGIN")
+        atual = ler_versao(conn)
+        if atual is None or atual[0] != produtos.versao[0]:
+            raise RecargaNecessaria("o banco foi recriado desde a carga")
+        if atual[1] == produtos.versao[1]:
+            return Alteracoes(atual, [])
+        primeira = conn.execute("SELECT MIN(versao) FROM produtos_alteracoes").fetchone()[0]
+        if primeira is None or primeira > produtos.versao[1] + 1:
+            raise RecargaNecessaria("o registro de alterações foi podado além da versão carregada")
+        pendentes = atual[1] - produtos.versao[1]
+        if pendentes > maximo:
+            raise RecargaNecessaria(f"{pendentes:,} alterações desde a carga (limite: {maximo:,})")
+
+        # Para cada id, o código da primeira entrada é o de quando
+        # os dados foram carregados
+        codigo_carregado = {}
+        for id_produto, codigo_antigo in conn.execute(
+                "SELECT id_produto, codigo_antigo FROM produtos_alteracoes "
+                "WHERE versao > ? AND versao <= ? ORDER BY versao", (produtos.versao[1], atual[1])):
+            codigo_carregado.setdefault(id_produto, codigo_antigo)
+
+        ids = list(codigo_carregado)
+        linhas_atuais = {}
+        for inicio in range(0, len(ids), TAMANHO_LOTE_IDS):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_IDS]
+            marcadores = ", ".join("?" * len(lote))
+            for id_produto, codigo, nome, preco in conn.execute(
+                    f"SELECT id_produto, codigo_busca, nome_produto, preco FROM produtos "
+                    f"WHERE id_produto IN ({marcadores}) AND codigo_busca IS NOT NULL", lote):
+                linhas_atuais[id_produto] = (codigo, nome, preco)
+    finally:
+        conn.close()
+
+    return Alteracoes(atual, [(codigo_carregado[i], linhas_atuais.get(i)) for i in ids])
+
+
+def aplicar_alteracoes(produtos, alteracoes, indice=None, precos=None):
+    """
+    Aplica as alterações lidas ao ProductStore e aos índices.
+
+    Parâmetros:
+        produtos (ProductStore): dados carregados
+        alteracoes (Alteracoes): resultado de `ler_alteracoes`
+        indice (IndiceTextual | None): índice a manter atualizado
+        precos (IndicePrecos | None): índice de preços a manter atualizado
+
+    Retorna:
+        dict: quantidade de produtos inseridos, alterados e removidos
+    """
+
+    removidas, novas, alteradas = [], [], []
+    for codigo_carregado, linha_atual in alteracoes.produtos:
+        linha = produtos.localizar(codigo_carregado) if codigo_carregado is not None else None
+        if linha is None and linha_atual is not None:
+            novas.append(linha_atual)
+        elif linha is not None and linha_atual is None:
+            removidas.append(linha)
+        elif linha is not None and produtos.produto(linha) != (linha_atual[1], linha_atual[2], linha_atual[0]):
+            alteradas.append((linha,) + linha_atual)
+
+    if indice is not None:
+        for linha in removidas:
+            indice.remover(linha, produtos.nomes[linha])
+        renomeadas = [(linha, produtos.nomes[linha], nome) for linha, _, nome, _ in alteradas
+                      if produtos.nomes[linha] != nome]
+        for linha, nome_antigo, _ in renomeadas:
+            indice.remover(linha, nome_antigo)
+    if precos is not None:
+        precos_antigos = [(linha, produtos.precos[linha]) for linha in removidas]
+        precos_antigos += [(linha, produtos.precos[linha]) for linha, _, _, preco in alteradas
+                           if produtos.precos[linha] != preco]
+
+    linhas_novas = produtos.aplicar_alteracoes(removidas, novas, alteradas)
+    produtos.versao = alteracoes.versao
+
+    if indice is not None:
+        for linha, _, nome in renomeadas:
+            indice.adicionar(linha, nome)
+        for linha, (_, nome, _) in zip(linhas_novas, novas):
+            indice.adicionar(linha, nome)
+    if precos is not None:
+        precos.atualizar(precos_antigos,
+                         [(linha, produtos.precos[linha]) for linha, _ in precos_antigos[len(removidas):]] +
+                         [(linha, preco) for linha, (_, _, preco) in zip(linhas_novas, novas)])
+
+    return {"inseridos": len(novas), "alterados": len(alteradas), "removidos": len(removidas)}
+
+
+def podar_alteracoes(caminho_db, manter=MAXIMO_ALTERACOES, limite=LIMITE_REGISTRO):
+    """
+    Remove as entradas mais antigas do registro quando ele passa
+    de `limite` entradas, mantendo as `manter` mais recentes.
+
+    Um processo atrasado em mais de MAXIMO_ALTERACOES versões já
+    precisa recarregar os dados (ver `ler_alteracoes`), então
+    mantê-las não tira a atualização incremental de nenhum outro
+    leitor do banco. Abaixo do limite, nada é gravado.
+
+    Parâmetros:
+        caminho_db (str): banco de origem
+        manter (int): entradas mais recentes preservadas (ao
+            menos 1, para que a última versão continue legível)
+        limite (int): tamanho do registro a partir do qual ele
+            é podado
+
+    Retorna:
+        int: entradas removidas (0 abaixo do limite, sem
+            rastreamento ou se o banco não pôde ser alterado, por
+            exemplo, somente leitura)
+    """
+
+    manter = max(manter, 1)
+    conn = sqlite3.connect(caminho_db, isolation_level=None)
+    try:
+        # Verificado antes de bloquear o banco para escrita
+        primeira, ultima = conn.execute("SELECT MIN(versao), MAX(versao) FROM produtos_alteracoes").fetchone()
+        if primeira is None or ultima - primeira + 1 <= max(limite, manter):
+            return 0
+        conn.execute("BEGIN IMMEDIATE")
+        removidas = conn.execute(
+            "DELETE FROM produtos_alteracoes WHERE versao <= (SELECT MAX(versao) FROM produtos_alteracoes) - ?",
+            (manter,)).rowcount
+        conn.execute("COMMIT")
+        return removidas
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return 0
+    finally:
+        conn.close()
+
+
+def atualizar_dados(produtos, caminho_db, indice=None, precos=None):
+    """
+    Lê e aplica, em sequência, as alterações do banco e poda o
+    registro se ele passou do limite.
+
+    Retorna:
+        dict: quantidade de produtos inseridos, alterados e removidos
+    """
+
+    contagem = aplicar_alteracoes(produtos, ler_alteracoes(produtos, caminho_db), indice, precos)
+    podar_alteracoes(caminho_db)
+    return contagem
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL: ATIVAR O RASTREAMENTO
+# ===========================================================
+
+
+def main(argv=None):
+    from src.database import DB_FILE  # src.database importa este módulo
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.atualizacao",
+        description="Ativa o registro de alterações usado pela atualização incremental.")
+    parser.add_argument("--banco", default=DB_FILE, help="caminho do banco SQLite")
+    parser.add_argument("--podar", action="store_true",
+                        help=f"remove agora as entradas além das {MAXIMO_ALTERACOES:,} mais recentes")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.banco):
+        print(f"❌ Banco não encontrado: {args.banco}")
+        return
+    if not preparar_rastreamento(args.banco):
+        print(f"❌ Não foi possível ativar o rastreamento em {args.banco} (banco somente leitura?).")
+        return
+    conn = sqlite3.connect(f"file:{args.banco}?mode=ro", uri=True)
+    try:
+        epoca, versao = ler_versao(conn)
+    finally:
+        conn.close()
+    print(f"✅ Rastreamento ativo em {args.banco} (época {epoca}, versão {versao}).")
+    if args.podar:
+        print(f"✂️  {podar_alteracoes(args.banco, limite=0):,} entrada(s) antiga(s) removida(s) do registro.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+"""
+===========================================================
+BACKEND EM DISCO (CONSULTAS INDEXADAS NO SQLITE)
+
+Descrição:
+    Alternativa ao carregamento completo em memória. O
+    `DatabaseBackend` mantém os produtos no banco SQLite e
+    responde às buscas da interface com consultas
+    parametrizadas sobre índices:
+
+    - Busca por código: índice único em 'codigo_busca'
+      (B-tree), uma consulta por produto;
+    - Faixa de preços: índice em 'preco', percorrido em ordem
+      de (preço, id_produto);
+    - Busca por nome: tabela virtual FTS5 com o tokenizador
+      'trigram' sobre 'nome_produto', que atende ao
+      `LIKE '%palavra%'` (mesma semântica de substring da busca
+      em memória) sem varrer a tabela.
+
+    A abertura não lê nenhuma linha, então a inicialização é
+    quase instantânea e a memória usada fica restrita ao cache
+    de páginas do SQLite — útil em máquinas com pouca RAM.
+
+    O backend oferece os mesmos métodos usados pela interface
+    no `ProductStore` (busca_linear, busca_binaria, buscar_lote,
+    localizar, produto), no `IndiceTextual` (cursor) e no
+    `IndicePrecos` (cursor_precos), então o mesmo objeto é
+    passado à interface em todos os papéis. As "posições" aqui
+    são os id_produto (rowid) das linhas.
+
+Diferenças em relação ao modo em memória:
+    - Os resultados da busca por nome saem na ordem de
+      id_produto (ordem do índice FTS), e não de código;
+    - A busca "linear" percorre os códigos em ordem pelo
+      índice, lidos do disco em lotes, e a "binária" é a
+      descida na B-tree do índice; os passos desta última são
+      estimados como ⌈log2(n + 1)⌉, como em `buscar_lote`.
+
+Uso (comparativo com o modo em memória):
+    python -m src.backend_banco --banco db/ecommerce.db
+
+===========================================================
+"""
+
+
+import argparse
+import queue
+import random
+import sqlite3
+import time
+from array import array
+from src.buscas import busca_linear
+from src.database import DB_FILE
+from src.metricas import cronometrar
+from src.paginacao import CursorBusca
+from src.snapshot import assinatura_banco
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+TABELA_FTS = "produtos_fts"
+CONEXOES_OCIOSAS = 4
+TAMANHO_LOTE_LEITURA = 1_024
+TAMANHO_LOTE_CODIGOS = 500
+
+ESQUEMA_FTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5(
+        nome_produto, content='produtos', content_rowid='id_produto',
+        tokenize='trigram', detail=none
+    )""",
+    # Gatilhos que mantêm o índice externo sincronizado com a tabela
+    f"""CREATE TRIGGER IF NOT EXISTS produtos_fts_ai AFTER INSERT ON produtos BEGIN
+        INSERT INTO {TABELA_FTS}(rowid, nome_produto) VALUES (new.id_produto, new.nome_produto);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS produtos_fts_ad AFTER DELETE ON produtos BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, nome_produto)
+        VALUES ('delete', old.id_produto, old.nome_produto);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS produtos_fts_au AFTER UPDATE OF nome_produto ON produtos BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, nome_produto)
+        VALUES ('delete', old.id_produto, old.nome_produto);
+        INSERT INTO {TABELA_FTS}(rowid, nome_produto) VALUES (new.id_produto, new.nome_produto);
+    END""",
+]
+
+
+# ===========================================================
+# FUNÇÃO: preparar_banco
+# ===========================================================
+
+
+def preparar_banco(caminho_db=DB_FILE):
+    """
+    Cria (se ainda não existirem) os índices usados pelo backend.
+
+    A primeira execução constrói o índice FTS5 a partir de todas
+    as linhas (operação única e demorada em bancos grandes); nas
+    seguintes, os gatilhos já o mantêm atualizado.
+
+    Parâmetros:
+        caminho_db (str): caminho do banco SQLite
+
+    Retorna:
+        bool: True se a busca textual indexada (FTS5 trigram)
+            está disponível nesta versão do SQLite
+
+    Lança:
+        ValueError: se há códigos de busca repetidos (o índice
+            único não pode ser criado)
+    """
+
+    conn = sqlite3.connect(caminho_db, isolation_level=None)
+    try:
+        try:
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_produtos_codigo_busca ON produtos (codigo_busca)")
+        except sqlite3.IntegrityError:
+            repetidos = conn.execute("SELECT codigo_busca FROM produtos WHERE codigo_busca IS NOT NULL "
+                                     "GROUP BY codigo_busca HAVING COUNT(*) > 1").fetchall()
+            exemplos = ", ".join(str(codigo) for (codigo,) in repetidos[:5])
+            raise ValueError(f"{len(repetidos):,} códigos de busca repetidos em {caminho_db} (ex.: {exemplos}); "
+                             f"o backend em disco exige códigos únicos") from None
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_produtos_preco ON produtos (preco)")
+
+        existia = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (TABELA_FTS,)).fetchone()
+        try:
+            # Os gatilhos são recriados sempre: reconstruir a tabela
+            # 'produtos' (ex.: --reembaralhar) os remove, mas mantém
+            # os id_produto e nomes indexados válidos.
+            conn.execute("BEGIN")
+            for comando in ESQUEMA_FTS:
+                conn.execute(comando)
+            if not existia:
+                print("🗂️  Construindo o índice textual (FTS5 trigram)...")
+                inicio = time.time()
+                conn.execute(f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')")
+                print(f"✅ Índice textual criado em {time.time() - inicio:.2f} segundos!")
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.OperationalError as erro:  # SQLite sem FTS5 ou sem 'trigram'
+            conn.execute("ROLLBACK")
+            print(f"⚠️  Índice textual indisponível ({erro}); a busca por nome varrerá a tabela.")
+            return False
+    finally:
+        conn.close()
+
+
+# ===========================================================
+# CLASSE: PoolConexoes
+# ===========================================================
+
+
+class PoolConexoes:
+    """
+    Conexões somente leitura reutilizadas entre as threads.
+
+    Cada consulta pega uma conexão ociosa (ou abre uma nova) e a
+    devolve ao terminar; até `maximo_ociosas` conexões ficam
+    abertas, com os comandos preparados no cache de cada uma.
+    """
+
+    def __init__(self, caminho_db, maximo_ociosas=CONEXOES_OCIOSAS):
+        self._uri = f"file:{caminho_db}?mode=ro"
+        self._ociosas = queue.LifoQueue(maxsize=maximo_ociosas)
+
+    def obter(self):
+        """
+        Retorna uma conexão ociosa ou abre uma nova.
+        """
+
+        try:
+            return self._ociosas.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            return conn
+
+    def devolver(self, conn):
+        """
+        Devolve a conexão ao pool (ou a fecha, se o pool está cheio).
+        """
+
+        try:
+            self._ociosas.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def consultar(self, sql, parametros=()):
+        """
+        Executa uma consulta e retorna todas as linhas.
+        """
+
+        conn = self.obter()
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            self.devolver(conn)
+
+    def iterar(self, sql, parametros, chave, inicio):
+        """
+        Percorre o resultado de uma consulta em lotes limitados,
+        paginados pela chave de ordenação (keyset).
+
+        Cada lote é lido por inteiro e o comando é encerrado antes
+        de entregar as linhas: um iterador parado no meio (ex.: um
+        cursor de página guardado no cache) não mantém nenhum
+        SELECT aberto, que bloquearia as escritas no banco.
+
+        Parâmetros:
+            sql (str): consulta ordenada pela chave e sem LIMIT, cuja
+                última condição restringe as linhas às posteriores à
+                chave (ex.: "... AND rowid > ? ORDER BY rowid")
+            parametros (tuple): parâmetros anteriores aos da chave
+            chave (callable): linha -> parâmetros da chave da linha
+            inicio (tuple): parâmetros da chave antes da primeira linha
+        """
+
+        apos = tuple(inicio)
+        while True:
+            linhas = self.consultar(f"{sql} LIMIT {TAMANHO_LOTE_LEITURA}", tuple(parametros) + apos)
+            yield from linhas
+            if len(linhas) < TAMANHO_LOTE_LEITURA:
+                return
+            apos = chave(linhas[-1])
+
+    def fechar(self):
+        """
+        Fecha as conexões ociosas.
+        """
+
+        while True:
+            try:
+                self._ociosas.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# ===========================================================
+# CLASSE: DatabaseBackend
+# ===========================================================
+
+
+class DatabaseBackend:
+    """
+    Produtos consultados direto no banco (sem carga em memória).
+
+    Atributos:
+        caminho_db (str): banco consultado
+        fts (bool): True se a busca por nome usa o índice FTS5
+    """
+
+    def __init__(self, caminho_db=DB_FILE, preparar=True):
+        """
+        Parâmetros:
+            caminho_db (str): caminho do banco SQLite
+            preparar (bool): cria os índices que faltarem antes de
+                abrir o banco em modo somente leitura
+        """
+
+        self.caminho_db = caminho_db
+        if preparar:
+            self.fts = preparar_banco(caminho_db)
+        self.pool = PoolConexoes(caminho_db)
+        if not preparar:
+            self.fts = bool(self.pool.consultar("SELECT 1 FROM sqlite_master WHERE name = ?", (TABELA_FTS,)))
+        self._total = None
+        self._assinatura_total = None
+
+    def __len__(self):
+        # A contagem é refeita quando o banco muda (mesma assinatura
+        # usada para invalidar o snapshot)
+        assinatura = assinatura_banco(self.caminho_db)
+        if self._total is None or assinatura != self._assinatura_total:
+            self._total = self.pool.consultar("SELECT COUNT(*) FROM produtos")[0][0]
+            self._assinatura_total = assinatura
+        return self._total
+
+    def fechar(self):
+        self.pool.fechar()
+
+    # -------------------------------------------------------
+    # Busca por código (mesmos métodos do ProductStore)
+    # -------------------------------------------------------
+
+    def localizar(self, codigo):
+        """
+        Retorna o id_produto do código (índice único) ou None.
+        """
+
+        linhas = self.pool.consultar("SELECT id_produto FROM produtos WHERE codigo_busca = ?", (codigo,))
+        return linhas[0][0] if linhas else None
+
+    def produto(self, posicao):
+        """
+        Retorna (nome, preço, código) do produto com o id_produto.
+        """
+
+        return self.pool.consultar(
+            "SELECT nome_produto, preco, codigo_busca FROM produtos WHERE id_produto = ?", (posicao,))[0]
+
+    @cronometrar("busca_codigo", motor="linear")
+    def busca_linear(self, codigo, cancelado=None):
+        """
+        Percorre os códigos em ordem (lidos do índice, em lotes)
+        até encontrar o código.
+
+        Parâmetros:
+            cancelado (threading.Event | None): interrompe a varredura
+
+        Retorna:
+            tuple(bool, int): (encontrado, passos)
+        """
+
+        codigos = (linha[0] for linha in self.pool.iterar(
+            "SELECT codigo_busca FROM produtos WHERE codigo_busca > ? ORDER BY codigo_busca",
+            (), tuple, (float("-inf"),)))
+        try:
+            return busca_linear(codigos, codigo, cancelado)
+        finally:
+            codigos.close()
+
+    @cronometrar("busca_codigo", motor="binaria")
+    def busca_binaria(self, codigo):
+        """
+        Consulta o código pelo índice B-tree.
+
+        Retorna:
+            tuple(bool, int): (encontrado, passos estimados ⌈log2(n + 1)⌉)
+        """
+
+        encontrado = self.localizar(codigo) is not None
+        return encontrado, len(self).bit_length()
+
+    @cronometrar("busca_codigo", motor="lote")
+    def buscar_lote(self, codigos):
+        """
+        Busca vários códigos com uma consulta `IN (...)` por lote.
+
+        Retorna:
+            tuple(list, int): produto (nome, preço, código) de cada
+                código, na ordem recebida (None se não existir), e
+                passos estimados (⌈log2(n + 1)⌉ por código)
+        """
+
+        codigos = list(codigos)
+        distintos = list(dict.fromkeys(codigos))
+        encontrados = {}
+        for inicio in range(0, len(distintos), TAMANHO_LOTE_CODIGOS):
+            lote = distintos[inicio:inicio + TAMANHO_LOTE_CODIGOS]
+            marcadores = ", ".join("?" * len(lote))
+            for linha in self.pool.consultar(
+                    f"SELECT nome_produto, preco, codigo_busca FROM produtos WHERE codigo_busca IN ({marcadores})",
+                    lote):
+                encontrados[linha[2]] = linha
+        return [encontrados.get(codigo) for codigo in codigos], len(codigos) * len(self).bit_length()
+
+    # -------------------------------------------------------
+    # Busca por nome (mesmo método do IndiceTextual)
+    # -------------------------------------------------------
+
+    def _consulta_textual(self, palavras):
+        """
+        Monta a consulta dos id_produto cujo nome contém todas as
+        palavras. Só palavras com 3 ou mais caracteres usam o índice
+        de trigramas (`LIKE`); as mais curtas e as que têm curingas
+        do LIKE ('%', '_') são conferidas com instr, fora do índice.
+        Misturar no índice um `LIKE` curto com outro longo derruba o
+        processo no SQLite 3.40 (falha de segmentação).
+        """
+
+        indexaveis = [p for p in palavras if len(p) >= 3 and "%" not in p and "_" not in p]
+        literais = [p for p in palavras if p not in indexaveis]
+        if self.fts and indexaveis:
+            tabela, coluna = TABELA_FTS, "rowid"
+        else:
+            tabela, coluna = "produtos", "id_produto"
+            literais, indexaveis = palavras, []
+
+        condicoes = ["nome_produto LIKE ?"] * len(indexaveis)
+        condicoes += ["instr(lower(nome_produto), ?) > 0"] * len(literais)
+        condicoes.append(f"{coluna} > ?")  # chave da paginação (ver PoolConexoes.iterar)
+        parametros = [f"%{p}%" for p in indexaveis] + literais
+        sql = f"SELECT {coluna} FROM {tabela} WHERE {' AND '.join(condicoes)} ORDER BY {coluna}"
+        return sql, parametros
+
+    @cronometrar("busca_textual", fase="cursor")
+    def cursor(self, termo):
+        """
+        Cria um cursor paginado sobre os produtos cujo nome contém
+        todas as palavras do termo (ordem de id_produto).
+
+        Retorna:
+            CursorBusca: lê do banco apenas o necessário para a página
+        """
+
+        palavras = list(dict.fromkeys(termo.lower().split()))
+        if not palavras:
+            return CursorBusca(self, tuple, total=0)
+
+        sql, parametros = self._consulta_textual(palavras)
+
+        def fonte():
+            return (linha[0] for linha in self.pool.iterar(sql, parametros, tuple, (float("-inf"),)))
+
+        return CursorBusca(self, fonte)
+
+    # -------------------------------------------------------
+    # Faixa de preços (mesmo método do IndicePrecos)
+    # -------------------------------------------------------
+
+    @cronometrar("busca_precos")
+    def cursor_precos(self, minimo=None, maximo=None, linhas=None, decrescente=False):
+        """
+        Cria um cursor sobre os produtos da faixa, ordenados por preço.
+
+        Sem `linhas`, a faixa é lida pelo índice em 'preco'; com
+        elas (id_produto de uma busca por nome), os preços são
+        consultados em lotes `IN (...)` e ordenados em memória.
+
+        Retorna:
+            CursorBusca: cursor na ordem (preço, id_produto)
+        """
+
+        minimo = float("-inf") if minimo is None else minimo
+        maximo = float("inf") if maximo is None else maximo
+        if linhas is None:
+            direcao, comparacao, antes = ("DESC", "<", float("inf")) if decrescente else ("ASC", ">", float("-inf"))
+            sql = (f"SELECT id_produto, preco FROM produtos WHERE preco BETWEEN ? AND ? "
+                   f"AND (preco, id_produto) {comparacao} (?, ?) ORDER BY preco {direcao}, id_produto {direcao}")
+
+            def fonte():
+                return (linha[0] for linha in self.pool.iterar(
+                    sql, (minimo, maximo), lambda linha: (linha[1], linha[0]), (antes, antes)))
+
+            return CursorBusca(self, fonte)
+
+        selecionadas = []
+        linhas = list(linhas)
+        for inicio in range(0, len(linhas), TAMANHO_LOTE_CODIGOS):
+            lote = linhas[inicio:inicio + TAMANHO_LOTE_CODIGOS]
+            marcadores = ", ".join("?" * len(lote))
+            selecionadas += self.pool.consultar(
+                f"SELECT preco, id_produto FROM produtos WHERE id_produto IN ({marcadores}) "
+                f"AND preco BETWEEN ? AND ?", lote + [minimo, maximo])
+        selecionadas.sort(reverse=decrescente)
+        posicoes = array("q", (linha for _, linha in selecionadas))
+        return CursorBusca(self, lambda: iter(posicoes), posicoes=posicoes)
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL: COMPARATIVO DISCO X MEMÓRIA
+# ===========================================================
+
+
+def _rss_mib():
+    """
+    Pico de memória residente do processo, em texto ("n/d" se
+    indisponível).
+
+    O módulo `resource` só existe em sistemas Unix (ru_maxrss em
+    KiB no Linux); sem ele, usa-se o pico do tracemalloc, se ele
+    estiver ativo (ex.: --perfil).
+    """
+
+    try:
+        import resource
+    except ImportError:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return "n/d"
+        return f"{tracemalloc.get_traced_memory()[1] / 2**20:,.0f} MiB (tracemalloc)"
+    return f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MiB"
+
+
+def _medir(descricao, funcao, repeticoes=1):
+    """
+    Executa a função e imprime o tempo médio por execução.
+    """
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    media = (time.perf_counter() - inicio) / repeticoes
+    print(f"   {descricao:<38} {media * 1000:12.3f} ms")
+    return resultado
+
+
+def _comparar(nome, produtos, indice, codigo, termos):
+    """
+    Mede as operações da interface sobre uma fonte de dados.
+    """
+
+    print(f"\n🔹 {nome}")
+    _medir("busca por código (localizar + produto)",
+           lambda: produtos.produto(produtos.localizar(codigo)), repeticoes=1_000)
+    _medir("busca binária", lambda: produtos.busca_binaria(codigo), repeticoes=1_000)
+    _medir("busca linear", lambda: produtos.busca_linear(codigo), repeticoes=3)
+    for termo in termos:
+        cursor = _medir(f"1ª página de \"{termo}\"", lambda: _primeira_pagina(indice, termo), repeticoes=20)
+        _medir(f"total de \"{termo}\" ({cursor.contar():,})", lambda: indice.cursor(termo).contar())
+
+
+def _primeira_pagina(indice, termo):
+    cursor = indice.cursor(termo)
+    cursor.pagina(0, 10)
+    return cursor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.backend_banco",
+        description="Comparativo entre o backend em disco e o carregamento em memória.")
+    parser.add_argument("--banco", default=DB_FILE)
+    parser.add_argument("--termos", nargs="+", default=["mouse", "tech x12", "ouse t", "x"])
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="mede apenas o backend em disco")
+    args = parser.parse_args(argv)
+
+    preparar_banco(args.banco)
+
+    print(f"\n🚀 Inicialização (RSS inicial {_rss_mib()})")
+    backend = _medir("DatabaseBackend (disco)", lambda: DatabaseBackend(args.banco, preparar=False))
+    codigo = backend.pool.consultar("SELECT codigo_busca FROM produtos LIMIT 1 OFFSET ?",
+                                    (random.randrange(len(backend)),))[0][0]
+    _comparar("DatabaseBackend (disco)", backend, backend, codigo, args.termos)
+    print(f"   RSS de pico: {_rss_mib()}")
+
+    if args.sem_memoria:
+        return
+
+    from src.database import carregar_dados
+    from src.indice_textual import IndiceTextual
+
+    print("\n🚀 Inicialização em memória")
+    produtos = _medir("carregar_dados (sem snapshot)",
+                      lambda: carregar_dados(args.banco, usar_snapshot=False, progresso=lambda *_: None))
+    indice = _medir("IndiceTextual", lambda: IndiceTextual(produtos))
+    _comparar("ProductStore + IndiceTextual (memória)", produtos, indice, codigo, args.termos)
+    print(f"   RSS de pico: {_rss_mib()}")
+
+
+if __name__ == "__main__":
+    main()
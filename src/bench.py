@@ -0,0 +1,325 @@
+"""
+===========================================================
+BENCHMARK DOS MOTORES DE BUSCA (SEM INTERFACE GRÁFICA)
+
+Descrição:
+    Executa cada motor registrado em `src.buscas.MOTORES` sobre
+    conjuntos de códigos de tamanhos configuráveis e diferentes
+    distribuições de alvos, com aquecimento e várias rodadas,
+    e reporta estatísticas em JSON ou CSV.
+
+    Conjunto de dados:
+        Códigos densos e ordenados a partir de 10.000.000, como
+        os gerados por `popular_database.py` (ou os códigos reais
+        de um banco, com --banco).
+
+    Distribuições de alvos:
+        - acerto: códigos existentes, sorteados
+        - erro: códigos inexistentes (acima do maior código)
+        - primeiro: sempre o menor código
+        - ultimo: sempre o maior código
+        - aleatorio: sorteados em um intervalo ~10% maior que
+          o conjunto (mistura de acertos e erros)
+
+    Métricas por (motor, tamanho, distribuição):
+        mediana, p95 e p99 da latência por consulta (ns),
+        vazão (consultas/s), média de passos e tempo de preparo.
+
+    O pseudo-motor "lote" mede `buscar_lote` resolvendo todos os
+    alvos da rodada em uma chamada (latência = tempo da chamada
+    dividido pelo número de alvos).
+
+Uso:
+    python -m src.bench --tamanhos 1000 100000 1000000 --formato csv
+    python -m src.bench --motores binaria interpolacao --saida bench.json
+
+===========================================================
+"""
+
+
+import argparse
+import csv
+import json
+import platform
+import random
+import sys
+import time
+from array import array
+from contextlib import redirect_stdout
+from src.buscas import MOTORES, buscar_lote, obter_motor
+
+
+# ===========================================================
+# CONFIGURAÇÕES PADRÃO
+# ===========================================================
+
+
+DISTRIBUICOES = ["acerto", "erro", "primeiro", "ultimo", "aleatorio"]
+CODIGO_INICIAL = 10_000_000
+CAMPOS = ["motor", "tamanho", "distribuicao", "consultas", "mediana_ns", "p95_ns",
+          "p99_ns", "vazao_por_s", "passos_medios", "preparo_ms"]
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES
+# ===========================================================
+
+
+def gerar_alvos(lista, distribuicao, quantidade, gerador):
+    """
+    Gera os alvos de busca de acordo com a distribuição.
+
+    Parâmetros:
+        lista (sequence): códigos ordenados
+        distribuicao (str): uma das DISTRIBUICOES
+        quantidade (int): número de alvos
+        gerador (random.Random): gerador de números aleatórios
+
+    Retorna:
+        list: alvos de busca
+    """
+
+    total = len(lista)
+    menor, maior = lista[0], lista[-1]
+    if distribuicao == "acerto":
+        return [lista[gerador.randrange(total)] for _ in range(quantidade)]
+    if distribuicao == "erro":
+        return [gerador.randint(maior + 1, maior + total) for _ in range(quantidade)]
+    if distribuicao == "primeiro":
+        return [menor] * quantidade
+    if distribuicao == "ultimo":
+        return [maior] * quantidade
+    if distribuicao == "aleatorio":
+        return [gerador.randint(menor, maior + total // 10) for _ in range(quantidade)]
+    raise ValueError(f"Distribuição desconhecida: {distribuicao!r}")
+
+
+def percentil(valores_ordenados, fracao):
+    """
+    Retorna o percentil (método nearest-rank) de uma lista ordenada.
+    """
+
+    if not valores_ordenados:
+        return 0
+    posicao = max(0, min(len(valores_ordenados) - 1, round(fracao * len(valores_ordenados)) - 1))
+    return valores_ordenados[posicao]
+
+
+def _resumir(motor, tamanho, distribuicao, latencias, passos, tempo_total_ns, preparo_ns):
+    """
+    Monta a linha de resultado a partir das medições.
+    """
+
+    latencias.sort()
+    return {
+        "motor": motor,
+        "tamanho": tamanho,
+        "distribuicao": distribuicao,
+        "consultas": len(latencias),
+        "mediana_ns": percentil(latencias, 0.50),
+        "p95_ns": percentil(latencias, 0.95),
+        "p99_ns": percentil(latencias, 0.99),
+        "vazao_por_s": round(len(latencias) / (tempo_total_ns / 1e9), 1) if tempo_total_ns else 0.0,
+        "passos_medios": round(passos / len(latencias), 2) if latencias else 0.0,
+        "preparo_ms": round(preparo_ns / 1e6, 3),
+    }
+
+
+# ===========================================================
+# FUNÇÕES DE MEDIÇÃO
+# ===========================================================
+
+
+def medir_motor(chave, estrutura, alvos_por_rodada, aquecimento):
+    """
+    Mede um motor consulta a consulta.
+
+    Parâmetros:
+        chave (str): chave do motor em MOTORES
+        estrutura: estrutura devolvida por `preparar`
+        alvos_por_rodada (list): lista de alvos para cada rodada
+        aquecimento (int): consultas executadas antes das rodadas
+
+    Retorna:
+        tuple(list, int, int): latências (ns), passos e tempo total
+    """
+
+    buscar = obter_motor(chave).buscar
+    relogio = time.perf_counter_ns
+
+    for alvo in alvos_por_rodada[0][:aquecimento]:
+        buscar(estrutura, alvo)
+
+    latencias = []
+    passos_total = 0
+    for alvos in alvos_por_rodada:
+        for alvo in alvos:
+            inicio = relogio()
+            _, passos = buscar(estrutura, alvo)
+            latencias.append(relogio() - inicio)
+            passos_total += passos
+    return latencias, passos_total, sum(latencias)
+
+
+def medir_lote(lista, alvos_por_rodada, aquecimento):
+    """
+    Mede `buscar_lote`, uma chamada por rodada.
+
+    Retorna:
+        tuple(list, int, int): latência média por alvo em cada
+            rodada (repetida por alvo), passos e tempo total
+    """
+
+    buscar_lote(lista, alvos_por_rodada[0][:aquecimento])
+
+    latencias = []
+    passos_total = 0
+    tempo_total = 0
+    for alvos in alvos_por_rodada:
+        inicio = time.perf_counter_ns()
+        _, _, passos = buscar_lote(lista, alvos)
+        decorrido = time.perf_counter_ns() - inicio
+        tempo_total += decorrido
+        passos_total += passos
+        latencias.extend([decorrido // max(len(alvos), 1)] * len(alvos))
+    return latencias, passos_total, tempo_total
+
+
+def executar(tamanhos, motores, distribuicoes, consultas, consultas_linear, repeticoes,
+             aquecimento, semente, listas=None, progresso=None):
+    """
+    Executa o benchmark completo.
+
+    Parâmetros:
+        tamanhos (list): tamanhos dos conjuntos de códigos
+        motores (list): chaves dos motores (inclui "lote")
+        distribuicoes (list): distribuições de alvos
+        consultas (int): consultas por rodada
+        consultas_linear (int): consultas por rodada da busca linear
+        repeticoes (int): número de rodadas
+        aquecimento (int): consultas de aquecimento
+        semente (int): semente do gerador aleatório
+        listas (dict | None): tamanho -> lista de códigos já pronta
+        progresso (callable | None): recebe cada linha de resultado
+
+    Retorna:
+        list: linhas de resultado (dicionários com CAMPOS)
+    """
+
+    resultados = []
+    for tamanho in tamanhos:
+        if listas and tamanho in listas:
+            lista = listas[tamanho]
+        else:
+            lista = array("q", range(CODIGO_INICIAL, CODIGO_INICIAL + tamanho))
+
+        for chave in motores:
+            estrutura = None
+            preparo_ns = 0
+            if chave != "lote":
+                inicio = time.perf_counter_ns()
+                estrutura = obter_motor(chave).preparar(lista)
+                preparo_ns = time.perf_counter_ns() - inicio
+
+            for distribuicao in distribuicoes:
+                gerador = random.Random(f"{semente}-{tamanho}-{distribuicao}")
+                quantidade = consultas_linear if chave == "linear" else consultas
+                alvos_por_rodada = [gerar_alvos(lista, distribuicao, quantidade, gerador)
+                                    for _ in range(repeticoes)]
+
+                if chave == "lote":
+                    medicao = medir_lote(lista, alvos_por_rodada, aquecimento)
+                else:
+                    medicao = medir_motor(chave, estrutura, alvos_por_rodada, aquecimento)
+
+                linha = _resumir(chave, tamanho, distribuicao, *medicao, preparo_ns)
+                resultados.append(linha)
+                if progresso is not None:
+                    progresso(linha)
+    return resultados
+
+
+# ===========================================================
+# SAÍDA (JSON / CSV)
+# ===========================================================
+
+
+def escrever_resultados(resultados, formato, destino, parametros):
+    """
+    Escreve os resultados em JSON (com metadados) ou CSV.
+    """
+
+    if formato == "csv":
+        escritor = csv.DictWriter(destino, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+        return
+
+    json.dump({
+        "metadados": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "parametros": parametros,
+        },
+        "resultados": resultados,
+    }, destino, ensure_ascii=False, indent=2)
+    destino.write("\n")
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL
+# ===========================================================
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.bench",
+        description="Benchmark dos motores de busca do e-commerce.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--motores", nargs="+", default=list(MOTORES) + ["lote"],
+                        choices=list(MOTORES) + ["lote"])
+    parser.add_argument("--distribuicoes", nargs="+", default=DISTRIBUICOES, choices=DISTRIBUICOES)
+    parser.add_argument("--consultas", type=int, default=2_000, help="consultas por rodada")
+    parser.add_argument("--consultas-linear", type=int, default=20,
+                        help="consultas por rodada da busca linear (O(n))")
+    parser.add_argument("--repeticoes", type=int, default=5, help="número de rodadas")
+    parser.add_argument("--aquecimento", type=int, default=200, help="consultas de aquecimento")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--banco", help="usa os códigos reais de um banco SQLite")
+    parser.add_argument("--formato", choices=["json", "csv"], default="json")
+    parser.add_argument("--saida", help="arquivo de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    listas = None
+    tamanhos = args.tamanhos
+    if args.banco:
+        from src.database import carregar_dados
+        # Mensagens da carga no stderr: o stdout traz apenas os
+        # resultados. Sem snapshot, para não gravar um .snap ao
+        # lado do banco informado (os códigos são lidos do SQLite)
+        with redirect_stdout(sys.stderr):
+            produtos = carregar_dados(args.banco, usar_snapshot=False, progresso=lambda *_: None)
+        listas = {len(produtos): produtos.codigos}
+        tamanhos = [len(produtos)]
+
+    def progresso(linha):
+        print(f"⏱️  {linha['motor']:<13} n={linha['tamanho']:<10,} {linha['distribuicao']:<10} "
+              f"mediana={linha['mediana_ns']:>10,} ns  p99={linha['p99_ns']:>10,} ns  "
+              f"{linha['vazao_por_s']:>14,.0f} consultas/s", file=sys.stderr)
+
+    resultados = executar(tamanhos, args.motores, args.distribuicoes, args.consultas,
+                          args.consultas_linear, args.repeticoes, args.aquecimento,
+                          args.semente, listas, progresso)
+
+    parametros = {chave: valor for chave, valor in vars(args).items() if chave not in ("saida", "formato")}
+    parametros["tamanhos"] = tamanhos
+    if args.saida:
+        with open(args.saida, "w", newline="", encoding="utf-8") as destino:
+            escrever_resultados(resultados, args.formato, destino, parametros)
+    else:
+        escrever_resultados(resultados, args.formato, sys.stdout, parametros)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+===========================================================
+BUSCA LINEAR PARALELA EM MEMÓRIA COMPARTILHADA
+
+Descrição:
+    Módulo que divide a busca linear entre vários processos.
+    A lista de códigos é copiada uma única vez para um bloco de
+    `multiprocessing.shared_memory`; cada processo do pool lê o
+    mesmo bloco (sem cópia) e percorre apenas a sua fatia.
+
+    Assim que um processo encontra o alvo, ele sinaliza um evento
+    compartilhado e os demais interrompem a varredura no próximo
+    bloco verificado.
+
+    A busca linear continua necessária para listas não ordenadas
+    e para varreduras por predicado; aqui ela usa todos os
+    núcleos em vez de apenas um.
+
+Passos:
+    Para manter a comparação com `busca_linear`, o número de
+    passos reportado é o equivalente sequencial: a posição do
+    alvo + 1 quando encontrado, ou o tamanho da lista quando não.
+
+Uso (relatório de speedup por número de núcleos):
+    python -m src.busca_paralela --tamanho 10000000 --processos 1 2 4 8
+
+===========================================================
+"""
+
+
+import argparse
+import os
+import time
+from array import array
+from multiprocessing import Event, Pool
+from multiprocessing.shared_memory import SharedMemory
+from src.buscas import busca_linear
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+TAMANHO_BLOCO = 65_536
+
+# Estado de cada processo do pool (definido pelo inicializador)
+_memoria = None
+_visao = None
+_evento = None
+
+
+# ===========================================================
+# FUNÇÕES EXECUTADAS NOS PROCESSOS DO POOL
+# ===========================================================
+
+
+def _inicializar_processo(nome_memoria, total, evento):
+    """
+    Abre o bloco compartilhado no processo do pool.
+    """
+
+    global _memoria, _visao, _evento
+    _memoria = SharedMemory(name=nome_memoria)
+    _visao = _memoria.buf[:8 * total].cast("q")
+    _evento = evento
+
+
+def _varrer_fatia(inicio, fim, alvo):
+    """
+    Percorre a fatia [inicio, fim) em blocos, verificando entre
+    eles se outro processo já encontrou o alvo.
+
+    Retorna:
+        int: posição do alvo ou -1 (não encontrado ou cancelado)
+    """
+
+    for bloco_inicio in range(inicio, fim, TAMANHO_BLOCO):
+        if _evento.is_set():
+            return -1
+        posicao = bloco_inicio
+        for item in _visao[bloco_inicio:min(bloco_inicio + TAMANHO_BLOCO, fim)]:
+            if item == alvo:
+                _evento.set()
+                return posicao
+            posicao += 1
+    return -1
+
+
+# ===========================================================
+# CLASSE: BuscaLinearParalela
+# ===========================================================
+
+
+class BuscaLinearParalela:
+    """
+    Pool de processos para buscas lineares sobre uma mesma lista.
+
+    Criar o pool e copiar a lista para a memória compartilhada é
+    caro, por isso a estrutura é montada uma vez e reutilizada em
+    várias buscas. Use como gerenciador de contexto para liberar
+    os processos e o bloco compartilhado ao final.
+
+    Exemplo:
+        with BuscaLinearParalela(produtos.codigos, processos=4) as busca:
+            encontrado, passos = busca.buscar(12345678)
+    """
+
+    def __init__(self, lista, processos=None):
+        """
+        Parâmetros:
+            lista (sequence): códigos (int64), ordenados ou não
+            processos (int | None): número de processos (padrão:
+                número de núcleos disponíveis)
+        """
+
+        self.total = len(lista)
+        self.processos = processos or os.cpu_count() or 1
+
+        self._memoria = SharedMemory(create=True, size=max(8 * self.total, 8))
+        dados = lista if isinstance(lista, (array, memoryview)) else array("q", lista)
+        self._memoria.buf[:8 * self.total] = memoryview(dados).cast("B")
+
+        self._evento = Event()
+        self._pool = Pool(self.processos, initializer=_inicializar_processo,
+                          initargs=(self._memoria.name, self.total, self._evento))
+
+    def buscar(self, alvo):
+        """
+        Realiza a busca linear paralela.
+
+        Parâmetros:
+            alvo (int): valor a ser encontrado
+
+        Retorna:
+            tuple(bool, int): (encontrado, passos equivalentes à
+                busca linear sequencial)
+        """
+
+        if self.total == 0:
+            return False, 0
+
+        self._evento.clear()
+        tamanho_fatia = -(-self.total // self.processos)
+        fatias = [(inicio, min(inicio + tamanho_fatia, self.total), alvo)
+                  for inicio in range(0, self.total, tamanho_fatia)]
+
+        posicoes = [posicao for posicao in self._pool.starmap(_varrer_fatia, fatias) if posicao >= 0]
+        if posicoes:
+            return True, min(posicoes) + 1
+        return False, self.total
+
+    def fechar(self):
+        """
+        Encerra o pool e libera o bloco de memória compartilhada.
+        """
+
+        self._pool.terminate()
+        self._pool.join()
+        self._memoria.close()
+        self._memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def busca_linear_paralela(lista, alvo, processos=None):
+    """
+    Realiza uma única busca linear paralela.
+
+    Para várias buscas sobre a mesma lista, prefira reutilizar
+    uma instância de `BuscaLinearParalela`.
+
+    Retorna:
+        tuple(bool, int): (encontrado, passos)
+    """
+
+    with BuscaLinearParalela(lista, processos) as busca:
+        return busca.buscar(alvo)
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL: RELATÓRIO DE SPEEDUP
+# ===========================================================
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.busca_paralela",
+        description="Speedup da busca linear paralela por número de núcleos.")
+    parser.add_argument("--tamanho", type=int, default=10_000_000)
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    lista = array("q", range(10_000_000, 10_000_000 + args.tamanho))
+    alvos = {
+        "meio": lista[len(lista) // 2],
+        "ultimo": lista[-1],
+        "erro": lista[-1] + 1,
+    }
+
+    print(f"🖥️  Núcleos disponíveis: {os.cpu_count()} | tamanho: {args.tamanho:,}")
+    for caso, alvo in alvos.items():
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            esperado = busca_linear(lista, alvo)
+        tempo_sequencial = (time.perf_counter() - inicio) / args.repeticoes
+        print(f"\n🔹 Alvo '{caso}': sequencial {tempo_sequencial * 1000:.1f} ms | {esperado[1]:,} passos")
+
+        for processos in args.processos:
+            with BuscaLinearParalela(lista, processos) as busca:
+                busca.buscar(alvo)  # aquecimento do pool
+                inicio = time.perf_counter()
+                for _ in range(args.repeticoes):
+                    resultado = busca.buscar(alvo)
+                tempo = (time.perf_counter() - inicio) / args.repeticoes
+            assert resultado == esperado, (resultado, esperado)
+            speedup = tempo_sequencial / tempo
+            print(f"   {processos:>2} processos: {tempo * 1000:8.1f} ms | speedup {speedup:5.2f}x "
+                  f"| eficiência {speedup / processos:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
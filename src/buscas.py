@@ -15,34 +15,70 @@ Descrição:
     A busca binária exige que os dados estejam **ordenados**,
     enquanto a busca linear pode ser aplicada em qualquer lista.
 
+    Além delas, o módulo oferece motores adicionais —
+    interpolação, exponencial (galopante), Eytzinger (layout
+    BFS amigável ao cache) e índice hash — todos registrados em
+    `MOTORES` com o mesmo contrato (encontrado, passos), o que
+    permite compará-los e escolher o melhor para os dados.
+
+    Para resolver muitos códigos de uma só vez, `buscar_lote`
+    processa o lote inteiro em uma chamada (NumPy opcional).
+
 ===========================================================
 """
 
 
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: usa-se o merge em Python puro
+    np = None
+
+
 # ===========================================================
 # FUNÇÕES DE BUSCA BINÁRIA E LINEAR
 # ===========================================================
 
 
-def busca_linear(lista, alvo):
+BLOCO_LINEAR = 65_536  # itens percorridos entre verificações de cancelamento
+
+
+def busca_linear(lista, alvo, cancelado=None):
     """
     Realiza uma busca linear (sequencial) em uma lista.
     
     Parâmetros:
         lista (list): lista de elementos a serem percorridos
         alvo (int): valor a ser encontrado
+        cancelado (threading.Event | None): interrompe a busca
+            quando sinalizado (verificado a cada BLOCO_LINEAR itens)
 
     Retorna:
         tuple(bool, int): 
             - True se o elemento for encontrado, False caso contrário
             - Quantidade de passos realizados até o término da busca
+              (ou até a interrupção)
     """
 
     passos = 0
-    for item in lista:
-        passos += 1
-        if item == alvo:
-            return True, passos
+    if cancelado is None:
+        blocos = (lista,)
+    elif hasattr(lista, "__getitem__") and hasattr(lista, "__len__"):
+        blocos = (lista[inicio:inicio + BLOCO_LINEAR] for inicio in range(0, len(lista), BLOCO_LINEAR))
+    else:  # iterador (ex.: códigos lidos do banco em lotes)
+        iterador = iter(lista)
+        blocos = iter(lambda: list(islice(iterador, BLOCO_LINEAR)), [])
+
+    for bloco in blocos:
+        if cancelado is not None and cancelado.is_set():
+            break
+        for item in bloco:
+            passos += 1
+            if item == alvo:
+                return True, passos
     return False, passos
 
 
@@ -77,3 +113,323 @@ def busca_binaria(lista, alvo):
         else:
             direita = meio - 1
     return False, passos
+
+
+# ===========================================================
+# BUSCA EM LOTE
+# ===========================================================
+
+
+def buscar_lote(lista, alvos):
+    """
+    Resolve vários códigos de uma vez em uma lista ORDENADA.
+
+    Usa `numpy.searchsorted` quando o NumPy está disponível e,
+    caso contrário, um merge ordenado em Python puro: os alvos
+    são ordenados e a lista é percorrida uma única vez a partir
+    da posição do alvo anterior (busca galopante), o que evita
+    recomeçar a busca binária do zero para cada código.
+
+    Parâmetros:
+        lista (sequence): lista ordenada de elementos
+        alvos (iterable): valores a serem encontrados
+
+    Retorna:
+        tuple(list, list, int):
+            - Lista de flags (True se o alvo foi encontrado)
+            - Posição de cada alvo na lista (-1 se não encontrado)
+            - Total de passos (comparações) somando todos os alvos
+    """
+
+    alvos = list(alvos)
+    if np is not None and len(alvos) > 1:
+        return _buscar_lote_numpy(lista, alvos)
+    return _buscar_lote_merge(lista, alvos)
+
+
+def _buscar_lote_numpy(lista, alvos):
+    """
+    Busca em lote vetorizada com `numpy.searchsorted`.
+
+    Os passos são contados como na busca binária: cada busca
+    faz no máximo ⌊log2(n)⌋ + 1 comparações.
+    """
+
+    vetor = np.frombuffer(lista, dtype=np.int64) if isinstance(lista, (array, memoryview)) \
+        else np.asarray(lista, dtype=np.int64)
+    vetor_alvos = np.asarray(alvos, dtype=np.int64)
+
+    posicoes = np.searchsorted(vetor, vetor_alvos)
+    dentro = posicoes < len(vetor)
+    encontrados = np.zeros(len(vetor_alvos), dtype=bool)
+    encontrados[dentro] = vetor[posicoes[dentro]] == vetor_alvos[dentro]
+    posicoes = np.where(encontrados, posicoes, -1)
+
+    passos = len(vetor_alvos) * len(vetor).bit_length()
+    return encontrados.tolist(), posicoes.tolist(), passos
+
+
+def _buscar_lote_merge(lista, alvos):
+    """
+    Busca em lote em Python puro, por merge dos alvos ordenados.
+
+    A partir da posição do alvo anterior, a janela de busca
+    dobra de tamanho até ultrapassar o alvo (galope) e então é
+    refinada por busca binária. Alvos próximos entre si custam
+    poucos passos; alvos distantes, no máximo ~2·log2(n).
+    """
+
+    total = len(lista)
+    encontrados = [False] * len(alvos)
+    posicoes = [-1] * len(alvos)
+    passos = 0
+
+    esquerda = 0
+    for indice in sorted(range(len(alvos)), key=alvos.__getitem__):
+        alvo = alvos[indice]
+
+        # Galope: amplia a janela até lista[direita] >= alvo
+        salto = 1
+        direita = esquerda
+        while direita < total:
+            passos += 1
+            if lista[direita] >= alvo:
+                break
+            esquerda = direita + 1
+            direita = esquerda + salto
+            salto *= 2
+        direita = min(direita, total)
+
+        # Busca binária em [esquerda, direita)
+        while esquerda < direita:
+            passos += 1
+            meio = (esquerda + direita) // 2
+            if lista[meio] < alvo:
+                esquerda = meio + 1
+            else:
+                direita = meio
+
+        if esquerda < total and lista[esquerda] == alvo:
+            encontrados[indice] = True
+            posicoes[indice] = esquerda
+
+    return encontrados, posicoes, passos
+
+
+# ===========================================================
+# MOTORES DE BUSCA ADICIONAIS
+# ===========================================================
+
+
+def busca_interpolacao(lista, alvo):
+    """
+    Realiza uma busca por interpolação em uma lista ORDENADA.
+
+    Em vez de testar o meio do intervalo, estima a posição do alvo
+    supondo que os valores crescem de forma uniforme. Para códigos
+    densos e bem distribuídos (como os gerados pelo projeto) o alvo
+    costuma ser encontrado em um ou dois passos.
+
+    Parâmetros:
+        lista (list): lista ordenada de elementos
+        alvo (int): valor a ser encontrado
+
+    Retorna:
+        tuple(bool, int): (encontrado, passos)
+    """
+
+    esquerda = 0
+    direita = len(lista) - 1
+    passos = 0
+    while esquerda <= direita and lista[esquerda] <= alvo <= lista[direita]:
+        passos += 1
+        menor = lista[esquerda]
+        maior = lista[direita]
+        if maior == menor:
+            posicao = esquerda
+        else:
+            posicao = esquerda + (alvo - menor) * (direita - esquerda) // (maior - menor)
+        if lista[posicao] == alvo:
+            return True, passos
+        elif lista[posicao] < alvo:
+            esquerda = posicao + 1
+        else:
+            direita = posicao - 1
+    return False, passos
+
+
+def busca_exponencial(lista, alvo):
+    """
+    Realiza uma busca exponencial (galopante) em uma lista ORDENADA.
+
+    Dobra o limite superior (1, 2, 4, 8...) até ultrapassar o alvo
+    e então aplica a busca binária apenas nesse trecho. É eficiente
+    quando o alvo está próximo do início da lista.
+
+    Parâmetros:
+        lista (list): lista ordenada de elementos
+        alvo (int): valor a ser encontrado
+
+    Retorna:
+        tuple(bool, int): (encontrado, passos)
+    """
+
+    total = len(lista)
+    passos = 0
+    limite = 1
+    while limite < total and lista[limite] < alvo:
+        passos += 1
+        limite *= 2
+
+    esquerda = limite // 2
+    direita = min(limite, total - 1)
+    while esquerda <= direita:
+        passos += 1
+        meio = (esquerda + direita) // 2
+        if lista[meio] == alvo:
+            return True, passos
+        elif lista[meio] < alvo:
+            esquerda = meio + 1
+        else:
+            direita = meio - 1
+    return False, passos
+
+
+def construir_eytzinger(lista):
+    """
+    Reorganiza uma lista ORDENADA no layout de Eytzinger.
+
+    O layout guarda a árvore de busca binária em largura (BFS):
+    a raiz na posição 1 e os filhos de k nas posições 2k e 2k+1.
+    Os primeiros níveis, visitados por todas as buscas, ficam
+    contíguos na memória, o que favorece o cache do processador.
+
+    Parâmetros:
+        lista (list): lista ordenada de elementos
+
+    Retorna:
+        array('q'): árvore em layout de Eytzinger (posição 0 sem uso)
+    """
+
+    total = len(lista)
+    arvore = array("q", bytes(8 * (total + 1)))
+
+    # Percurso em ordem (in-order) iterativo: a i-ésima visita
+    # recebe o i-ésimo menor elemento da lista.
+    proximo = 0
+    pilha = []
+    k = 1
+    while pilha or k <= total:
+        while k <= total:
+            pilha.append(k)
+            k *= 2
+        k = pilha.pop()
+        arvore[k] = lista[proximo]
+        proximo += 1
+        k = 2 * k + 1
+    return arvore
+
+
+def busca_eytzinger(arvore, alvo):
+    """
+    Realiza uma busca binária sobre o layout de Eytzinger.
+
+    Parâmetros:
+        arvore (array): resultado de `construir_eytzinger`
+        alvo (int): valor a ser encontrado
+
+    Retorna:
+        tuple(bool, int): (encontrado, passos)
+    """
+
+    total = len(arvore) - 1
+    passos = 0
+    k = 1
+    while k <= total:
+        passos += 1
+        valor = arvore[k]
+        if valor == alvo:
+            return True, passos
+        k = 2 * k + (valor < alvo)
+    return False, passos
+
+
+def construir_indice_hash(lista):
+    """
+    Constrói um índice hash (dicionário) valor -> posição.
+
+    Parâmetros:
+        lista (list): lista de elementos (ordenada ou não)
+
+    Retorna:
+        dict: mapeamento de cada valor para sua posição
+    """
+
+    return {valor: posicao for posicao, valor in enumerate(lista)}
+
+
+def busca_hash(indice, alvo):
+    """
+    Realiza uma busca em um índice hash.
+
+    Parâmetros:
+        indice (dict): resultado de `construir_indice_hash`
+        alvo (int): valor a ser encontrado
+
+    Retorna:
+        tuple(bool, int): (encontrado, passos) — sempre um passo,
+            a consulta média ao dicionário
+    """
+
+    return alvo in indice, 1
+
+
+# ===========================================================
+# REGISTRO DE MOTORES DE BUSCA
+# ===========================================================
+
+
+MotorBusca = namedtuple("MotorBusca", ["nome", "buscar", "preparar"])
+MOTORES = {}
+
+
+def registrar_motor(chave, nome, buscar, preparar=None):
+    """
+    Registra um motor de busca.
+
+    Todo motor segue o mesmo contrato: `preparar(lista)` recebe a
+    lista ORDENADA de códigos e devolve a estrutura usada pela
+    busca, e `buscar(estrutura, alvo)` devolve (encontrado, passos).
+
+    Parâmetros:
+        chave (str): identificador do motor (ex.: "binaria")
+        nome (str): nome para exibição
+        buscar (callable): função (estrutura, alvo)
+        preparar (callable | None): função (lista) -> estrutura;
+            quando omitida, a própria lista é usada
+    """
+
+    MOTORES[chave] = MotorBusca(nome, buscar, preparar or (lambda lista: lista))
+
+
+def obter_motor(chave):
+    """
+    Retorna o motor registrado com a chave informada.
+
+    Lança:
+        ValueError: se o motor não estiver registrado
+    """
+
+    try:
+        return MOTORES[chave]
+    except KeyError:
+        raise ValueError(f"Motor de busca desconhecido: {chave!r} "
+                         f"(disponíveis: {', '.join(MOTORES)})") from None
+
+
+registrar_motor("linear", "Linear", busca_linear)
+registrar_motor("binaria", "Binária", busca_binaria)
+registrar_motor("interpolacao", "Interpolação", busca_interpolacao)
+registrar_motor("exponencial", "Exponencial", busca_exponencial)
+registrar_motor("eytzinger", "Eytzinger", busca_eytzinger, construir_eytzinger)
+registrar_motor("hash", "Hash", busca_hash, construir_indice_hash)
@@ -0,0 +1,182 @@
+"""
+===========================================================
+CACHE LRU DE RESULTADOS DE BUSCA
+
+Descrição:
+    Módulo que implementa o `CacheLRU`, um cache limitado para
+    os resultados das buscas da interface. As buscas por nome
+    são muito concentradas ("smartphone", "notebook", marcas) e
+    os códigos mais procurados se repetem: com o cache, uma
+    consulta repetida é respondida em O(1), sem refazer a busca.
+
+    - Remoção do item usado há mais tempo (LRU) quando o número
+      de itens ou o total aproximado de bytes passa do limite;
+    - Validade opcional (TTL), útil quando os dados mudam sem
+      aviso (backend em disco);
+    - Invalidação por geração: `invalidar` descarta tudo e
+      incrementa a geração, e resultados calculados antes dela
+      (buscas ainda em andamento) são recusados ao serem
+      guardados;
+    - Contadores de acertos, falhas, remoções e expirações.
+
+    As chaves são normalizadas (`chave_textual`), de modo que
+    "Mouse  Tech" e "tech mouse" compartilham a mesma entrada.
+
+===========================================================
+"""
+
+
+import threading
+import time
+from collections import OrderedDict
+
+
+# ===========================================================
+# FUNÇÃO AUXILIAR: chave_textual
+# ===========================================================
+
+
+def chave_textual(termo):
+    """
+    Normaliza um termo de busca por nome.
+
+    A busca exige todas as palavras em qualquer ordem, então
+    palavras repetidas, a ordem e as maiúsculas não mudam o
+    resultado.
+    """
+
+    return " ".join(sorted(set(termo.lower().split())))
+
+
+# ===========================================================
+# CLASSE: CacheLRU
+# ===========================================================
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado por itens e bytes, com TTL opcional.
+
+    Seguro para uso a partir de várias threads.
+
+    Atributos:
+        geracao (int): incrementada a cada invalidação
+    """
+
+    def __init__(self, maximo_itens=256, maximo_bytes=64 * 1024 * 1024, ttl=None, relogio=time.monotonic):
+        """
+        Parâmetros:
+            maximo_itens (int): número máximo de entradas
+            maximo_bytes (int): soma máxima dos tamanhos informados
+            ttl (float | None): validade das entradas em segundos
+                (None = sem expiração)
+            relogio (callable): fonte de tempo (segundos)
+        """
+
+        self.maximo_itens = maximo_itens
+        self.maximo_bytes = maximo_bytes
+        self.ttl = ttl
+        self.geracao = 0
+        self._relogio = relogio
+        self._itens = OrderedDict()  # chave -> (valor, tamanho, expira_em)
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self._contadores = dict.fromkeys(["acertos", "falhas", "remocoes", "expirados", "invalidacoes"], 0)
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, padrao=None):
+        """
+        Retorna o valor guardado (e o marca como usado recentemente).
+
+        Parâmetros:
+            chave: chave normalizada
+            padrao: valor retornado quando a chave não está no cache
+
+        Retorna:
+            valor guardado ou `padrao`
+        """
+
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                self._contadores["falhas"] += 1
+                return padrao
+            valor, tamanho, expira_em = item
+            if expira_em is not None and self._relogio() >= expira_em:
+                self._descartar(chave)
+                self._contadores["expirados"] += 1
+                self._contadores["falhas"] += 1
+                return padrao
+            self._itens.move_to_end(chave)
+            self._contadores["acertos"] += 1
+            return valor
+
+    def guardar(self, chave, valor, tamanho=1, geracao=None):
+        """
+        Guarda um valor, removendo os menos usados se preciso.
+
+        Parâmetros:
+            chave: chave normalizada
+            valor: resultado da busca
+            tamanho (int): tamanho aproximado em bytes
+            geracao (int | None): geração em que o valor começou a
+                ser calculado; se o cache foi invalidado desde então,
+                o valor é descartado
+
+        Retorna:
+            bool: True se o valor foi guardado
+        """
+
+        with self._trava:
+            if geracao is not None and geracao != self.geracao:
+                return False
+            if tamanho > self.maximo_bytes:
+                return False
+            if chave in self._itens:
+                self._descartar(chave)
+            expira_em = None if self.ttl is None else self._relogio() + self.ttl
+            self._itens[chave] = (valor, tamanho, expira_em)
+            self._bytes += tamanho
+            while len(self._itens) > self.maximo_itens or self._bytes > self.maximo_bytes:
+                self._descartar(next(iter(self._itens)))
+                self._contadores["remocoes"] += 1
+            return True
+
+    def invalidar(self):
+        """
+        Descarta todas as entradas (ex.: após atualizar os dados).
+        """
+
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
+            self.geracao += 1
+            self._contadores["invalidacoes"] += 1
+
+    def estatisticas(self):
+        """
+        Retorna os contadores e a ocupação do cache.
+
+        Retorna:
+            dict: itens, bytes, acertos, falhas, remocoes, expirados,
+                invalidacoes e taxa_acerto (0 a 1)
+        """
+
+        with self._trava:
+            consultas = self._contadores["acertos"] + self._contadores["falhas"]
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                **self._contadores,
+                "taxa_acerto": self._contadores["acertos"] / consultas if consultas else 0.0,
+            }
+
+    def _descartar(self, chave):
+        """
+        Remove uma entrada (a trava já deve estar adquirida).
+        """
+
+        _, tamanho, _ = self._itens.pop(chave)
+        self._bytes -= tamanho
@@ -0,0 +1,461 @@
+"""
+===========================================================
+GERADOR DE CARGA DO SERVIÇO DE BUSCAS
+
+Descrição:
+    Reproduz tráfego concorrente sobre as rotas do servidor
+    (src.servidor) e mede vazão e latência de cauda. O alvo pode
+    ser o próprio processo (as rotas de `ServidorBusca` chamadas
+    sem a camada HTTP) ou um servidor local já em execução.
+
+    Mistura de consultas (--mix, pesos relativos):
+        - codigo: códigos existentes com popularidade Zipf (poucos
+          produtos concentram a maior parte das buscas)
+        - erro: códigos inexistentes
+        - nome: termos de 1 a 3 palavras tirados de nomes reais,
+          também com popularidade Zipf; a maioria pede a primeira
+          página e as demais, páginas seguintes
+
+    Concorrência e taxa:
+        Cada etapa usa N clientes simultâneos. Sem taxa (0), cada
+        cliente envia a próxima consulta assim que recebe a
+        resposta (carga fechada). Com --taxas, as consultas são
+        agendadas em intervalos fixos (carga aberta) e a latência
+        é contada a partir do horário AGENDADO: quando o serviço
+        não acompanha a taxa, a espera na fila entra na medição
+        (correção da "omissão coordenada", como no HdrHistogram).
+
+    Saídas:
+        - Resumo por etapa e tipo de consulta (vazão, média, p50,
+          p90, p99, p99,9 e máximo), no terminal e em CSV;
+        - Série por segundo (curva de vazão e p99 ao longo do
+          tempo), em CSV;
+        - Distribuição de percentis de cada histograma, em CSV.
+
+    As latências são registradas em `HistogramaLatencia`
+    (src.metricas), no estilo do HdrHistogram: erro relativo
+    abaixo de 1% e memória independente do número de medições.
+
+Uso:
+    python -m src.carga --alvo processo --concorrencias 1 16 64 --duracao 10
+    python -m src.carga --alvo http://127.0.0.1:8080 --taxas 1000 2000 4000 --saida resumo.csv
+    python -m src.carga --mix codigo=50 erro=5 nome=45 --zipf 1.2 --serie serie.csv
+
+===========================================================
+"""
+
+
+import argparse
+import asyncio
+import csv
+import itertools
+import random
+import sqlite3
+import sys
+import time
+from bisect import bisect_left
+from contextlib import redirect_stdout
+from urllib.parse import urlencode, urlsplit
+from src.database import DB_FILE
+from src.metricas import HistogramaLatencia
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+MIX_PADRAO = {"codigo": 70, "erro": 10, "nome": 20}
+TIPOS = list(MIX_PADRAO)
+PERCENTIS_RESUMO = [("p50_us", 0.50), ("p90_us", 0.90), ("p99_us", 0.99), ("p999_us", 0.999)]
+CAMPOS_RESUMO = ["etapa", "concorrencia", "taxa_alvo", "tipo", "requisicoes", "erros", "duracao_s",
+                 "vazao_por_s", "media_us"] + [nome for nome, _ in PERCENTIS_RESUMO] + ["max_us"]
+CAMPOS_SERIE = ["etapa", "segundo", "requisicoes", "erros", "p50_us", "p99_us"]
+CAMPOS_HISTOGRAMA = ["etapa", "tipo", "percentil", "valor_us", "contagem_acumulada"]
+
+
+# ===========================================================
+# GERAÇÃO DAS CONSULTAS
+# ===========================================================
+
+
+def amostrar_banco(caminho_db, quantidade, gerador):
+    """
+    Sorteia produtos do banco pelo id_produto (sem varrer a tabela).
+
+    Retorna:
+        tuple(list, int): amostra de (codigo, nome) e o maior código
+    """
+
+    conn = sqlite3.connect(f"file:{caminho_db}?mode=ro", uri=True)
+    try:
+        menor, maior = conn.execute("SELECT MIN(id_produto), MAX(id_produto) FROM produtos").fetchone()
+        maior_codigo = conn.execute("SELECT MAX(codigo_busca) FROM produtos").fetchone()[0]
+        ids = [gerador.randint(menor, maior) for _ in range(quantidade)]
+        amostra = []
+        for inicio in range(0, len(ids), 500):
+            lote = ids[inicio:inicio + 500]
+            amostra += conn.execute(
+                f"SELECT codigo_busca, nome_produto FROM produtos WHERE id_produto IN ({', '.join('?' * len(lote))}) "
+                "AND codigo_busca IS NOT NULL", lote).fetchall()
+    finally:
+        conn.close()
+    gerador.shuffle(amostra)
+    return amostra, maior_codigo
+
+
+class DistribuicaoZipf:
+    """
+    Sorteia posições 0..n-1 com probabilidade proporcional a 1/(k+1)^s.
+    """
+
+    def __init__(self, quantidade, expoente, gerador):
+        pesos = itertools.accumulate(1 / (posicao + 1) ** expoente for posicao in range(quantidade))
+        self._acumulado = list(pesos)
+        self._gerador = gerador
+
+    def sortear(self):
+        alvo = self._gerador.random() * self._acumulado[-1]
+        return min(bisect_left(self._acumulado, alvo), len(self._acumulado) - 1)
+
+
+class GeradorConsultas:
+    """
+    Produz a sequência de consultas da mistura configurada.
+
+    Cada consulta é uma tupla (tipo, caminho), onde o caminho é
+    uma URL relativa das rotas de `ServidorBusca`.
+    """
+
+    def __init__(self, amostra, maior_codigo, mix=None, zipf=1.1, populares=10_000, termos=500, semente=None):
+        """
+        Parâmetros:
+            amostra (list): produtos reais (codigo, nome) sorteados
+            maior_codigo (int): maior código existente (erros acima dele)
+            mix (dict): peso de cada tipo de consulta
+            zipf (float): expoente da popularidade de códigos e termos
+            populares (int): códigos distintos consultados
+            termos (int): termos de busca distintos
+            semente (int | None): semente do sorteio
+        """
+
+        self._gerador = random.Random(semente)
+        mix = mix or MIX_PADRAO
+        self._tipos = [tipo for tipo in mix if mix[tipo] > 0]
+        self._pesos = list(itertools.accumulate(mix[tipo] for tipo in self._tipos))
+        self.maior_codigo = maior_codigo
+
+        self.codigos = [codigo for codigo, _ in amostra[:populares]]
+        self.termos = list(dict.fromkeys(self._criar_termo(nome) for _, nome in amostra[:termos]))
+        self._zipf_codigos = DistribuicaoZipf(len(self.codigos), zipf, self._gerador)
+        self._zipf_termos = DistribuicaoZipf(len(self.termos), zipf, self._gerador)
+
+    def _criar_termo(self, nome):
+        """
+        Escolhe de 1 a 3 palavras de um nome real, em ordem.
+        """
+
+        palavras = nome.lower().split()
+        quantidade = self._gerador.randint(1, min(3, len(palavras)))
+        escolhidas = sorted(self._gerador.sample(range(len(palavras)), quantidade))
+        return " ".join(palavras[posicao] for posicao in escolhidas)
+
+    def proxima(self):
+        """
+        Retorna a próxima consulta.
+
+        Retorna:
+            tuple(str, str): (tipo, caminho)
+        """
+
+        gerador = self._gerador
+        tipo = self._tipos[bisect_left(self._pesos, gerador.random() * self._pesos[-1])]
+        if tipo == "codigo":
+            return tipo, f"/produto?codigo={self.codigos[self._zipf_codigos.sortear()]}"
+        if tipo == "erro":
+            return tipo, f"/produto?codigo={self.maior_codigo + gerador.randint(1, 1_000_000)}"
+        pagina = 0 if gerador.random() < 0.8 else gerador.randint(1, 5)
+        return tipo, "/busca?" + urlencode({"q": self.termos[self._zipf_termos.sortear()], "pagina": pagina})
+
+
+# ===========================================================
+# ALVOS (NO PROCESSO OU VIA HTTP)
+# ===========================================================
+
+
+class AlvoProcesso:
+    """
+    Envia as consultas direto às rotas de um `ServidorBusca`.
+    """
+
+    def __init__(self, servidor):
+        self.servidor = servidor
+
+    async def abrir(self):
+        return self
+
+    async def enviar(self, caminho):
+        status, _ = await self.servidor.responder("GET", caminho, b"")
+        return status
+
+    async def fechar(self):
+        pass
+
+
+class AlvoHttp:
+    """
+    Envia as consultas a um servidor HTTP, uma conexão
+    persistente por cliente.
+    """
+
+    def __init__(self, url):
+        partes = urlsplit(url)
+        self.host, self.porta = partes.hostname, partes.port or 80
+
+    async def abrir(self):
+        return _ConexaoHttp(*await asyncio.open_connection(self.host, self.porta), self.host)
+
+
+class _ConexaoHttp:
+    def __init__(self, leitor, escritor, host):
+        self._leitor, self._escritor, self._host = leitor, escritor, host
+
+    async def enviar(self, caminho):
+        self._escritor.write(f"GET {caminho} HTTP/1.1\r\nHost: {self._host}\r\n\r\n".encode("latin-1"))
+        await self._escritor.drain()
+        cabecalho = (await self._leitor.readuntil(b"\r\n\r\n")).decode("latin-1")
+        tamanho = 0
+        for linha in cabecalho.split("\r\n")[1:]:
+            nome, _, valor = linha.partition(":")
+            if nome.strip().lower() == "content-length":
+                tamanho = int(valor)
+        await self._leitor.readexactly(tamanho)
+        return int(cabecalho.split(" ", 2)[1])
+
+    async def fechar(self):
+        self._escritor.close()
+
+
+# ===========================================================
+# EXECUÇÃO DE UMA ETAPA
+# ===========================================================
+
+
+async def executar_etapa(alvo, gerador, concorrencia, taxa=0, duracao=10.0, medir=True):
+    """
+    Executa uma etapa de carga e coleta as latências.
+
+    Parâmetros:
+        alvo: AlvoProcesso ou AlvoHttp
+        gerador (GeradorConsultas): origem das consultas
+        concorrencia (int): clientes simultâneos
+        taxa (float): consultas por segundo agendadas (0 = carga fechada)
+        duracao (float): duração da etapa em segundos
+        medir (bool): False para aquecimento (nada é registrado)
+
+    Retorna:
+        dict: histogramas por tipo, erros por tipo, série por
+            segundo e duração efetiva
+    """
+
+    histogramas = {tipo: HistogramaLatencia() for tipo in TIPOS}
+    erros = dict.fromkeys(TIPOS, 0)
+    serie = {}  # segundo -> [HistogramaLatencia, erros]
+    sequencia = itertools.count()
+    inicio = time.perf_counter()
+    limite = inicio + duracao
+
+    async def cliente():
+        sessao = await alvo.abrir()
+        try:
+            while True:
+                numero = next(sequencia)
+                if taxa:
+                    agendado = inicio + numero / taxa
+                    if agendado >= limite:
+                        break
+                    espera = agendado - time.perf_counter()
+                    if espera > 0:
+                        await asyncio.sleep(espera)
+                else:
+                    agendado = time.perf_counter()
+                    if agendado >= limite:
+                        break
+                tipo, caminho = gerador.proxima()
+                status = await sessao.enviar(caminho)
+                fim = time.perf_counter()
+                if not medir:
+                    continue
+                latencia = (fim - agendado) * 1_000_000
+                histogramas[tipo].registrar(latencia)
+                segundo = serie.setdefault(int(fim - inicio), [HistogramaLatencia(), 0])
+                segundo[0].registrar(latencia)
+                if status != 200:
+                    erros[tipo] += 1
+                    segundo[1] += 1
+        finally:
+            await sessao.fechar()
+
+    await asyncio.gather(*(cliente() for _ in range(concorrencia)))
+    return {"histogramas": histogramas, "erros": erros, "serie": serie,
+            "duracao": time.perf_counter() - inicio}
+
+
+def resumir_etapa(etapa, concorrencia, taxa, resultado):
+    """
+    Monta as linhas de resumo (uma por tipo e uma com todos).
+    """
+
+    todos = HistogramaLatencia()
+    linhas = []
+    for tipo in TIPOS + ["todos"]:
+        if tipo == "todos":
+            histograma, erros = todos, sum(resultado["erros"].values())
+        else:
+            histograma, erros = resultado["histogramas"][tipo], resultado["erros"][tipo]
+            todos.mesclar(histograma)
+        if not histograma.total:
+            continue
+        linha = {
+            "etapa": etapa,
+            "concorrencia": concorrencia,
+            "taxa_alvo": taxa,
+            "tipo": tipo,
+            "requisicoes": histograma.total,
+            "erros": erros,
+            "duracao_s": round(resultado["duracao"], 3),
+            "vazao_por_s": round(histograma.total / resultado["duracao"], 1),
+            "media_us": round(histograma.media, 1),
+            "max_us": histograma.maximo,
+        }
+        linha.update({nome: histograma.percentil(fracao) for nome, fracao in PERCENTIS_RESUMO})
+        linhas.append(linha)
+    return linhas, todos
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL
+# ===========================================================
+
+
+def _ler_mix(itens):
+    """
+    Converte ["codigo=70", "nome=30"] em {"codigo": 70, "nome": 30}.
+    """
+
+    mix = dict.fromkeys(TIPOS, 0)
+    for item in itens:
+        tipo, _, peso = item.partition("=")
+        if tipo not in mix:
+            raise argparse.ArgumentTypeError(f"tipo de consulta desconhecido: {tipo!r}")
+        mix[tipo] = float(peso)
+    return mix
+
+
+def _escrever_csv(caminho, campos, linhas):
+    with open(caminho, "w", newline="", encoding="utf-8") as destino:
+        escritor = csv.DictWriter(destino, fieldnames=campos)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+async def _executar(args, alvo, gerador):
+    """
+    Executa o aquecimento e todas as etapas (concorrência x taxa).
+    """
+
+    if args.aquecimento > 0:
+        print(f"🔥 Aquecimento: {args.aquecimento:.0f} s", file=sys.stderr)
+        await executar_etapa(alvo, gerador, max(args.concorrencias), 0, args.aquecimento, medir=False)
+
+    resumo, serie, histogramas = [], [], []
+    etapas = itertools.product(args.concorrencias, args.taxas)
+    for etapa, (concorrencia, taxa) in enumerate(etapas, 1):
+        resultado = await executar_etapa(alvo, gerador, concorrencia, taxa, args.duracao)
+        linhas, todos = resumir_etapa(etapa, concorrencia, taxa, resultado)
+        resumo += linhas
+        for segundo, (histograma, erros) in sorted(resultado["serie"].items()):
+            serie.append({"etapa": etapa, "segundo": segundo, "requisicoes": histograma.total, "erros": erros,
+                          "p50_us": histograma.percentil(0.5), "p99_us": histograma.percentil(0.99)})
+        for tipo, histograma in list(resultado["histogramas"].items()) + [("todos", todos)]:
+            histogramas += [{"etapa": etapa, "tipo": tipo, "percentil": round(fracao, 6), "valor_us": valor,
+                             "contagem_acumulada": acumulado}
+                            for fracao, valor, acumulado in histograma.distribuicao()]
+
+        print(f"\n📊 Etapa {etapa}: {concorrencia} cliente(s), taxa {taxa or 'livre'}", file=sys.stderr)
+        for linha in linhas:
+            print(f"   {linha['tipo']:<7} {linha['requisicoes']:>8,} req  {linha['vazao_por_s']:>9,.0f}/s  "
+                  f"p50 {linha['p50_us']:>8,} µs  p99 {linha['p99_us']:>8,} µs  "
+                  f"p99,9 {linha['p999_us']:>8,} µs  máx {linha['max_us']:>8,} µs  erros {linha['erros']}",
+                  file=sys.stderr)
+    return resumo, serie, histogramas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.carga",
+        description="Gerador de carga do serviço de buscas (vazão e latência de cauda).")
+    parser.add_argument("--alvo", default="processo",
+                        help="'processo' (rotas chamadas no próprio processo) ou URL de um servidor")
+    parser.add_argument("--banco", default=DB_FILE, help="banco de onde vêm códigos e nomes reais")
+    parser.add_argument("--backend", choices=["memoria", "banco"], default="memoria",
+                        help="backend do alvo 'processo'")
+    parser.add_argument("--mix", nargs="+", default=[f"{tipo}={peso}" for tipo, peso in MIX_PADRAO.items()],
+                        help="pesos das consultas (ex.: codigo=70 erro=10 nome=20)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="expoente da popularidade (0 = uniforme)")
+    parser.add_argument("--populares", type=int, default=10_000, help="códigos distintos consultados")
+    parser.add_argument("--termos", type=int, default=500, help="termos de busca distintos")
+    parser.add_argument("--concorrencias", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--taxas", type=float, nargs="+", default=[0],
+                        help="consultas/s agendadas por etapa (0 = carga fechada)")
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos por etapa")
+    parser.add_argument("--aquecimento", type=float, default=2.0, help="segundos de aquecimento")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="CSV com o resumo por etapa e tipo")
+    parser.add_argument("--serie", help="CSV com vazão e latência por segundo")
+    parser.add_argument("--histograma", help="CSV com a distribuição de percentis")
+    args = parser.parse_args(argv)
+    mix = _ler_mix(args.mix)
+
+    amostra, maior_codigo = amostrar_banco(args.banco, max(args.populares, args.termos),
+                                           random.Random(args.semente))
+    gerador = GeradorConsultas(amostra, maior_codigo, mix, args.zipf, args.populares, args.termos, args.semente)
+
+    servidor = None
+    if args.alvo == "processo":
+        from src.servidor import ServidorBusca
+        # Mensagens da carga no stderr: o stdout traz apenas o resumo em CSV
+        with redirect_stdout(sys.stderr):
+            if args.backend == "banco":
+                from src.backend_banco import DatabaseBackend
+                produtos = indice = DatabaseBackend(args.banco)
+            else:
+                from src.database import carregar_dados
+                from src.indice_textual import IndiceTextual
+                produtos = carregar_dados(args.banco)
+                indice = IndiceTextual(produtos)
+        servidor = ServidorBusca(produtos, indice, args.backend)
+        alvo = AlvoProcesso(servidor)
+    else:
+        alvo = AlvoHttp(args.alvo)
+
+    try:
+        resumo, serie, histogramas = asyncio.run(_executar(args, alvo, gerador))
+    finally:
+        if servidor is not None:
+            servidor.fechar()
+
+    if args.saida:
+        _escrever_csv(args.saida, CAMPOS_RESUMO, resumo)
+    else:
+        escritor = csv.DictWriter(sys.stdout, fieldnames=CAMPOS_RESUMO)
+        escritor.writeheader()
+        escritor.writerows(resumo)
+    if args.serie:
+        _escrever_csv(args.serie, CAMPOS_SERIE, serie)
+    if args.histograma:
+        _escrever_csv(args.histograma, CAMPOS_HISTOGRAMA, histogramas)
+
+
+if __name__ == "__main__":
+    main()
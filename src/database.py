@@ -5,7 +5,17 @@ Descrição:
     de dados SQLite do sistema de e-commerce. Ele realiza a
     leitura dos produtos cadastrados e retorna as estruturas
     necessárias para execução dos algoritmos de busca
-    (linear e binária), bem como a busca textual.
+    (linear e binária), bem como a busca textual, em um
+    armazenamento colunar compacto (`ProductStore`).
+
+    Quando existe um snapshot binário válido ao lado do banco
+    (ver `src.snapshot`), os dados são abertos diretamente dele
+    via mmap, sem executar a consulta completa no SQLite.
+
+    A carga apenas lê o banco. Se o rastreamento de alterações
+    estiver ativo (`python -m src.atualizacao`), a versão lida é
+    registrada em `produtos.versao`, permitindo a atualização
+    incremental posterior (ver `src.atualizacao`).
 
     O arquivo é projetado para funcionar de forma independente
     da localização do script principal, utilizando caminhos
@@ -15,7 +25,12 @@ Descrição:
 
 
 import sqlite3
+import time
 import os
+from src.armazenamento import ProductStore
+from src.atualizacao import ler_versao
+from src.metricas import contar, span
+from src.snapshot import abrir_snapshot, salvar_snapshot
 
 
 # ===========================================================
@@ -27,34 +42,133 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_FILE = os.path.join(BASE_DIR, "../db/ecommerce.db")
 DB_FILE = os.path.normpath(DB_FILE)
 
-    
-def carregar_dados(caminho_db=DB_FILE):
+TAMANHO_LOTE = 50_000
+
+
+class CarregamentoCancelado(Exception):
+    """
+    Sinaliza que a carga foi interrompida pelo evento de cancelamento.
+    """
+
+
+def _criar_exibidor_progresso():
+    """
+    Cria a função de progresso padrão, que exibe a carga a cada
+    10% concluídos.
+    """
+
+    ultimo = [-1]
+
+    def exibir(carregados, total):
+        decimo = carregados * 10 // total if total else 10
+        if decimo != ultimo[0]:
+            ultimo[0] = decimo
+            print(f"📥 {carregados:,}/{total:,} produtos carregados...")
+
+    return exibir
+
+
+def _ler_banco(caminho_db, produtos, tamanho_lote, progresso, cancelar):
+    """
+    Lê o banco em lotes (fetchmany) direto para as colunas do store.
+
+    Parâmetros:
+        caminho_db (str): caminho do banco SQLite
+        produtos (ProductStore): store que recebe as linhas
+        tamanho_lote (int): linhas lidas por chamada a fetchmany
+        progresso (callable | None): função (carregados, total)
+        cancelar (threading.Event | None): interrompe a leitura
+            quando sinalizado, lançando CarregamentoCancelado
+    """
+
+    conn = sqlite3.connect(caminho_db)
+    try:
+        # Versão, contagem e linhas lidas na mesma transação
+        conn.execute("BEGIN")
+        produtos.versao = ler_versao(conn)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM produtos WHERE codigo_busca IS NOT NULL")
+        total = cursor.fetchone()[0]
+
+        with span("carga", fase="sql"):
+            cursor.execute("""
+                SELECT codigo_busca, nome_produto, preco
+                FROM produtos
+                WHERE codigo_busca IS NOT NULL
+                ORDER BY codigo_busca
+            """)
+        while True:
+            if cancelar is not None and cancelar.is_set():
+                raise CarregamentoCancelado()
+            with span("carga", fase="sql"):
+                linhas = cursor.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            with span("carga", fase="colunas"):
+                produtos.adicionar_lote(linhas)
+            if progresso is not None:
+                progresso(len(produtos), total)
+    finally:
+        conn.close()
+
+
+def carregar_dados(caminho_db=DB_FILE, usar_snapshot=True, tamanho_lote=TAMANHO_LOTE,
+                   progresso=None, cancelar=None):
     """
     Carrega os dados do banco SQLite para a memória.
 
+    A ordenação por código é feita pelo próprio SQLite e as
+    linhas são lidas em lotes com `fetchmany`, sendo gravadas
+    diretamente nas colunas do `ProductStore`. Assim o pico de
+    memória fica próximo do tamanho final dos dados.
+
+    Parâmetros:
+        caminho_db (str): caminho do banco SQLite
+        usar_snapshot (bool): abre o snapshot binário quando ele
+            estiver atualizado e grava um novo após ler o banco
+        tamanho_lote (int): linhas lidas por lote
+        progresso (callable | None): função (carregados, total)
+            chamada após cada lote (padrão: exibe a cada 10%)
+        cancelar (threading.Event | None): evento que interrompe
+            a carga (lança CarregamentoCancelado)
+
     Retorna:
-        tuple(list, dict, list): 
-            - Lista de IDs dos produtos
-            - Dicionário com ID como chave e (nome, preço) como valor
-            - Lista de tuplas (nome, preço, ID) para busca textual
+        ProductStore: produtos em colunas ordenadas por código
+            (códigos, preços e nomes acessados por posição)
     """
+    inicio = time.perf_counter()
+
+    if usar_snapshot:
+        with span("carga", fase="snapshot"):
+            produtos = abrir_snapshot(caminho_db)
+        if produtos is not None:
+            # O snapshot só é válido se o banco não mudou desde que
+            # foi gravado, então a versão atual é a dos dados
+            conn = sqlite3.connect(caminho_db)
+            try:
+                produtos.versao = ler_versao(conn)
+            finally:
+                conn.close()
+            tempo = time.perf_counter() - inicio
+            contar("produtos_carregados", len(produtos), origem="snapshot")
+            print(f"⚡ {len(produtos)} produtos abertos do snapshot em {tempo:.3f} s.")
+            return produtos
+
     print("🔄 Carregando dados do banco...")
 
-    conn = sqlite3.connect(caminho_db)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT codigo_busca, nome_produto, preco
-        FROM produtos
-        WHERE codigo_busca IS NOT NULL
-    """)
-    dados = cursor.fetchall()
-    conn.close()
-
-    cods_buscas = [linha[0] for linha in dados]
-    cods_buscas.sort()  
-
-    produtos = {linha[0]: (linha[1], linha[2]) for linha in dados}
-    produtos_lista = [(linha[1], linha[2], linha[0]) for linha in dados] 
-
-    print(f"✅ {len(cods_buscas)} produtos carregados.")
-    return cods_buscas, produtos, produtos_lista
\ No newline at end of file
+    produtos = ProductStore()
+    if progresso is None:
+        progresso = _criar_exibidor_progresso()
+    _ler_banco(caminho_db, produtos, tamanho_lote, progresso, cancelar)
+
+    tempo = time.perf_counter() - inicio
+    contar("produtos_carregados", len(produtos), origem="banco")
+    print(f"✅ {len(produtos)} produtos carregados em {tempo:.2f} s.")
+
+    if usar_snapshot:
+        try:
+            with span("carga", fase="snapshot_gravacao"):
+                salvar_snapshot(produtos, caminho_db)
+        except OSError as erro:
+            print(f"⚠️  Não foi possível gravar o snapshot: {erro}")
+    return produtos
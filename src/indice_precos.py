@@ -0,0 +1,208 @@
+"""
+===========================================================
+ÍNDICE ORDENADO DE PREÇOS
+
+Descrição:
+    Módulo que implementa o `IndicePrecos`, índice secundário
+    sobre a coluna de preços de um `ProductStore`:
+
+    - precos: array('d') com os preços em ordem crescente
+    - linhas: array('i') com a linha de cada preço (permutação
+      das linhas do store; empates em ordem de linha)
+
+    Uma faixa de preços [mínimo, máximo] é resolvida com duas
+    buscas binárias na coluna ordenada e corresponde a uma fatia
+    contígua de `linhas`, já em ordem de preço. O cursor devolvido
+    é uma visão (memoryview) dessa fatia: qualquer página é obtida
+    por fatia, em tempo independente do tamanho do catálogo.
+
+    Filtro combinado com a busca por nome:
+        As posições encontradas pelo `IndiceTextual` são linhas do
+        mesmo store, então o filtro é uma interseção de linhas,
+        feita a partir do lado menor:
+        - Poucos resultados por nome: confere-se o preço de cada
+          um e ordena-se o que sobrou;
+        - Faixa de preços estreita: percorre-se a fatia (já em
+          ordem de preço) e cada linha é procurada, por busca
+          binária, nos resultados por nome.
+
+    Atualização incremental:
+        `atualizar` reconstrói as duas colunas por cópias de
+        fatias, em uma única passada, em vez de alterá-las no
+        lugar: os cursores já entregues continuam válidos e veem
+        os preços anteriores à atualização.
+
+    Usa `numpy.argsort` (ordenação estável) na construção quando
+    o NumPy está disponível.
+
+===========================================================
+"""
+
+
+from array import array
+from bisect import bisect_left, bisect_right
+from src.metricas import cronometrar
+from src.paginacao import CursorBusca
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: usa-se o sorted em Python puro
+    np = None
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES
+# ===========================================================
+
+
+def _contem(ordenadas, valor):
+    """
+    Verifica se o valor está em uma sequência ordenada.
+    """
+
+    posicao = bisect_left(ordenadas, valor)
+    return posicao < len(ordenadas) and ordenadas[posicao] == valor
+
+
+def _ordenar_linhas(precos, linhas):
+    """
+    Ordena as linhas por (preço, linha).
+
+    Retorna:
+        tuple(array, array): preços ordenados e linhas correspondentes
+    """
+
+    if np is not None and len(linhas) > 1:
+        indices = np.asarray(linhas, dtype=np.int32)
+        vetor = np.asarray(precos, dtype=np.float64)[indices]
+        ordem = np.argsort(vetor, kind="stable")
+        return array("d", vetor[ordem].tobytes()), array("i", indices[ordem].tobytes())
+
+    ordenadas = sorted(linhas, key=precos.__getitem__)
+    return array("d", map(precos.__getitem__, ordenadas)), array("i", ordenadas)
+
+
+# ===========================================================
+# CLASSE: IndicePrecos
+# ===========================================================
+
+
+class IndicePrecos:
+    """
+    Índice preço -> linhas do ProductStore, ordenado por preço.
+
+    Atributos:
+        produtos (ProductStore): store indexado
+        precos (array): preços em ordem crescente
+        linhas (array): linha de cada posição de `precos`
+    """
+
+    @cronometrar("indice_precos")
+    def __init__(self, produtos):
+        """
+        Constrói o índice ordenando as linhas pelo preço.
+
+        Parâmetros:
+            produtos (ProductStore): produtos a indexar
+        """
+
+        self.produtos = produtos
+        linhas = range(len(produtos.nomes))
+        if produtos.linhas is not None:
+            nomes = produtos.nomes
+            linhas = [linha for linha in linhas if nomes[linha]]  # sem lápides
+        self.precos, self.linhas = _ordenar_linhas(produtos.precos, linhas)
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def intervalo(self, minimo=None, maximo=None):
+        """
+        Localiza a faixa de preços na coluna ordenada.
+
+        Parâmetros:
+            minimo (float | None): menor preço aceito (inclusive)
+            maximo (float | None): maior preço aceito (inclusive)
+
+        Retorna:
+            tuple(int, int): posições [inicio, fim) em `precos`/`linhas`
+        """
+
+        inicio = 0 if minimo is None else bisect_left(self.precos, minimo)
+        fim = len(self.precos) if maximo is None else bisect_right(self.precos, maximo)
+        return inicio, max(inicio, fim)
+
+    @cronometrar("busca_precos")
+    def cursor_precos(self, minimo=None, maximo=None, linhas=None, decrescente=False):
+        """
+        Cria um cursor sobre os produtos da faixa, ordenados por preço.
+
+        Parâmetros:
+            minimo, maximo (float | None): faixa de preços (inclusive)
+            linhas (sequence | None): restringe o resultado a estas
+                linhas, em ordem crescente (ex.: posições de uma
+                busca por nome)
+            decrescente (bool): do maior para o menor preço
+
+        Retorna:
+            CursorBusca: cursor com as posições já prontas
+        """
+
+        inicio, fim = self.intervalo(minimo, maximo)
+        if linhas is None:
+            posicoes = memoryview(self.linhas)[inicio:fim]
+        elif len(linhas) <= fim - inicio:
+            precos = self.produtos.precos
+            minimo = float("-inf") if minimo is None else minimo
+            maximo = float("inf") if maximo is None else maximo
+            selecionadas = [linha for linha in linhas if minimo <= precos[linha] <= maximo]
+            selecionadas.sort(key=precos.__getitem__)
+            posicoes = array("i", selecionadas)
+        else:
+            posicoes = array("i", [linha for linha in self.linhas[inicio:fim] if _contem(linhas, linha)])
+
+        if decrescente:
+            posicoes = posicoes[::-1]
+        return CursorBusca(self.produtos, lambda: iter(posicoes), posicoes=posicoes)
+
+    def _posicao(self, preco, linha):
+        """
+        Retorna a posição de (preço, linha) na ordem do índice.
+        """
+
+        inicio, fim = bisect_left(self.precos, preco), bisect_right(self.precos, preco)
+        return bisect_left(self.linhas, linha, inicio, fim)
+
+    def atualizar(self, removidas=(), novas=()):
+        """
+        Aplica um lote de alterações de preço.
+
+        Uma troca de preço é informada como remoção do preço antigo
+        e inserção do novo.
+
+        Parâmetros:
+            removidas (iterable): tuplas (linha, preço antigo)
+            novas (iterable): tuplas (linha, preço atual)
+        """
+
+        eventos = [(self._posicao(preco, linha), 1, None) for linha, preco in removidas]
+        eventos += [(self._posicao(preco, linha), 0, (preco, linha)) for linha, preco in novas]
+        if not eventos:
+            return
+        eventos.sort()
+
+        # Inserções antes das remoções na mesma posição
+        precos, linhas = array("d"), array("i")
+        anterior = 0
+        for posicao, remocao, item in eventos:
+            precos += self.precos[anterior:posicao]
+            linhas += self.linhas[anterior:posicao]
+            if remocao:
+                anterior = posicao + 1
+            else:
+                anterior = posicao
+                precos.append(item[0])
+                linhas.append(item[1])
+        precos += self.precos[anterior:]
+        linhas += self.linhas[anterior:]
+        self.precos, self.linhas = precos, linhas
@@ -0,0 +1,439 @@
+"""
+===========================================================
+ÍNDICE INVERTIDO PARA BUSCA TEXTUAL
+
+Descrição:
+    Módulo que implementa um índice invertido sobre os nomes
+    dos produtos de um `ProductStore`. Cada palavra (token) em
+    minúsculas aponta para um array ordenado com as posições
+    dos produtos que a contêm (lista de "postings").
+
+    Os nomes são formados por um vocabulário pequeno (tipo de
+    produto, marca e modelo X100–X999), então o índice tem
+    poucas entradas, cada uma com muitas posições.
+
+Semântica da busca:
+    A busca textual original aceita um produto quando TODAS as
+    palavras digitadas aparecem como substring do nome em
+    minúsculas (`all(p in nome.lower() for p in palavras)`).
+
+    Como as palavras digitadas não contêm espaços, uma palavra
+    é substring do nome se, e somente se, for substring de
+    algum de seus tokens. Assim, para cada palavra:
+        1. Seleciona-se no vocabulário os tokens que a contêm;
+        2. Une-se as posições desses tokens;
+    e o resultado final é a interseção entre as palavras.
+    O conjunto de resultados é idêntico ao da varredura.
+
+    Palavras parciais ("phon", "x12"):
+        O passo 1 usa um índice de trigramas sobre o
+        VOCABULÁRIO: cada trigrama aponta para um array ordenado
+        com os identificadores dos tokens que o contêm. Os
+        candidatos são a interseção dos arrays dos trigramas da
+        palavra e apenas eles são conferidos com
+        `palavra in token`, de modo que o custo não cresce com o
+        tamanho do vocabulário (palavras com menos de 3
+        caracteres, que casam com boa parte dele, ainda o
+        percorrem). Os trigramas ficam no vocabulário, e não em
+        cada nome, porque os nomes repetem poucos tokens: as
+        listas por linha continuam sendo as de cada token.
+
+    A palavra mais seletiva conduz a iteração (união ordenada
+    das suas listas) e as demais são conferidas nos nomes dos
+    candidatos. Como os nomes são codificados por dicionário
+    (`NomesCodificados`), a conferência é feita uma única vez
+    por nome DISTINTO, sobre a forma em minúsculas já pronta, e
+    o resultado é reaproveitado para todas as linhas com o mesmo
+    nome. Para a interface, `cursor` devolve um `CursorBusca`
+    preguiçoso, sem materializar os resultados; a filtragem
+    confere o evento de cancelamento da busca a cada bloco de
+    candidatos, de modo que uma busca substituída pela próxima
+    tecla para logo.
+
+    Busca enquanto se digita: `refinar` reaproveita os
+    resultados já materializados de um termo anterior quando o
+    novo termo só pode restringi-los ("note" -> "noteb", ou
+    "mouse" -> "mouse tech"), conferindo apenas essas posições.
+
+    As posições são as LINHAS estáveis do `ProductStore`: após
+    uma atualização incremental (`src.atualizacao`), `adicionar`
+    e `remover` ajustam apenas as listas dos tokens do produto
+    alterado. Produtos novos recebem as maiores linhas e, por
+    isso, aparecem ao fim dos resultados.
+
+===========================================================
+"""
+
+
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from src.database import CarregamentoCancelado
+from src.metricas import cronometrar
+from src.paginacao import CursorBusca, em_blocos
+
+
+BLOCO_INDEXACAO = 65_536
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES
+# ===========================================================
+
+
+def _tokens(nome):
+    """
+    Retorna os tokens distintos do nome, em minúsculas.
+    """
+
+    return tuple(dict.fromkeys(nome.lower().split()))
+
+
+def _trigramas(texto):
+    """
+    Retorna os trigramas distintos do texto.
+    """
+
+    return {texto[inicio:inicio + 3] for inicio in range(len(texto) - 2)}
+
+
+def _unir(listas):
+    """
+    Une listas ordenadas de posições, em ordem e sem repetições.
+    """
+
+    anterior = -1
+    for posicao in heapq.merge(*listas):
+        if posicao != anterior:
+            anterior = posicao
+            yield posicao
+
+
+# ===========================================================
+# CLASSE: IndiceTextual
+# ===========================================================
+
+
+class IndiceTextual:
+    """
+    Índice invertido token -> posições ordenadas no ProductStore.
+
+    Atributos:
+        produtos (ProductStore): store indexado
+        postings (dict): token em minúsculas -> array('i') de posições
+        vocabulario (list): token de cada identificador (None se
+            o token saiu do vocabulário)
+        trigramas (dict): trigrama -> array('i') ordenado de
+            identificadores de tokens
+    """
+
+    @cronometrar("indice_textual")
+    def __init__(self, produtos, cancelar=None):
+        """
+        Constrói o índice percorrendo os nomes uma única vez.
+
+        Parâmetros:
+            produtos (ProductStore): produtos a indexar
+            cancelar (threading.Event | None): interrompe a
+                construção (conferido a cada BLOCO_INDEXACAO linhas),
+                lançando CarregamentoCancelado
+        """
+
+        self.produtos = produtos
+        self.postings = {}
+
+        # Listas de cada nome distinto, resolvidas na primeira linha em que ele aparece
+        nomes = produtos.nomes
+        identificadores = nomes.identificadores
+        listas_por_nome = [None] * len(nomes.distintos)
+        for inicio in range(0, len(identificadores), BLOCO_INDEXACAO):
+            if cancelar is not None and cancelar.is_set():
+                raise CarregamentoCancelado()
+            for posicao, identificador in enumerate(identificadores[inicio:inicio + BLOCO_INDEXACAO], inicio):
+                listas = listas_por_nome[identificador]
+                if listas is None:
+                    listas = listas_por_nome[identificador] = tuple(
+                        self.postings.setdefault(token, array("i")) for token in _tokens(nomes.distintos[identificador]))
+                for lista in listas:
+                    lista.append(posicao)
+
+        self.vocabulario = []
+        self.trigramas = {}
+        self._identificadores = {}
+        for token in self.postings:
+            self._indexar_token(token)
+
+    def __len__(self):
+        return len(self.postings)
+
+    def _indexar_token(self, token):
+        """
+        Inclui um token novo do vocabulário no índice de trigramas
+        (com o maior identificador, de modo que os arrays seguem
+        ordenados).
+        """
+
+        identificador = self._identificadores[token] = len(self.vocabulario)
+        self.vocabulario.append(token)
+        for trigrama in _trigramas(token):
+            tokens = self.trigramas.get(trigrama)
+            if tokens is None:
+                tokens = self.trigramas[trigrama] = array("i")
+            tokens.append(identificador)
+
+    def _desindexar_token(self, token):
+        """
+        Retira do índice de trigramas um token que saiu do vocabulário.
+        """
+
+        identificador = self._identificadores.pop(token)
+        self.vocabulario[identificador] = None
+        for trigrama in _trigramas(token):
+            tokens = self.trigramas[trigrama]
+            del tokens[bisect_left(tokens, identificador)]
+            if not tokens:
+                del self.trigramas[trigrama]
+
+    def adicionar(self, linha, nome):
+        """
+        Indexa o nome de uma linha (produto novo ou renomeado).
+        """
+
+        for token in _tokens(nome):
+            lista = self.postings.get(token)
+            if lista is None:
+                lista = self.postings[token] = array("i")
+                self._indexar_token(token)
+            if not lista or lista[-1] < linha:
+                lista.append(linha)
+            else:
+                insort(lista, linha)
+
+    def remover(self, linha, nome):
+        """
+        Retira uma linha das listas dos tokens do seu nome antigo.
+        """
+
+        for token in _tokens(nome):
+            lista = self.postings.get(token)
+            if lista is None:
+                continue
+            posicao = bisect_left(lista, linha)
+            if posicao < len(lista) and lista[posicao] == linha:
+                del lista[posicao]
+                if not lista:
+                    del self.postings[token]
+                    self._desindexar_token(token)
+
+    def _tokens_palavra(self, palavra):
+        """
+        Retorna os tokens do vocabulário que contêm a palavra.
+
+        Parâmetros:
+            palavra (str): palavra em minúsculas, sem espaços
+
+        Retorna:
+            list: tokens encontrados
+        """
+
+        if len(palavra) < 3:
+            return [token for token in self.postings if palavra in token]
+
+        arrays = []
+        for trigrama in _trigramas(palavra):
+            tokens = self.trigramas.get(trigrama)
+            if tokens is None:
+                return []
+            arrays.append(tokens)
+        arrays.sort(key=len)
+        vocabulario = self.vocabulario
+        if len(palavra) == 3:
+            return [vocabulario[identificador] for identificador in arrays[0]]
+        candidatos = set(arrays[0])
+        for tokens in arrays[1:]:
+            if not candidatos:
+                break
+            candidatos.intersection_update(tokens)
+        return [vocabulario[identificador] for identificador in candidatos if palavra in vocabulario[identificador]]
+
+    def _listas_palavra(self, palavra):
+        """
+        Retorna as listas de postings dos tokens que contêm a palavra.
+        """
+
+        postings = self.postings
+        return [postings[token] for token in self._tokens_palavra(palavra)]
+
+    def _planejar(self, termo):
+        """
+        Separa as palavras do termo entre a guia (a de menos
+        postings, cujas listas conduzem a iteração) e as demais.
+
+        Retorna:
+            tuple(list, list) | None: listas da palavra guia e
+                demais palavras, ou None se não há resultados
+        """
+
+        palavras = list(dict.fromkeys(termo.lower().split()))
+        listas_por_palavra = [self._listas_palavra(palavra) for palavra in palavras]
+        if not palavras or not all(listas_por_palavra):
+            return None
+
+        guia = min(range(len(palavras)), key=lambda i: sum(map(len, listas_por_palavra[i])))
+        listas, outras = listas_por_palavra[guia], palavras[:guia] + palavras[guia + 1:]
+
+        # Muito mais candidatos do que nomes distintos: confere antes os nomes,
+        # pois se nenhum contém todas as palavras não há o que percorrer
+        nomes = self.produtos.nomes.minusculos
+        if outras and sum(map(len, listas)) > 4 * len(nomes):
+            for palavra in sorted(palavras, key=len, reverse=True):
+                nomes = [nome for nome in nomes if palavra in nome]
+                if not nomes:
+                    return None
+        return listas, outras
+
+    def _filtrar(self, posicoes, palavras, aceitos, cancelado=None):
+        """
+        Mantém as posições cujo nome contém todas as palavras.
+
+        Parâmetros:
+            posicoes (iterable): posições candidatas
+            palavras (list): palavras em minúsculas
+            aceitos (dict): identificador do nome -> bool, preenchido
+                sob demanda (cada nome distinto é conferido uma vez)
+            cancelado (threading.Event | None): conferido a cada
+                bloco de candidatos; lança `BuscaCancelada`
+        """
+
+        nomes = self.produtos.nomes
+        identificadores, minusculos = nomes.identificadores, nomes.minusculos
+        blocos = (posicoes,) if cancelado is None else em_blocos(posicoes, cancelado)
+        for bloco in blocos:
+            for posicao in bloco:
+                identificador = identificadores[posicao]
+                aceito = aceitos.get(identificador)
+                if aceito is None:
+                    nome = minusculos[identificador]
+                    aceito = aceitos[identificador] = all(palavra in nome for palavra in palavras)
+                if aceito:
+                    yield posicao
+
+    def estimar(self, termo):
+        """
+        Retorna um limite superior do número de resultados do termo
+        (postings da palavra guia), sem percorrê-los.
+        """
+
+        plano = self._planejar(termo)
+        return 0 if plano is None else sum(map(len, plano[0]))
+
+    def filtrar(self, posicoes, termo):
+        """
+        Mantém, na ordem dada, as posições cujo nome contém todas as
+        palavras do termo (ex.: uma faixa do `IndicePrecos`).
+
+        Retorna:
+            generator: posições aceitas, lidas sob demanda
+        """
+
+        return self._filtrar(posicoes, list(dict.fromkeys(termo.lower().split())), {})
+
+    def buscar(self, termo):
+        """
+        Busca os produtos cujo nome contém todas as palavras do termo.
+
+        Parâmetros:
+            termo (str): texto digitado (uma ou mais palavras)
+
+        Retorna:
+            array('i'): posições dos produtos encontrados, em ordem
+                crescente (mesma ordem da varredura sequencial).
+                Pode ser a própria lista do índice: não modificar.
+        """
+
+        plano = self._planejar(termo)
+        if plano is None:
+            return array("i")
+
+        listas, outras = plano
+        candidatos = listas[0] if len(listas) == 1 else array("i", sorted(set().union(*listas)))
+        if not outras:
+            return candidatos
+        return array("i", self._filtrar(candidatos, outras, {}))
+
+    @cronometrar("busca_textual", fase="cursor")
+    def cursor(self, termo):
+        """
+        Cria um cursor preguiçoso sobre os resultados do termo.
+
+        Parâmetros:
+            termo (str): texto digitado (uma ou mais palavras)
+
+        Retorna:
+            CursorBusca: cursor com os mesmos resultados de
+                `buscar`, na mesma ordem, lidos sob demanda
+        """
+
+        plano = self._planejar(termo)
+        if plano is None:
+            return CursorBusca(self.produtos, tuple, total=0)
+
+        listas, outras = plano
+
+        def candidatos():
+            return iter(listas[0]) if len(listas) == 1 else _unir(listas)
+
+        if not outras:
+            if len(listas) == 1:
+                return CursorBusca(self.produtos, candidatos, posicoes=listas[0])
+            return CursorBusca(self.produtos, candidatos)
+
+        aceitos = {}
+
+        def fonte(cancelado=None):
+            return self._filtrar(candidatos(), outras, aceitos, cancelado)
+
+        return CursorBusca(self.produtos, fonte, cancelavel=True)
+
+    @cronometrar("busca_textual", fase="refinar")
+    def refinar(self, anterior, termo_anterior, termo):
+        """
+        Cria o cursor do termo a partir dos resultados de um termo
+        anterior, quando o novo termo os restringe.
+
+        O novo termo restringe o anterior quando cada palavra
+        anterior é substring de alguma palavra nova: todo nome que
+        contém as palavras novas contém também as anteriores.
+
+        Parâmetros:
+            anterior (CursorBusca): cursor do termo anterior
+            termo_anterior (str): termo que gerou `anterior`
+            termo (str): novo termo digitado
+
+        Retorna:
+            CursorBusca | None: cursor com os mesmos resultados de
+                `cursor(termo)`, ou None se o termo não restringe o
+                anterior, se os resultados anteriores não estão
+                materializados ou se a busca pelo índice é mais barata
+        """
+
+        palavras = list(dict.fromkeys(termo.lower().split()))
+        anteriores = termo_anterior.lower().split()
+        if anterior.posicoes is None or not palavras or \
+                not all(any(palavra_anterior in palavra for palavra in palavras) for palavra_anterior in anteriores):
+            return None
+
+        posicoes = anterior.posicoes
+        plano = self._planejar(termo)
+        if plano is None:
+            return CursorBusca(self.produtos, tuple, total=0)
+        # Custo da busca pelo índice: postings da palavra guia
+        if sum(map(len, plano[0])) <= len(posicoes):
+            return None
+
+        aceitos = {}
+
+        def fonte(cancelado=None):
+            return self._filtrar(posicoes, palavras, aceitos, cancelado)
+
+        return CursorBusca(self.produtos, fonte, cancelavel=True)
@@ -9,13 +9,37 @@ Descrição:
     A aplicação permite:
         - Realizar busca de produtos por código (ID);
         - Comparar o desempenho entre busca linear e binária;
-        - Pesquisar produtos por nome com paginação de resultados.
+        - Pesquisar produtos por nome com paginação de resultados,
+          enquanto o nome é digitado;
+        - Atualizar os dados com as alterações feitas no banco,
+          sem reiniciar (atualização incremental);
+        - Abrir a janela antes de carregar os dados (início
+          rápido), liberando cada busca quando seus dados ficam
+          prontos.
 
 Módulos Importados:
     - tkinter: Interface gráfica
     - time: Medição de desempenho dos algoritmos
     - messagebox: Exibição de alertas e mensagens
-    - src.buscas: Funções de busca_linear e busca_binaria
+    - src.buscas: busca_linear e busca_binaria (via ProductStore)
+    - src.tarefas: Execução das buscas em segundo plano
+    - src.atualizacao: Leitura e aplicação das alterações do banco
+    - src.cache: Cache LRU dos resultados das buscas
+
+    As buscas rodam fora da thread principal (ExecutorInterface);
+    os resultados voltam à janela via `after`, mantendo a
+    interface responsiva. Uma nova busca substitui a anterior.
+    Consultas repetidas (por código ou por nome) são respondidas
+    pelo cache, sem executar a busca de novo; o cache é
+    invalidado quando os dados são atualizados.
+
+    Busca enquanto se digita: cada tecla no campo de nome agenda
+    a busca textual para depois de uma pausa curta
+    (ATRASO_DIGITACAO_MS); teclas seguidas reagendam a mesma
+    busca e a busca em andamento é substituída pela nova. Quando
+    o novo termo só restringe o anterior ("note" -> "noteb"), os
+    resultados já contados são filtrados em vez de buscados de
+    novo no índice (`IndiceTextual.refinar`).
 
 ===========================================================
 """
@@ -24,8 +48,13 @@ Módulos Importados:
 import tkinter as tk
 import tkinter.ttk as ttk
 import time
+from concurrent.futures import wait
 from tkinter import messagebox
-from src.buscas import busca_linear, busca_binaria
+from src.atualizacao import RecargaNecessaria, aplicar_alteracoes, ler_alteracoes, podar_alteracoes
+from src.cache import CacheLRU, chave_textual
+from src.database import DB_FILE
+from src.metricas import observar, span
+from src.tarefas import ExecutorInterface
 
 
 # ===========================================================
@@ -33,50 +62,175 @@ from src.buscas import busca_linear, busca_binaria
 # ===========================================================
 
 
-resultados_busca = []
+resultados_busca = None  # CursorBusca da busca textual em exibição
+chave_busca = None  # (chave normalizada, geração do cache) de resultados_busca
+termo_pedido = None  # chave normalizada da última busca textual pedida
+atualizando = False  # alterações do banco sendo aplicadas em segundo plano
 pagina_atual = 0
 resultados_por_pagina = 10
 
 
+# ===========================================================
+# BUSCA ENQUANTO SE DIGITA
+# ===========================================================
+
+
+# Pausa na digitação antes de buscar: curta o bastante para que,
+# somada à busca da primeira página e ao intervalo de leitura do
+# executor (16 ms), a página apareça em menos de 50 ms
+ATRASO_DIGITACAO_MS = 25
+busca_agendada = None  # identificador do `after` da busca pendente
+
+
+def agendar_busca_textual(janela, buscar):
+    """
+    Agenda a busca para depois de uma pausa na digitação
+    (debounce): uma tecla nova cancela a busca ainda pendente.
+
+    Parâmetros:
+        janela: Janela Tkinter
+        buscar: Função sem parâmetros que realiza a busca
+    """
+
+    global busca_agendada
+
+    def disparar():
+        global busca_agendada
+
+        busca_agendada = None
+        buscar()
+
+    if busca_agendada is not None:
+        janela.after_cancel(busca_agendada)
+    busca_agendada = janela.after(ATRASO_DIGITACAO_MS, disparar)
+
+
+# ===========================================================
+# CACHE DOS RESULTADOS
+# ===========================================================
+
+
+# A validade (TTL) cobre o backend em disco, cujo banco pode
+# mudar sem passar por "Atualizar dados"
+CACHE_TTL = 300
+cache_codigos = CacheLRU(maximo_itens=4096, maximo_bytes=4 * 1024 * 1024, ttl=CACHE_TTL)
+cache_textual = CacheLRU(maximo_itens=256, maximo_bytes=64 * 1024 * 1024, ttl=CACHE_TTL)
+
+
+def exibir_estatisticas_cache(label_cache):
+    """
+    Exibe os contadores somados dos dois caches.
+    """
+
+    codigos, textual = cache_codigos.estatisticas(), cache_textual.estatisticas()
+    acertos = codigos["acertos"] + textual["acertos"]
+    falhas = codigos["falhas"] + textual["falhas"]
+    remocoes = codigos["remocoes"] + textual["remocoes"] + codigos["expirados"] + textual["expirados"]
+    taxa = acertos / (acertos + falhas) if acertos + falhas else 0.0
+    label_cache["text"] = (f"🗃️ Cache: {acertos} acertos | {falhas} falhas | "
+                           f"{remocoes} remoções | taxa {taxa:.0%}")
+
+
 # ===========================================================
 # FUNÇÃO DE REALIZAR BUSCA TEXTUAL
 # ===========================================================
 
 
-def realizar_busca_textual(entry_nome, resultado_text, botoes_paginacao, produtos_lista, btn_anterior, btn_proximo):
+def realizar_busca_textual(executor, entry_nome, resultado_text, botoes_paginacao, indice, btn_anterior, btn_proximo,
+                           label_cache, ao_digitar=False):
     """
     Executa a busca textual de produtos com base nas palavras digitadas.
 
+    A busca (criação do cursor e leitura da primeira página) roda
+    em segundo plano; a página é exibida quando ela termina. Um
+    termo já pesquisado é exibido direto do cache. Se o termo
+    restringe o da busca em exibição e os resultados dela já
+    foram contados, eles são apenas filtrados.
+
     Parâmetros:
+        executor: ExecutorInterface que executa a busca
         entry_nome: Campo de entrada de texto
         resultado_text: Variável para exibir resultados
         botoes_paginacao: Container dos botões de navegação
-        produtos_lista: Lista de produtos (nome, preço, código)
+        indice: IndiceTextual (ou DatabaseBackend) com o método `cursor`
         btn_anterior: Botão de página anterior
         btn_proximo: Botão de próxima página
+        label_cache: Exibe os contadores do cache
+        ao_digitar: Busca disparada pela digitação (sem avisos e
+            sem repetir o termo já pedido)
     """
 
-    global resultados_busca, pagina_atual
+    global resultados_busca, termo_pedido
+
+    if atualizando:
+        return  # os dados estão sendo atualizados em segundo plano
 
     termo = entry_nome.get().strip().lower()
     if not termo:
-        messagebox.showinfo("Aviso", "Digite uma palavra para pesquisar.")
-        return
-    
-    palavras = termo.split()
-    resultados_busca = [
-        (nome, preco, codigo)
-        for nome, preco, codigo in produtos_lista
-        if all(p in nome.lower() for p in palavras)
-    ]
-
-    if not resultados_busca:
-        resultado_text.set("❌ Nenhum produto encontrado.")
+        if not ao_digitar:
+            messagebox.showinfo("Aviso", "Digite uma palavra para pesquisar.")
+            return
+        # Campo apagado: limpa os resultados
+        executor.cancelar("texto")
+        executor.cancelar("pagina")
+        executor.cancelar("total")
+        resultados_busca = termo_pedido = None
+        resultado_text.set("")
         botoes_paginacao.pack_forget()
         return
 
-    pagina_atual = 0
-    exibir_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
+    chave = (chave_textual(termo), cache_textual.geracao)
+    if ao_digitar and chave[0] == termo_pedido:
+        return  # teclas que não mudam o termo (setas, Shift, espaços)
+    termo_pedido = chave[0]
+
+    anterior = resultados_busca
+    termo_anterior = chave_busca[0] if anterior is not None else None
+    refinar = getattr(indice, "refinar", None)  # o backend em disco não refina
+
+    def buscar(cancelado):
+        cursor = None
+        if refinar is not None and anterior is not None:
+            cursor = refinar(anterior, termo_anterior, termo)
+        if cursor is None:
+            cursor = indice.cursor(termo)
+        primeira_pagina = cursor.pagina(0, resultados_por_pagina, cancelado)
+        if not primeira_pagina[0]:
+            cursor.materializar(cancelado)  # nenhum resultado: nada a percorrer
+        return cursor, primeira_pagina
+
+    def concluir(resultado):
+        global resultados_busca, chave_busca, pagina_atual
+
+        resultados_busca, primeira_pagina = resultado
+        chave_busca = chave
+        if not (primeira_pagina[0] if primeira_pagina is not None else resultados_busca.total_conhecido):
+            resultado_text.set("❌ Nenhum produto encontrado.")
+            botoes_paginacao.pack_forget()
+            return
+
+        pagina_atual = 0
+        exibir_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo, primeira_pagina)
+
+    def concluir_busca(resultado):
+        cursor, _ = resultado
+        concluir(resultado)
+        if cursor.posicoes is not None:
+            guardar_no_cache(cursor)
+
+    executor.cancelar("total")
+    executor.cancelar("pagina")
+    cursor = cache_textual.obter(chave[0])
+    exibir_estatisticas_cache(label_cache)
+    if cursor is not None:
+        executor.cancelar("texto")
+        concluir((cursor, None))
+        return
+
+    if not ao_digitar:  # ao digitar, a página anterior fica até chegar a nova
+        resultado_text.set(f"⏳ Pesquisando \"{termo}\"...")
+        botoes_paginacao.pack_forget()
+    executor.submeter("texto", buscar, concluir_busca, lambda erro: exibir_erro(resultado_text, erro))
 
 
 # ===========================================================
@@ -84,29 +238,102 @@ def realizar_busca_textual(entry_nome, resultado_text, botoes_paginacao, produto
 # ===========================================================
 
 
-def exibir_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
+def exibir_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo, pagina=None):
     """
     Exibe a página atual de resultados da busca textual.
+
+    Os itens chegam em `pagina`, lidos em segundo plano (pela
+    busca ou por `ler_pagina`); sem ela, saem por fatia das
+    posições de um cursor do cache. Quando o total
+    ainda não é conhecido, a página é exibida imediatamente e a
+    contagem é feita em segundo plano, guardando as posições para
+    o cache apenas se elas couberem nele.
     """
      
     global pagina_atual
 
-    total = len(resultados_busca)
     inicio = pagina_atual * resultados_por_pagina
-    fim = inicio + resultados_por_pagina
-    pagina_resultados = resultados_busca[inicio:fim]
-
-    texto = f"🧾 Resultados {inicio+1}–{min(fim, total)} de {total}:\n\n"
-    for nome, preco, codigo in pagina_resultados:
-        texto += f"• {nome}\n   💰 R$ {preco:.2f} | 🔑 Código: {codigo}\n\n"
-
-    resultado_text.set(texto)
+    if pagina is None:
+        pagina = resultados_busca.pagina(pagina_atual, resultados_por_pagina)
+    pagina_resultados, ha_mais = pagina
+    fim = inicio + len(pagina_resultados)
+    total = resultados_busca.total_conhecido
+
+    with span("interface_render", tela="pagina"):
+        texto = f"🧾 Resultados {inicio+1}–{fim} de {total if total is not None else '...'}:\n\n"
+        for nome, preco, codigo in pagina_resultados:
+            texto += f"• {nome}\n   💰 R$ {preco:.2f} | 🔑 Código: {codigo}\n\n"
+        resultado_text.set(texto)
     btn_anterior["state"] = tk.NORMAL if pagina_atual > 0 else tk.DISABLED
-    btn_proximo["state"] = tk.NORMAL if fim < total else tk.DISABLED
+    btn_proximo["state"] = tk.NORMAL if ha_mais else tk.DISABLED
     botoes_paginacao.pack(pady=(10, 0))
 
+    if resultados_busca.posicoes is None and not executor.ocupado("total"):
+        cursor = resultados_busca
+        executor.submeter("total", lambda cancelado: cursor.materializar(cancelado, cache_textual.maximo_bytes),
+                          lambda total: atualizar_total(cursor, total, resultado_text))
+
+
+def atualizar_total(cursor, total, resultado_text):
+    """
+    Completa o cabeçalho da página com o total contado e guarda o
+    cursor no cache, se as posições foram materializadas.
+
+    Parâmetros:
+        cursor: CursorBusca que estava em exibição ao contar
+        total: Total de resultados (None se a contagem foi cancelada)
+        resultado_text: Variável com o texto da página
+    """
+
+    if cursor is not resultados_busca or total is None:
+        return
+    resultado_text.set(resultado_text.get().replace(" de ...:", f" de {total}:", 1))
+    if cursor.posicoes is not None:
+        guardar_no_cache(cursor)
+
+
+def guardar_no_cache(cursor):
+    """
+    Guarda o cursor da busca textual em exibição no cache
+    (descartado se os dados foram atualizados durante a busca).
+    """
+
+    chave, geracao = chave_busca
+    cache_textual.guardar(chave, cursor, cursor.tamanho_aproximado(), geracao)
+
 
-def proxima_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
+def exibir_erro(resultado_text, erro):
+    """
+    Exibe uma falha ocorrida durante uma busca em segundo plano.
+    """
+
+    resultado_text.set("❌ Erro durante a busca.")
+    messagebox.showerror("Erro", f"Falha ao executar a busca: {erro}")
+
+
+def ler_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
+    """
+    Lê a página atual em segundo plano (como a primeira página da
+    busca) e a exibe quando ela chega.
+
+    Ler uma página adiante pode percorrer muitos candidatos (termos
+    raros) ou consultar o banco (backend em disco), por isso não
+    ocorre na thread da interface. Enquanto isso, a página anterior
+    continua visível e os botões ficam desabilitados.
+    """
+
+    cursor, numero = resultados_busca, pagina_atual
+
+    def concluir(pagina):
+        if cursor is resultados_busca and numero == pagina_atual:
+            exibir_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo, pagina)
+
+    btn_anterior["state"] = btn_proximo["state"] = tk.DISABLED
+    executor.submeter("pagina", lambda cancelado: cursor.pagina(numero, resultados_por_pagina, cancelado),
+                      concluir, lambda erro: exibir_erro(resultado_text, erro))
+
+
+def proxima_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
     """
     Avança para a próxima página de resultados.
     """
@@ -114,10 +341,10 @@ def proxima_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
     global pagina_atual
 
     pagina_atual += 1
-    exibir_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
+    ler_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
 
 
-def pagina_anterior(resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
+def pagina_anterior(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo):
     """
     Retorna para a página anterior de resultados.
     """
@@ -125,7 +352,7 @@ def pagina_anterior(resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
     global pagina_atual
 
     pagina_atual -= 1
-    exibir_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
+    ler_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
 
 
 # ===========================================================
@@ -133,25 +360,33 @@ def pagina_anterior(resultado_text, botoes_paginacao, btn_anterior, btn_proximo)
 # ===========================================================
 
 
-def realizar_busca(entry_id, resultado_text, label_linear, label_binaria, cods_buscas, produtos):
+def realizar_busca(executor, entry_id, resultado_text, label_linear, label_binaria, produtos, label_cache):
     """
     Realiza busca de um produto pelo código e compara os algoritmos.
 
     Etapas:
         - Captura o código digitado;
-        - Executa busca linear e binária;
+        - Executa busca linear e binária (em segundo plano);
         - Mede tempo e número de passos;
         - Exibe o produto e o desempenho.
 
+    Um código já buscado é exibido direto do cache, com os tempos
+    medidos na primeira busca.
+
     Parâmetros:
+        executor: ExecutorInterface que executa a busca
         entry_id: Campo de entrada do ID
         resultado_text: Exibição do resultado
         label_linear: Exibe o desempenho da busca linear
         label_binaria: Exibe o desempenho da busca binária
-        cods_buscas: Lista de códigos ordenados
-        produtos: Dicionário de produtos
+        produtos: ProductStore (ou DatabaseBackend) com os métodos
+            busca_linear, busca_binaria, localizar e produto
+        label_cache: Exibe os contadores do cache
     """
 
+    if atualizando:
+        return  # os dados estão sendo atualizados em segundo plano
+
     try:
         cod_busca = int(entry_id.get())
     except ValueError:
@@ -162,24 +397,212 @@ def realizar_busca(entry_id, resultado_text, label_linear, label_binaria, cods_b
         messagebox.showwarning("Aviso", "Digite um ID entre 10.000.000 e 20.000.000.")
         return
 
-    inicio_linear = time.perf_counter_ns()
-    encontrado_linear, passos_linear = busca_linear(cods_buscas, cod_busca)
-    fim_linear = time.perf_counter_ns()
-    tempo_linear = (fim_linear - inicio_linear) / 1_000_000
+    def buscar(cancelado):
+        inicio_linear = time.perf_counter_ns()
+        encontrado_linear, passos_linear = produtos.busca_linear(cod_busca, cancelado)
+        fim_linear = time.perf_counter_ns()
+        tempo_linear = (fim_linear - inicio_linear) / 1_000_000
+        if cancelado.is_set():
+            return None  # substituída por uma busca mais nova: resultado descartado
+
+        inicio_binaria = time.perf_counter_ns()
+        encontrado_binaria, passos_binaria = produtos.busca_binaria(cod_busca)
+        fim_binaria = time.perf_counter_ns()
+        tempo_binaria = (fim_binaria - inicio_binaria) / 1_000_000
+
+        produto = None
+        if encontrado_linear or encontrado_binaria:
+            produto = produtos.produto(produtos.localizar(cod_busca))
+        return produto, (tempo_linear, passos_linear), (tempo_binaria, passos_binaria)
+
+    def concluir(resultado, origem=""):
+        produto, (tempo_linear, passos_linear), (tempo_binaria, passos_binaria) = resultado
+        with span("interface_render", tela="codigo"):
+            if produto is not None:
+                nome, preco, _ = produto
+                resultado_text.set(f"Produto encontrado:\n📦 {nome}\n💰 R$ {preco:.2f}") 
+            else:
+                resultado_text.set("❌ Produto não encontrado.") 
+
+            label_linear["text"] = f"🔹 Linear: {tempo_linear:.6f} ms | {passos_linear} passos{origem}"
+            label_binaria["text"] = f"🔹 Binária: {tempo_binaria:.6f} ms | {passos_binaria} passos{origem}"
+
+    def concluir_busca(resultado):
+        produto = resultado[0]
+        cache_codigos.guardar(cod_busca, resultado, 256 + (len(produto[0]) if produto else 0), geracao)
+        concluir(resultado)
+
+    geracao = cache_codigos.geracao
+    resultado = cache_codigos.obter(cod_busca)
+    exibir_estatisticas_cache(label_cache)
+    if resultado is not None:
+        executor.cancelar("codigo")
+        concluir(resultado, " (cache)")
+        return
 
-    inicio_binaria = time.perf_counter_ns()
-    encontrado_binaria, passos_binaria = busca_binaria(cods_buscas, cod_busca)
-    fim_binaria = time.perf_counter_ns()
-    tempo_binaria = (fim_binaria - inicio_binaria) / 1_000_000
+    resultado_text.set(f"⏳ Buscando o código {cod_busca}...")
+    label_linear["text"] = "🔹 Linear: ⏳ executando..."
+    label_binaria["text"] = "🔹 Binária: ⏳ executando..."
+    executor.submeter("codigo", buscar, concluir_busca, lambda erro: exibir_erro(resultado_text, erro))
+
+
+# ===========================================================
+# FUNÇÃO DE ATUALIZAR OS DADOS
+# ===========================================================
+
+
+def realizar_atualizacao(executor, resultado_text, botoes_paginacao, produtos, indice, caminho_db=DB_FILE):
+    """
+    Aplica aos dados em memória as alterações feitas no banco desde a carga.
+
+    As alterações são lidas em segundo plano. Para aplicá-las, as
+    buscas em andamento (que leem as mesmas colunas) são canceladas
+    e novas buscas ficam bloqueadas; a aplicação também roda em
+    segundo plano, depois que as buscas canceladas terminam, para
+    que um lote grande não congele a janela. Ao final, o registro
+    de alterações é podado se passou do limite (ver
+    `podar_alteracoes`) e o cache é invalidado.
+
+    Parâmetros:
+        executor: ExecutorInterface que executa a leitura
+        resultado_text: Variável para exibir o resumo
+        botoes_paginacao: Container dos botões de navegação
+        produtos: ProductStore carregado com `carregar_dados`
+        indice: IndiceTextual a manter atualizado
+        caminho_db: Banco de origem dos dados
+    """
+
+    if getattr(produtos, "versao", None) is None:
+        messagebox.showinfo("Aviso", "Estes dados não têm atualização incremental (backend em disco "
+                                     "ou banco sem rastreamento: ative com 'python -m src.atualizacao').")
+        return
+    if atualizando:
+        return  # a aplicação em andamento não pode ser substituída
+
+    def aplicar(alteracoes):
+        global resultados_busca, termo_pedido, atualizando
+
+        buscas = [executor.cancelar(canal) for canal in ("codigo", "texto", "pagina", "total")]
+        atualizando = True
+        resultados_busca = termo_pedido = None
+        botoes_paginacao.pack_forget()
+        resultado_text.set(f"⏳ Aplicando {len(alteracoes.produtos)} alteração(ões)...")
+
+        def aplicar_em_segundo_plano(cancelado):
+            wait([busca for busca in buscas if busca is not None])
+            contagem = aplicar_alteracoes(produtos, alteracoes, indice)
+            podar_alteracoes(caminho_db)
+            return contagem
+
+        executor.submeter("atualizacao", aplicar_em_segundo_plano, concluir, falhar)
+
+    def concluir(contagem):
+        global atualizando
+
+        atualizando = False
+        cache_codigos.invalidar()
+        cache_textual.invalidar()
+        resultado_text.set(f"🔄 Dados atualizados: {contagem['inseridos']} inserido(s), "
+                           f"{contagem['alterados']} alterado(s), {contagem['removidos']} removido(s).")
+
+    def falhar(erro):
+        global atualizando
+
+        atualizando = False
+        if isinstance(erro, RecargaNecessaria):
+            resultado_text.set("⚠️ Atualização incremental indisponível.")
+            messagebox.showwarning("Aviso", f"Reinicie o sistema para recarregar os dados ({erro}).")
+        else:
+            exibir_erro(resultado_text, erro)
+
+    resultado_text.set("⏳ Verificando alterações no banco...")
+    executor.submeter("atualizacao", lambda cancelado: ler_alteracoes(produtos, caminho_db), aplicar, falhar)
 
-    if encontrado_linear or encontrado_binaria:
-        nome, preco = produtos[cod_busca]
-        resultado_text.set(f"Produto encontrado:\n📦 {nome}\n💰 R$ {preco:.2f}") 
-    else:
-        resultado_text.set("❌ Produto não encontrado.") 
 
-    label_linear["text"] = f"🔹 Linear: {tempo_linear:.6f} ms | {passos_linear} passos"
-    label_binaria["text"] = f"🔹 Binária: {tempo_binaria:.6f} ms | {passos_binaria} passos"
+# ===========================================================
+# INICIALIZAÇÃO
+# ===========================================================
+
+
+ETAPAS_INICIO = {"janela": "janela", "codigo": "busca por código", "nome": "busca por nome"}
+
+
+def registrar_inicio(etapa, inicio, tempos, label_inicio):
+    """
+    Registra o tempo desde o início do programa até uma etapa da
+    inicialização e o exibe (terminal, rótulo e métricas).
+
+    Parâmetros:
+        etapa (str): chave de ETAPAS_INICIO
+        inicio (float): instante (time.perf_counter) do início
+        tempos (dict): etapas já registradas -> segundos
+        label_inicio: Exibe os tempos registrados
+    """
+
+    segundos = time.perf_counter() - inicio
+    tempos[etapa] = segundos
+    observar("inicializacao", int(segundos * 1e9), etapa=etapa)
+    print(f"⏱️  {ETAPAS_INICIO[etapa].capitalize()} em {segundos:.3f} s.")
+    label_inicio["text"] = "⏱️ Início: " + " | ".join(
+        f"{ETAPAS_INICIO[nome]} {tempo:.2f} s" for nome, tempo in tempos.items())
+
+
+def iniciar_carga(janela, executor, carregar, indexar, resultado_text, ao_carregar, ao_indexar):
+    """
+    Carrega os produtos e constrói o índice textual em segundo
+    plano, com a janela já aberta (início rápido).
+
+    A carga e a indexação rodam em canais próprios ("carga" e
+    "indice") do executor, deixando o outro trabalhador livre
+    para as buscas por código assim que os produtos chegam. As
+    duas conferem o evento de cancelamento: fechar a janela no
+    meio da indexação não prende o processo até o fim dela.
+
+    Parâmetros:
+        janela: Janela Tkinter
+        executor: ExecutorInterface que executa a carga
+        carregar: Função com os parâmetros `progresso` e
+            `cancelar` de `carregar_dados`, que retorna os produtos
+        indexar: Constrói o índice textual com o parâmetro `cancelar`
+            (ex.: IndiceTextual)
+        resultado_text: Variável para exibir o andamento
+        ao_carregar: Chamada com os produtos carregados
+        ao_indexar: Chamada com o índice construído
+    """
+
+    andamento = [0, 0]  # (carregados, total), escrito pela thread de carga
+
+    def progresso(carregados, total):
+        andamento[:] = carregados, total
+
+    def exibir_andamento():
+        if not executor.ocupado("carga"):
+            return
+        carregados, total = andamento
+        resultado_text.set(f"⏳ Carregando dados... {carregados:,}/{total:,} produtos" if total
+                           else "⏳ Carregando dados...")
+        janela.after(100, exibir_andamento)
+
+    def carregado(produtos):
+        ao_carregar(produtos)
+        aviso = (f"✅ {len(produtos):,} produtos carregados: busca por código disponível.\n"
+                 f"⏳ Indexando os nomes...")
+        resultado_text.set(aviso)
+
+        def indexado(indice):
+            ao_indexar(indice)
+            if resultado_text.get() == aviso:  # sem busca exibida nesse meio-tempo
+                resultado_text.set(f"✅ {len(produtos):,} produtos prontos para busca.")
+
+        executor.submeter("indice", lambda cancelado: indexar(produtos, cancelar=cancelado), indexado, falhar)
+
+    def falhar(erro):
+        resultado_text.set("❌ Falha ao carregar os dados.")
+        messagebox.showerror("Erro", f"Falha ao carregar os dados: {erro}")
+
+    executor.submeter("carga", lambda cancelado: carregar(progresso=progresso, cancelar=cancelado),
+                      carregado, falhar)
+    exibir_andamento()
 
 
 # ===========================================================
@@ -187,14 +610,22 @@ def realizar_busca(entry_id, resultado_text, label_linear, label_binaria, cods_b
 # ===========================================================
 
 
-def criar_interface(cods_buscas, produtos, produtos_lista):
+def criar_interface(produtos=None, indice=None, carregar=None, indexar=None, inicio=None):
     """
     Cria e executa a interface gráfica do comparativo de buscas.
 
     Parâmetros:
-        cods_buscas: Lista de códigos para busca
-        produtos: Dicionário com informações dos produtos
-        produtos_lista: Lista auxiliar para busca textual
+        produtos: ProductStore (em memória) ou DatabaseBackend (em
+            disco) usado na busca por código
+        indice: IndiceTextual ou DatabaseBackend usado na busca por nome
+        carregar: Início rápido: carrega os produtos depois de a
+            janela abrir (ex.: `carregar_dados`); os botões de cada
+            busca ficam desativados até os seus dados ficarem prontos
+        indexar: Início rápido: constrói o índice textual a partir
+            dos produtos carregados (ex.: IndiceTextual)
+        inicio: Instante (time.perf_counter) do início do programa;
+            se informado, o tempo até a janela e até cada busca
+            ficar disponível é exibido
     """
 
     janela = tk.Tk()
@@ -202,6 +633,7 @@ def criar_interface(cods_buscas, produtos, produtos_lista):
     janela.geometry("700x600")
     janela.configure(bg="#EDEDED")
     janela.eval('tk::PlaceWindow . center')
+    executor = ExecutorInterface(janela)
 
     style = ttk.Style()
     style.configure("TFrame", background="#FFFFFF")
@@ -223,9 +655,10 @@ def criar_interface(cods_buscas, produtos, produtos_lista):
     ttk.Label(frame_id, text="🔍 Digite o código do produto:", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, padx=5, sticky="w")
     entry_id = ttk.Entry(frame_id, font=("Segoe UI", 11), width=25)
     entry_id.grid(row=0, column=1, padx=10)
-    ttk.Button(frame_id, text="Buscar Produto",
-               command=lambda: realizar_busca(entry_id, resultado_text, label_linear, label_binaria, cods_buscas, produtos),
-               width=18, style="TButton").grid(row=0, column=2, padx=5)
+    btn_codigo = ttk.Button(frame_id, text="Buscar Produto",
+                            command=lambda: realizar_busca(executor, entry_id, resultado_text, label_linear, label_binaria, produtos, label_cache),
+                            width=18, style="TButton")
+    btn_codigo.grid(row=0, column=2, padx=5)
 
     # ==== CAMPO DE TEXTO ====
     frame_nome = ttk.Frame(card)
@@ -233,20 +666,28 @@ def criar_interface(cods_buscas, produtos, produtos_lista):
     ttk.Label(frame_nome, text="🧾 Buscar por nome:", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, padx=40,sticky="w")
     entry_nome = ttk.Entry(frame_nome, font=("Segoe UI", 11), width=25)
     entry_nome.grid(row=0, column=1, padx=10)
-    ttk.Button(frame_nome, text="Pesquisar",
-               command=lambda: realizar_busca_textual(entry_nome, resultado_text, botoes_paginacao, produtos_lista, btn_anterior, btn_proximo),
-               width=18).grid(row=0, column=2, padx=5)
+
+    def pesquisar(ao_digitar=False):
+        if indice is None:
+            return  # início rápido: nomes ainda não indexados
+        realizar_busca_textual(executor, entry_nome, resultado_text, botoes_paginacao, indice, btn_anterior, btn_proximo,
+                               label_cache, ao_digitar)
+
+    entry_nome.bind("<KeyRelease>", lambda evento: agendar_busca_textual(janela, lambda: pesquisar(ao_digitar=True)))
+    entry_nome.bind("<Return>", lambda evento: pesquisar())
+    btn_nome = ttk.Button(frame_nome, text="Pesquisar", command=pesquisar, width=18)
+    btn_nome.grid(row=0, column=2, padx=5)
 
     ttk.Separator(card, orient="horizontal").pack(fill="x", pady=5)
 
     # ==== PAGINAÇÃO ====
     botoes_paginacao = ttk.Frame(card)
     btn_anterior = ttk.Button(botoes_paginacao, text="⬅️ Anterior",
-                              command=lambda: pagina_anterior(resultado_text, botoes_paginacao, btn_anterior, btn_proximo),
+                              command=lambda: pagina_anterior(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo),
                               width=12)
     btn_anterior.pack(side="left", padx=5)
     btn_proximo = ttk.Button(botoes_paginacao, text="Próximo ➡️",
-                             command=lambda: proxima_pagina(resultado_text, botoes_paginacao, btn_anterior, btn_proximo),
+                             command=lambda: proxima_pagina(executor, resultado_text, botoes_paginacao, btn_anterior, btn_proximo),
                              width=12)
     btn_proximo.pack(side="left", padx=5)
     botoes_paginacao.pack_forget()
@@ -266,7 +707,51 @@ def criar_interface(cods_buscas, produtos, produtos_lista):
     label_linear.pack(anchor="w", pady=2)
     label_binaria = ttk.Label(frame_comp, text="• Binária: --", font=("Segoe UI", 10))
     label_binaria.pack(anchor="w", pady=2)
+    label_cache = ttk.Label(frame_comp, text="🗃️ Cache: --", font=("Segoe UI", 10))
+    label_cache.pack(anchor="w", pady=2)
+    label_inicio = ttk.Label(frame_comp, text="", font=("Segoe UI", 10))
+    label_inicio.pack(anchor="w", pady=2)
+    btn_atualizar = ttk.Button(frame_comp, text="🔄 Atualizar dados",
+                               command=lambda: realizar_atualizacao(executor, resultado_text, botoes_paginacao, produtos, indice),
+                               width=18)
+    btn_atualizar.pack(anchor="e", pady=(5, 0))
 
     ttk.Label(janela, text="Desenvolvido por Vitor Yoshii", background="#EDEDED", font=("Segoe UI", 9, "italic"), foreground="#555").pack(side="bottom", pady=8)
 
-    janela.mainloop()
\ No newline at end of file
+    # ==== INICIALIZAÇÃO ====
+    tempos = {}
+
+    def marcar(*etapas):
+        if inicio is not None:
+            for etapa in etapas:
+                registrar_inicio(etapa, inicio, tempos, label_inicio)
+
+    def carregado(novos):
+        nonlocal produtos
+        produtos = novos
+        btn_codigo["state"] = tk.NORMAL
+        marcar("codigo")
+
+    def indexado(novo):
+        nonlocal indice
+        indice = novo
+        btn_nome["state"] = btn_atualizar["state"] = tk.NORMAL
+        marcar("nome")
+
+    # A janela conta como aberta quando é mapeada na tela (o evento
+    # <Map> também chega dos widgets filhos, que são ignorados)
+    def mapeada(evento):
+        if evento.widget is janela:
+            janela.unbind("<Map>", vinculo)
+            marcar(*etapas)
+
+    vinculo = janela.bind("<Map>", mapeada, add="+")
+    if carregar is not None:
+        etapas = ("janela",)
+        btn_codigo["state"] = btn_nome["state"] = btn_atualizar["state"] = tk.DISABLED
+        iniciar_carga(janela, executor, carregar, indexar, resultado_text, carregado, indexado)
+    else:
+        etapas = ("janela", "codigo", "nome")
+
+    janela.mainloop()
+    executor.encerrar()
\ No newline at end of file
@@ -14,18 +14,82 @@ Estrutura:
     - Carrega dados do banco de dados para memória interna
     - Inicializa a interface de pesquisa
 
+Início rápido (--rapido):
+    A janela é criada antes da carga, com um indicador de
+    andamento. Os produtos são carregados em segundo plano (do
+    snapshot, quando válido) e a busca por código é liberada
+    assim que o store, ordenado por código, fica pronto; o
+    índice textual é construído em seguida e libera a busca
+    por nome. Em todos os modos, o tempo até a janela e até
+    cada busca ficar disponível é exibido na inicialização.
+
 Módulos importados:
     - src.database: contém a função `carregar_dados` 
-      responsável por extrair os produtos do banco SQLite.
+      responsável por extrair os produtos do banco SQLite
+      para um `ProductStore` colunar.
+    - src.indice_textual: contém o `IndiceTextual`, índice
+      invertido construído na carga para a busca por nome.
     - src.interface: contém a função `criar_interface` 
       responsável por renderizar a interface Tkinter.
+    - src.backend_banco: contém o `DatabaseBackend`, que
+      consulta o banco diretamente (--backend banco), sem
+      carregar os produtos em memória.
+    - src.metricas: coleta opcional de métricas (--metricas) e
+      captura de perfil (--perfil).
+
+    Os módulos de cada modo são importados apenas quando o
+    modo é usado.
+
+Uso:
+    python -m src.main                  # dados em memória
+    python -m src.main --rapido         # janela primeiro, carga em segundo plano
+    python -m src.main --backend banco  # consultas indexadas no SQLite
+    python -m src.main --metricas metricas.prom --perfil main.prof
 ===========================================================
 """
 
 
-from src.database import carregar_dados
-from src.interface import criar_interface
+import time
+
+INICIO = time.perf_counter()  # antes dos demais imports: o tempo até a janela inclui as importações
+
+import argparse
+from contextlib import nullcontext
+from src.metricas import ativar, capturar_perfil, salvar_metricas
 
 if __name__ == "__main__":
-    cods_buscas, produtos, produtos_lista = carregar_dados()
-    criar_interface(cods_buscas, produtos, produtos_lista)
+    parser = argparse.ArgumentParser(prog="python -m src.main")
+    parser.add_argument("--backend", choices=["memoria", "banco"], default="memoria",
+                        help="memoria: carrega os produtos; banco: consulta o SQLite")
+    parser.add_argument("--rapido", action="store_true",
+                        help="abre a janela antes de carregar os dados (carga e índice em segundo plano)")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="coleta métricas e as grava ao fechar (.prom = Prometheus, demais = JSON)")
+    parser.add_argument("--perfil", metavar="ARQUIVO",
+                        help="grava um perfil cProfile/tracemalloc da carga e da thread da interface")
+    args = parser.parse_args()
+    if args.metricas:
+        ativar()
+
+    with capturar_perfil(args.perfil) if args.perfil else nullcontext():
+        from src.interface import criar_interface
+
+        if args.backend == "banco":
+            from src.backend_banco import DatabaseBackend
+
+            backend = DatabaseBackend()
+            criar_interface(backend, backend, inicio=INICIO)
+            backend.fechar()
+        else:
+            from src.database import carregar_dados
+            from src.indice_textual import IndiceTextual
+
+            if args.rapido:
+                criar_interface(carregar=carregar_dados, indexar=IndiceTextual, inicio=INICIO)
+            else:
+                produtos = carregar_dados()
+                indice = IndiceTextual(produtos)
+                criar_interface(produtos, indice, inicio=INICIO)
+
+    if args.metricas:
+        salvar_metricas(args.metricas)
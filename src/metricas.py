@@ -0,0 +1,483 @@
+"""
+===========================================================
+MÉTRICAS E PERFIL DE DESEMPENHO
+
+Descrição:
+    Camada leve de instrumentação dos caminhos quentes (carga,
+    motores de busca, busca textual, paginação e exibição):
+
+    - span: cronometra um trecho (`with span("carga", fase="sql")`)
+      e registra a duração em um histograma;
+    - cronometrar: o mesmo, como decorador de funções/métodos;
+    - contar: incrementa um contador;
+    - observar: registra um valor em um histograma.
+
+    Cada métrica é identificada pelo nome e por rótulos
+    (ex.: motor="binaria"). Os histogramas (`HistogramaLatencia`)
+    são log-lineares, no estilo do HdrHistogram: erro relativo
+    abaixo de 1% e memória independente do número de medições.
+
+    Desativada por padrão: sem `ativar()` (ou a variável de
+    ambiente ECOMMERCE_METRICAS=1), cada ponto instrumentado
+    custa apenas a verificação de um atributo, sem medir tempo
+    nem tomar travas.
+
+Exportação:
+    - exportar_json(): contadores e resumo dos histogramas
+      (contagem, soma, média, p50, p90, p99 e máximo);
+    - exportar_prometheus(): formato de texto do Prometheus
+      (contadores *_total e histogramas *_seconds com faixas
+      cumulativas);
+    - salvar_metricas(caminho): .prom/.txt em Prometheus, demais
+      extensões em JSON.
+
+Perfil (opcional):
+    `capturar_perfil(destino)` executa um trecho sob cProfile e
+    tracemalloc, grava as estatísticas (pstats) e exibe as
+    funções mais caras e as linhas que mais alocaram memória.
+
+===========================================================
+"""
+
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+BITS_SUBFAIXA = 7  # 128 subfaixas por potência de 2: erro relativo < 1%
+PREFIXO_PROMETHEUS = "ecommerce_"
+# Limites (em segundos) das faixas exportadas para o Prometheus
+FAIXAS_PROMETHEUS = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0]
+
+
+# ===========================================================
+# CLASSE: HistogramaLatencia
+# ===========================================================
+
+
+class HistogramaLatencia:
+    """
+    Histograma log-linear de valores inteiros não negativos
+    (latências em µs ou ns).
+
+    Valores abaixo de 2^(BITS_SUBFAIXA + 1) são exatos; acima, cada
+    potência de 2 é dividida em 2^BITS_SUBFAIXA faixas iguais.
+    """
+
+    def __init__(self):
+        self.contagens = {}  # índice da faixa -> contagem
+        self.total = 0
+        self.soma = 0
+        self.maximo = 0
+
+    @staticmethod
+    def _indice(valor):
+        deslocamento = max(0, valor.bit_length() - (BITS_SUBFAIXA + 1))
+        return (deslocamento << BITS_SUBFAIXA) + (valor >> deslocamento)
+
+    @staticmethod
+    def _limite(indice):
+        """
+        Maior valor representado pela faixa (como no HdrHistogram).
+        """
+
+        deslocamento = max(0, (indice >> BITS_SUBFAIXA) - 1)
+        mantissa = indice - (deslocamento << BITS_SUBFAIXA)
+        return ((mantissa + 1) << deslocamento) - 1
+
+    def registrar(self, valor):
+        """
+        Registra um valor (truncado para inteiro).
+        """
+
+        valor = max(0, int(valor))
+        indice = self._indice(valor)
+        self.contagens[indice] = self.contagens.get(indice, 0) + 1
+        self.total += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def mesclar(self, outro):
+        """
+        Soma ao histograma as contagens de outro.
+        """
+
+        for indice, contagem in outro.contagens.items():
+            self.contagens[indice] = self.contagens.get(indice, 0) + contagem
+        self.total += outro.total
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+
+    @property
+    def media(self):
+        return self.soma / self.total if self.total else 0.0
+
+    def percentil(self, fracao):
+        """
+        Retorna o valor do percentil (0 a 1), com erro relativo < 1%.
+        """
+
+        if not self.total:
+            return 0
+        alvo = max(1, math.ceil(fracao * self.total))
+        acumulado = 0
+        for indice in sorted(self.contagens):
+            acumulado += self.contagens[indice]
+            if acumulado >= alvo:
+                return min(self._limite(indice), self.maximo)
+        return self.maximo
+
+    def contagem_ate(self, limite):
+        """
+        Quantidade de valores menores ou iguais ao limite (pelas faixas).
+        """
+
+        return sum(contagem for indice, contagem in self.contagens.items() if self._limite(indice) <= limite)
+
+    def distribuicao(self, meias_vidas=10):
+        """
+        Distribuição de percentis no formato do HdrHistogram: os
+        pontos se adensam perto de 100% (50%, 75%, 87,5%, ...).
+
+        Retorna:
+            list: tuplas (percentil, valor, contagem acumulada)
+        """
+
+        if not self.total:
+            return []
+        pontos = sorted({1 - 0.5 ** (meia_vida / 2) for meia_vida in range(2 * meias_vidas + 1)} | {1.0})
+        resultado, acumulado, faixas = [], 0, iter(sorted(self.contagens.items()))
+        for fracao in pontos:
+            alvo = max(1, math.ceil(fracao * self.total))
+            while acumulado < alvo:
+                indice, contagem = next(faixas)
+                acumulado += contagem
+            resultado.append((fracao, min(self._limite(indice), self.maximo), acumulado))
+        return resultado
+
+
+# ===========================================================
+# CLASSE: RegistroMetricas
+# ===========================================================
+
+
+class _SpanInativo:
+    """
+    Span usado com as métricas desativadas: não mede nada.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_SPAN_INATIVO = _SpanInativo()
+
+
+class _Span:
+    """
+    Cronometra um trecho e registra a duração (ns) ao sair.
+    """
+
+    __slots__ = ("_registro", "_chave", "_inicio")
+
+    def __init__(self, registro, chave):
+        self._registro = registro
+        self._chave = chave
+
+    def __enter__(self):
+        self._inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excecao):
+        self._registro._registrar(self._chave, time.perf_counter_ns() - self._inicio)
+        return False
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted(rotulos.items())) if rotulos else ()
+
+
+def _escapar(valor):
+    """
+    Escapa o valor de um rótulo no formato do Prometheus.
+    """
+
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas de duração, com rótulos.
+
+    Atributos:
+        ativo (bool): False = instrumentação sem efeito
+        contadores (dict): (nome, rótulos) -> valor
+        histogramas (dict): (nome, rótulos) -> HistogramaLatencia (ns)
+    """
+
+    def __init__(self, ativo=False):
+        self.ativo = ativo
+        self.contadores = {}
+        self.histogramas = {}
+        self._trava = threading.Lock()
+
+    def span(self, nome, **rotulos):
+        if not self.ativo:
+            return _SPAN_INATIVO
+        return _Span(self, _chave(nome, rotulos))
+
+    def contar(self, nome, valor=1, **rotulos):
+        if not self.ativo:
+            return
+        chave = _chave(nome, rotulos)
+        with self._trava:
+            self.contadores[chave] = self.contadores.get(chave, 0) + valor
+
+    def observar(self, nome, nanossegundos, **rotulos):
+        if self.ativo:
+            self._registrar(_chave(nome, rotulos), nanossegundos)
+
+    def _registrar(self, chave, nanossegundos):
+        with self._trava:
+            histograma = self.histogramas.get(chave)
+            if histograma is None:
+                histograma = self.histogramas[chave] = HistogramaLatencia()
+            histograma.registrar(nanossegundos)
+
+    def limpar(self):
+        """
+        Descarta todas as medições.
+        """
+
+        with self._trava:
+            self.contadores.clear()
+            self.histogramas.clear()
+
+    # -------------------------------------------------------
+    # Exportação
+    # -------------------------------------------------------
+
+    def _copiar(self):
+        """
+        Copia, sob a trava, os contadores e histogramas ordenados.
+        """
+
+        with self._trava:
+            contadores = sorted(self.contadores.items())
+            histogramas = [(chave, HistogramaLatencia()) for chave in sorted(self.histogramas)]
+            for chave, copia in histogramas:
+                copia.mesclar(self.histogramas[chave])
+        return contadores, histogramas
+
+    def exportar_json(self):
+        """
+        Retorna as métricas como dicionário serializável em JSON.
+
+        Retorna:
+            dict: "contadores" e "histogramas" (tempos em µs)
+        """
+
+        contadores, histogramas = self._copiar()
+
+        return {
+            "contadores": [{"nome": nome, "rotulos": dict(rotulos), "valor": valor}
+                           for (nome, rotulos), valor in contadores],
+            "histogramas": [{
+                "nome": nome,
+                "rotulos": dict(rotulos),
+                "contagem": histograma.total,
+                "soma_ms": round(histograma.soma / 1e6, 3),
+                "media_us": round(histograma.media / 1e3, 3),
+                "p50_us": round(histograma.percentil(0.50) / 1e3, 3),
+                "p90_us": round(histograma.percentil(0.90) / 1e3, 3),
+                "p99_us": round(histograma.percentil(0.99) / 1e3, 3),
+                "max_us": round(histograma.maximo / 1e3, 3),
+            } for (nome, rotulos), histograma in histogramas],
+        }
+
+    def exportar_prometheus(self):
+        """
+        Retorna as métricas no formato de texto do Prometheus.
+        """
+
+        def rotular(rotulos, extra=()):
+            pares = list(rotulos) + list(extra)
+            if not pares:
+                return ""
+            return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + "}"
+
+        contadores, histogramas = self._copiar()
+
+        linhas, tipos = [], set()
+        for (nome, rotulos), valor in contadores:
+            metrica = f"{PREFIXO_PROMETHEUS}{nome}_total"
+            if metrica not in tipos:
+                tipos.add(metrica)
+                linhas.append(f"# TYPE {metrica} counter")
+            linhas.append(f"{metrica}{rotular(rotulos)} {valor}")
+
+        for (nome, rotulos), histograma in histogramas:
+            metrica = f"{PREFIXO_PROMETHEUS}{nome}_seconds"
+            if metrica not in tipos:
+                tipos.add(metrica)
+                linhas.append(f"# TYPE {metrica} histogram")
+            for limite in FAIXAS_PROMETHEUS:
+                contagem = histograma.contagem_ate(int(limite * 1e9))
+                linhas.append(f"{metrica}_bucket{rotular(rotulos, [('le', repr(limite))])} {contagem}")
+            linhas.append(f"{metrica}_bucket{rotular(rotulos, [('le', '+Inf')])} {histograma.total}")
+            linhas.append(f"{metrica}_sum{rotular(rotulos)} {histograma.soma / 1e9!r}")
+            linhas.append(f"{metrica}_count{rotular(rotulos)} {histograma.total}")
+        return "\n".join(linhas) + "\n"
+
+
+# ===========================================================
+# REGISTRO GLOBAL E ATALHOS
+# ===========================================================
+
+
+REGISTRO = RegistroMetricas(ativo=os.environ.get("ECOMMERCE_METRICAS", "") not in ("", "0"))
+
+
+def ativar():
+    REGISTRO.ativo = True
+
+
+def desativar():
+    REGISTRO.ativo = False
+
+
+def span(nome, **rotulos):
+    """
+    Cronometra o bloco `with` no histograma `nome` (com rótulos).
+    """
+
+    if not REGISTRO.ativo:
+        return _SPAN_INATIVO
+    return _Span(REGISTRO, _chave(nome, rotulos))
+
+
+def contar(nome, valor=1, **rotulos):
+    """
+    Incrementa o contador `nome` (com rótulos).
+    """
+
+    if REGISTRO.ativo:
+        REGISTRO.contar(nome, valor, **rotulos)
+
+
+def observar(nome, nanossegundos, **rotulos):
+    """
+    Registra no histograma `nome` uma duração medida fora de um
+    `span` (ex.: desde o início do programa).
+    """
+
+    if REGISTRO.ativo:
+        REGISTRO.observar(nome, nanossegundos, **rotulos)
+
+
+def cronometrar(nome, **rotulos):
+    """
+    Decorador que cronometra cada chamada da função.
+
+    Com as métricas desativadas, a chamada segue direto para a
+    função original.
+    """
+
+    chave = _chave(nome, rotulos)
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            if not REGISTRO.ativo:
+                return funcao(*args, **kwargs)
+            with _Span(REGISTRO, chave):
+                return funcao(*args, **kwargs)
+        return medida
+
+    return decorador
+
+
+def exportar_json():
+    return REGISTRO.exportar_json()
+
+
+def exportar_prometheus():
+    return REGISTRO.exportar_prometheus()
+
+
+def salvar_metricas(caminho):
+    """
+    Grava as métricas em Prometheus (.prom/.txt) ou JSON.
+    """
+
+    with open(caminho, "w", encoding="utf-8") as destino:
+        if caminho.endswith((".prom", ".txt")):
+            destino.write(exportar_prometheus())
+        else:
+            json.dump(exportar_json(), destino, ensure_ascii=False, indent=2)
+            destino.write("\n")
+    print(f"📈 Métricas gravadas em {caminho}")
+
+
+# ===========================================================
+# CAPTURA DE PERFIL (cProfile + tracemalloc)
+# ===========================================================
+
+
+@contextmanager
+def capturar_perfil(destino=None, linhas=20, memoria=True):
+    """
+    Executa o bloco `with` sob cProfile (e tracemalloc).
+
+    O cProfile mede apenas a thread atual; o tracemalloc, todas.
+
+    Parâmetros:
+        destino (str | None): arquivo pstats (lido com
+            `python -m pstats destino` ou snakeviz)
+        linhas (int): funções/linhas exibidas nos resumos
+        memoria (bool): também rastreia as alocações (mais lento)
+    """
+
+    # Importados só aqui: o pstats sozinho pesa na inicialização
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    perfil = cProfile.Profile()
+    if memoria:
+        tracemalloc.start()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        if memoria:
+            captura = tracemalloc.take_snapshot()
+            atual, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if destino:
+            perfil.dump_stats(destino)
+            print(f"🧪 Perfil gravado em {destino}")
+
+        saida = io.StringIO()
+        pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(linhas)
+        print(saida.getvalue())
+
+        if memoria:
+            print(f"🧠 Memória rastreada: atual {atual / 2**20:.1f} MiB | pico {pico / 2**20:.1f} MiB")
+            for estatistica in captura.statistics("lineno")[:linhas]:
+                print(f"   {estatistica}")
@@ -0,0 +1,327 @@
+"""
+===========================================================
+CURSOR PAGINADO DE RESULTADOS
+
+Descrição:
+    Módulo que implementa o `CursorBusca`, um cursor preguiçoso
+    sobre as posições encontradas por uma busca. Em vez de
+    materializar todos os resultados, o cursor percorre a fonte
+    de posições apenas até a página pedida e converte em tuplas
+    (nome, preço, código) somente os itens exibidos.
+
+    - A paginação não guarda resultados: a memória fica limitada
+      ao tamanho da página;
+    - A primeira página é obtida sem percorrer toda a fonte;
+    - O total é exato e imediato quando a fonte tem tamanho
+      conhecido (uma lista de postings do índice) e, nos demais
+      casos, é calculado sob demanda por uma passada de contagem
+      que não guarda os resultados;
+    - `materializar` guarda as posições em um array('i') (4 bytes
+      por linha do store, usado pelo cache de resultados) quando
+      elas cabem no limite informado; acima dele, a passada
+      apenas conta. Com as posições guardadas, o total e qualquer
+      página são obtidos por fatia, sem refazer a busca;
+    - Fontes canceláveis (ex.: o filtro do `IndiceTextual`)
+      recebem o evento de cancelamento de `pagina`, `contar` e
+      `materializar` e o conferem a cada BLOCO_CANCELAMENTO
+      candidatos (`em_blocos`), lançando `BuscaCancelada`: uma
+      busca substituída libera a thread mesmo quando quase
+      nenhum candidato é aceito;
+    - As páginas podem ser lidas de várias threads: a leitura da
+      fonte entre páginas é serializada por cursor (uma leitura
+      substituída termina antes de a seguinte continuar).
+
+===========================================================
+"""
+
+
+import threading
+from array import array
+from itertools import islice
+from src.metricas import cronometrar
+
+
+BLOCO_CANCELAMENTO = 4_096
+
+
+# ===========================================================
+# CANCELAMENTO DA LEITURA
+# ===========================================================
+
+
+class BuscaCancelada(Exception):
+    """
+    Leitura de uma fonte interrompida pelo evento de cancelamento.
+    """
+
+
+class _Sinal:
+    """
+    Evento de cancelamento do iterador mantido entre páginas: cada
+    chamada de `pagina` troca o evento (as páginas seguintes podem
+    ser lidas em outra thread, sem cancelamento).
+    """
+
+    __slots__ = ("evento",)
+
+    def __init__(self):
+        self.evento = None
+
+    def is_set(self):
+        return self.evento is not None and self.evento.is_set()
+
+
+def em_blocos(posicoes, cancelado):
+    """
+    Divide as posições em blocos de BLOCO_CANCELAMENTO, conferindo
+    o cancelamento antes de cada um (o laço sobre cada bloco fica
+    sem custo extra por item).
+
+    Parâmetros:
+        posicoes (iterable): posições (array, fatia ou iterador)
+        cancelado (threading.Event): evento de cancelamento
+
+    Retorna:
+        generator: blocos de posições
+
+    Lança:
+        BuscaCancelada: se o evento for sinalizado
+    """
+
+    if hasattr(posicoes, "__getitem__") and hasattr(posicoes, "__len__"):
+        blocos = (posicoes[inicio:inicio + BLOCO_CANCELAMENTO]
+                  for inicio in range(0, len(posicoes), BLOCO_CANCELAMENTO))
+    else:
+        iterador = iter(posicoes)
+        blocos = iter(lambda: list(islice(iterador, BLOCO_CANCELAMENTO)), [])
+    for bloco in blocos:
+        if cancelado.is_set():
+            raise BuscaCancelada
+        yield bloco
+
+
+# ===========================================================
+# CLASSE: CursorBusca
+# ===========================================================
+
+
+class CursorBusca:
+    """
+    Cursor paginado sobre as posições de um ProductStore.
+
+    Atributos:
+        total_conhecido (int | None): total de resultados, se já
+            conhecido sem precisar de uma passada de contagem
+        posicoes (array | None): todas as posições, quando
+            materializadas
+    """
+
+    def __init__(self, produtos, fonte, total=None, posicoes=None, cancelavel=False):
+        """
+        Parâmetros:
+            produtos (ProductStore): store de onde vêm os dados
+            fonte (callable): função sem argumentos que devolve um
+                novo iterador sobre as posições, em ordem
+            total (int | None): total de posições, se conhecido
+            posicoes (array | None): posições já prontas (ex.: uma
+                lista de postings), equivalentes à fonte
+            cancelavel (bool): a fonte recebe como argumento o
+                evento de cancelamento (ou None) e lança
+                `BuscaCancelada` quando ele é sinalizado
+        """
+
+        self.produtos = produtos
+        self.posicoes = posicoes
+        self.total_conhecido = len(posicoes) if posicoes is not None else total
+        self._fonte = fonte
+        self._cancelavel = cancelavel
+        self._sinal = None
+        self._iterador = None
+        self._consumidos = 0
+        self._adiantado = None  # posição lida além da última página
+        self._trava = threading.Lock()  # protege o iterador entre páginas
+
+    def __iter__(self):
+        """
+        Percorre todas as posições encontradas, do início.
+        """
+
+        return self._abrir()
+
+    def _abrir(self, cancelado=None):
+        """
+        Retorna um novo iterador sobre a fonte.
+        """
+
+        return iter(self._fonte(cancelado) if self._cancelavel else self._fonte())
+
+    def _descartar_iterador(self):
+        """
+        Encerra o iterador mantido entre páginas (e o que a fonte
+        mantém aberto para ele).
+        """
+
+        if self._iterador is not None and hasattr(self._iterador, "close"):
+            self._iterador.close()
+        self._iterador = None
+        self._adiantado = None
+
+    @property
+    def total(self):
+        """
+        Total de resultados (executa a contagem na primeira vez,
+        se ele ainda não for conhecido).
+        """
+
+        return self.contar()
+
+    def contar(self, cancelado=None):
+        """
+        Conta os resultados percorrendo a fonte sem guardá-los.
+
+        Parâmetros:
+            cancelado (threading.Event | None): interrompe a contagem
+                quando sinalizado
+
+        Retorna:
+            int | None: total de resultados, ou None se cancelada
+        """
+
+        if self.total_conhecido is None:
+            total = 0
+            try:
+                for total, _ in enumerate(self._abrir(cancelado), 1):
+                    if cancelado is not None and not total % 65_536 and cancelado.is_set():
+                        return None
+            except BuscaCancelada:
+                return None
+            self.total_conhecido = total
+        return self.total_conhecido
+
+    @cronometrar("busca_textual", fase="materializar")
+    def materializar(self, cancelado=None, maximo_bytes=None):
+        """
+        Percorre a fonte guardando as posições em um array('i').
+
+        Parâmetros:
+            cancelado (threading.Event | None): interrompe a leitura
+                quando sinalizado
+            maximo_bytes (int | None): se as posições passarem deste
+                tamanho (ex.: o limite do cache), a leitura segue
+                apenas contando e `posicoes` continua None
+
+        Retorna:
+            int | None: total de resultados, ou None se cancelada
+        """
+
+        if self.posicoes is None:
+            posicoes = array("i")
+            total = 0
+            iterador = iter(()) if self.total_conhecido == 0 else self._abrir(cancelado)
+            while True:
+                try:
+                    bloco = list(islice(iterador, 65_536))
+                except BuscaCancelada:
+                    return None
+                total += len(bloco)
+                if posicoes is not None:
+                    anterior = len(posicoes)
+                    try:
+                        posicoes.extend(bloco)
+                    except OverflowError:  # identificadores do banco acima de 32 bits
+                        del posicoes[anterior:]
+                        posicoes = array("q", posicoes)
+                        posicoes.extend(bloco)
+                    if maximo_bytes is not None and 256 + len(posicoes) * posicoes.itemsize > maximo_bytes:
+                        posicoes = None  # não caberia no cache: apenas conta
+                if len(bloco) < 65_536:
+                    break
+                if cancelado is not None and cancelado.is_set():
+                    return None
+            self.total_conhecido = total
+            self.posicoes = posicoes
+            if posicoes is not None:
+                with self._trava:  # as páginas passam a ser fatias
+                    self._descartar_iterador()
+        return self.total_conhecido
+
+    def tamanho_aproximado(self):
+        """
+        Retorna o tamanho aproximado, em bytes, das posições guardadas.
+        """
+
+        if self.posicoes is None:
+            return 256
+        return 256 + len(self.posicoes) * self.posicoes.itemsize
+
+    @cronometrar("paginacao")
+    def pagina(self, numero, tamanho, cancelado=None):
+        """
+        Retorna uma página de resultados.
+
+        Avançar para a página seguinte continua a leitura de onde
+        a anterior parou; voltar reinicia a fonte e descarta os
+        itens anteriores à página. Com as posições materializadas,
+        a página é uma fatia do array.
+
+        Parâmetros:
+            numero (int): índice da página (a partir de 0)
+            tamanho (int): resultados por página
+            cancelado (threading.Event | None): interrompe a leitura
+                de uma fonte cancelável quando sinalizado
+
+        Retorna:
+            tuple(list, bool):
+                - Tuplas (nome, preço, código) da página
+                - True se existem resultados após esta página
+
+        Lança:
+            BuscaCancelada: se a leitura foi cancelada (a próxima
+                página reinicia a fonte)
+        """
+
+        inicio = numero * tamanho
+        produto = self.produtos.produto
+        if self.posicoes is None:
+            with self._trava:
+                if self.posicoes is None:  # materializadas durante a espera
+                    return self._pagina_da_fonte(inicio, tamanho, cancelado)
+        pagina = self.posicoes[inicio:inicio + tamanho]
+        return [produto(posicao) for posicao in pagina], inicio + tamanho < len(self.posicoes)
+
+    def _pagina_da_fonte(self, inicio, tamanho, cancelado):
+        """
+        Lê a página continuando o iterador mantido entre páginas
+        (chamada com a trava do cursor).
+        """
+
+        produto = self.produtos.produto
+        if self._iterador is None or inicio < self._consumidos:
+            self._sinal = _Sinal()
+            self._iterador = self._abrir(self._sinal)
+            self._consumidos = 0
+            self._adiantado = None
+        self._sinal.evento = cancelado
+
+        # A posição adiantada é a de índice `_consumidos`
+        posicoes = [] if self._adiantado is None else [self._adiantado]
+        self._adiantado = None
+        pular = inicio - self._consumidos
+        if pular and posicoes:
+            posicoes.clear()
+            pular -= 1
+        try:
+            for _ in islice(self._iterador, pular):
+                pass
+            posicoes.extend(islice(self._iterador, tamanho + 1 - len(posicoes)))
+        except BuscaCancelada:
+            self._iterador = None  # o gerador da fonte foi encerrado
+            raise
+        ha_mais = len(posicoes) > tamanho
+        if ha_mais:
+            self._adiantado = posicoes.pop()
+        elif self.total_conhecido is None:
+            self.total_conhecido = inicio + len(posicoes)
+        self._consumidos = inicio + len(posicoes)
+
+        return [produto(posicao) for posicao in posicoes], ha_mais
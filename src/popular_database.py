@@ -6,6 +6,11 @@ Descrição:
     aleatórios ("codigo_busca") embaralhados, simulando
     um ambiente de e-commerce com milhões de registros.
 
+    Os códigos de busca são atribuídos na mesma passada que
+    insere os produtos. Para sortear novos códigos em um banco
+    existente, o modo --reembaralhar reconstrói a tabela com
+    uma única junção contra uma tabela temporária de mapeamento.
+
 Estrutura da tabela:
     - id_produto (INTEGER PRIMARY KEY)
     - nome_produto (TEXT)
@@ -14,18 +19,35 @@ Estrutura da tabela:
 
 Recursos implementados:
     - Inserção em lotes
-    - Geração de códigos únicos e aleatórios
+    - Geração de códigos únicos e aleatórios na própria inserção
+    - Semente opcional (--semente) para gerar bancos idênticos
     - Mensagens de progresso otimizadas
+    - Modo rápido (--rapido): PRAGMAs de carga em massa, uma
+      única transação e geração vetorizada das linhas
+    - Índice em 'codigo_busca' criado apenas ao final da carga
     - Totalmente compatível com o sistema de busca Tkinter
 
+Uso:
+    python src/popular_database.py                 # modo padrão
+    python src/popular_database.py --rapido        # modo rápido
+    python src/popular_database.py --rapido --total 1000000
+    python src/popular_database.py --rapido --semente 42
+    python src/popular_database.py --reembaralhar  # novos códigos
+
 ===========================================================
 """
 
+import argparse
 import sqlite3
 import random
 import time
 import os
 
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional no modo rápido
+    np = None
+
 
 # ===========================================================
 # CONFIGURAÇÕES GERAIS
@@ -42,6 +64,28 @@ MARCAS = ["Tech", "Hyper", "Quantum", "Future", "Eco", "Stellar", "Prime", "Next
 DB_DIR = "db"
 DB_FILE = os.path.join(DB_DIR, "ecommerce.db")
 
+TOTAL_PRODUTOS = 10_000_000
+
+# PRAGMAs do modo rápido: sem journal nem fsync durante a carga
+# (o banco é recriado do zero, então não há o que recuperar),
+# cache de ~256 MB e estruturas temporárias em memória.
+PRAGMAS_CARGA = [
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA locking_mode = EXCLUSIVE",
+]
+
+ESQUEMA_PRODUTOS = """
+    CREATE TABLE {tabela} (
+        id_produto INTEGER PRIMARY KEY,
+        nome_produto TEXT NOT NULL,
+        preco REAL NOT NULL,
+        codigo_busca INTEGER
+    )
+"""
+
 
 # ===========================================================
 # FUNÇÃO: criar_banco
@@ -60,31 +104,55 @@ def criar_banco():
     cursor = conn.cursor()
 
     cursor.execute("DROP TABLE IF EXISTS produtos")
-    cursor.execute("""
-        CREATE TABLE produtos (
-            id_produto INTEGER PRIMARY KEY,
-            nome_produto TEXT NOT NULL,
-            preco REAL NOT NULL,
-            codigo_busca INTEGER
-        )
-    """)
+    # Índice textual do backend em disco (src/backend_banco.py):
+    # descartado junto, pois passaria a apontar para linhas antigas
+    cursor.execute("DROP TABLE IF EXISTS produtos_fts")
+    # Registro de alterações (src/atualizacao.py): recriado na
+    # próxima carga, com nova época
+    cursor.execute("DROP TABLE IF EXISTS produtos_alteracoes")
+    cursor.execute("DROP TABLE IF EXISTS produtos_rastreamento")
+    cursor.execute(ESQUEMA_PRODUTOS.format(tabela="produtos"))
 
     conn.commit()
     conn.close()
     print("✅ Banco criado com sucesso!")
 
 
+# ===========================================================
+# FUNÇÃO: gerar_codigos_embaralhados
+# ===========================================================
+
+
+def gerar_codigos_embaralhados(total):
+    """
+    Retorna os códigos 10.000.000 ... 10.000.000 + total - 1 em
+    ordem aleatória (permutação sem repetições).
+
+    Usa o gerador do módulo `random`, então `random.seed` torna o
+    resultado determinístico (também com NumPy).
+    """
+
+    if np is not None:
+        gerador = np.random.default_rng(random.getrandbits(64))
+        return (gerador.permutation(total) + 10_000_000).tolist()
+
+    codigos = list(range(10_000_000, 10_000_000 + total))
+    random.shuffle(codigos)
+    return codigos
+
+
 # ===========================================================
 # FUNÇÃO: popular_banco
 # ===========================================================
 
 
-def popular_banco():
+def popular_banco(total_produtos=TOTAL_PRODUTOS):
     """
     Popula o banco de dados com 10 milhões de produtos fictícios.
 
     - IDs: variam de 10.000.000 a 19.999.999 (únicos)
     - Nome e preço gerados aleatoriamente
+    - Código de busca embaralhado atribuído na inserção
     - Inserção em blocos de 50.000 registros para eficiência
     """
 
@@ -92,19 +160,19 @@ def popular_banco():
     conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
 
-    total_produtos = 10_000_000
     batch_size = 50_000
 
     print(f"⚙️  Gerando {total_produtos:,} produtos fictícios...")
     start_time = time.time()
 
     ids_embaralhados = random.sample(range(10_000_000, 20_000_000), total_produtos)
+    codigos = gerar_codigos_embaralhados(total_produtos)
     produtos = []
 
-    for i, pid in enumerate(ids_embaralhados, 1):
+    for i, (pid, codigo) in enumerate(zip(ids_embaralhados, codigos), 1):
         nome = f"{random.choice(NOMES_PRODUTOS)} {random.choice(MARCAS)} X{random.randint(100, 999)}"
         preco = round(random.uniform(50.0, 5000.0), 2)
-        produtos.append((pid, nome, preco, None)) 
+        produtos.append((pid, nome, preco, codigo)) 
 
         if len(produtos) == batch_size:
             cursor.executemany(
@@ -126,47 +194,180 @@ def popular_banco():
     conn.close()
     end_time = time.time()
     print(f"✅ Banco populado com sucesso em {end_time - start_time:.2f} segundos!")
+    print(f"📈 {total_produtos / (end_time - start_time):,.0f} linhas/s")
 
 
 # ===========================================================
-# FUNÇÃO: gerar_codigo_busca
+# FUNÇÃO: popular_banco_rapido
 # ===========================================================
 
 
-def gerar_codigo_busca():
+def gerar_nomes_possiveis():
+    """
+    Retorna todas as combinações "Produto Marca X###".
+
+    Sortear uma combinação uniformemente equivale a sortear
+    produto, marca e modelo de forma independente, como em
+    `popular_banco`, mas com uma única escolha por linha.
     """
-    Gera e preenche a coluna 'codigo_busca' com valores únicos e aleatórios.
+
+    return [
+        f"{produto} {marca} X{modelo}"
+        for produto in NOMES_PRODUTOS
+        for marca in MARCAS
+        for modelo in range(100, 1000)
+    ]
+
+
+def _gerar_lote(nomes_possiveis, quantidade):
     """
+    Gera nomes e preços de um lote de uma só vez.
 
-    print("\n🎲 Iniciando geração dos códigos de busca...")
+    Retorna:
+        tuple(list, list): nomes e preços (R$ 50,00 a R$ 5.000,00)
+    """
+
+    if np is not None:
+        gerador = np.random.default_rng(random.getrandbits(64))
+        indices = gerador.integers(0, len(nomes_possiveis), quantidade)
+        nomes = [nomes_possiveis[i] for i in indices.tolist()]
+        precos = np.round(gerador.uniform(50.0, 5000.0, quantidade), 2).tolist()
+        return nomes, precos
+
+    nomes = random.choices(nomes_possiveis, k=quantidade)
+    aleatorio = random.random
+    precos = [round(50.0 + 4950.0 * aleatorio(), 2) for _ in range(quantidade)]
+    return nomes, precos
+
+
+def popular_banco_rapido(total_produtos=TOTAL_PRODUTOS, tamanho_lote=200_000):
+    """
+    Popula o banco no modo rápido (mesmo esquema de `popular_banco`).
+
+    - PRAGMAs de carga em massa (PRAGMAS_CARGA)
+    - Uma única transação para todas as inserções
+    - IDs inseridos em ordem crescente (acréscimo no fim da B-tree)
+    - Código de busca embaralhado atribuído na inserção
+    - Nomes sorteados entre as combinações pré-calculadas e preços
+      gerados por lote (NumPy, se disponível)
+    """
+
+    print(f"🔗 Conectando ao banco: {DB_FILE}")
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    for pragma in PRAGMAS_CARGA:
+        conn.execute(pragma)
+
+    print(f"⚡ Gerando {total_produtos:,} produtos fictícios (modo rápido)...")
+    start_time = time.time()
+
+    nomes_possiveis = gerar_nomes_possiveis()
+
+    # Mesmo conjunto de IDs do modo padrão, mas inserido em ordem
+    # crescente: cada INSERT vira um acréscimo no fim da B-tree da
+    # chave primária. Como nome e preço são sorteados por linha, a
+    # distribuição dos dados é a mesma.
+    faixa_ids = range(10_000_000, 20_000_000)
+    if total_produtos == len(faixa_ids):
+        ids_ordenados = faixa_ids
+    else:
+        ids_ordenados = sorted(random.sample(faixa_ids, total_produtos))
+    codigos = gerar_codigos_embaralhados(total_produtos)
+
+    conn.execute("BEGIN")
+    for inicio in range(0, total_produtos, tamanho_lote):
+        ids = ids_ordenados[inicio:inicio + tamanho_lote]
+        nomes, precos = _gerar_lote(nomes_possiveis, len(ids))
+        conn.executemany(
+            "INSERT INTO produtos (id_produto, nome_produto, preco, codigo_busca) VALUES (?, ?, ?, ?)",
+            zip(ids, nomes, precos, codigos[inicio:inicio + tamanho_lote])
+        )
+        print(f"🧱 Inseridos {inicio + len(ids):,}/{total_produtos:,} registros...")
+    conn.execute("COMMIT")
+
+    conn.close()
+    end_time = time.time()
+    print(f"✅ Banco populado com sucesso em {end_time - start_time:.2f} segundos!")
+    print(f"📈 {total_produtos / (end_time - start_time):,.0f} linhas/s")
+
+
+# ===========================================================
+# FUNÇÃO: criar_indices
+# ===========================================================
+
+
+def criar_indices():
+    """
+    Cria o índice único em 'codigo_busca'.
+
+    É executada depois da carga e da geração dos códigos: montar
+    o índice uma única vez, sobre a tabela pronta, é muito mais
+    barato do que mantê-lo atualizado a cada inserção.
+    """
+
+    print("\n🗂️  Criando índice em 'codigo_busca'...")
+    start_time = time.time()
     conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_produtos_codigo_busca ON produtos (codigo_busca)")
+    conn.commit()
+    conn.close()
+    print(f"✅ Índice criado em {time.time() - start_time:.2f} segundos!")
 
-    cursor.execute("PRAGMA table_info(produtos);")
-    colunas = [info[1] for info in cursor.fetchall()]
-    if "codigo_busca" not in colunas:
-        print("🆕 Adicionando coluna 'codigo_busca'...")
-        cursor.execute("ALTER TABLE produtos ADD COLUMN codigo_busca INTEGER;")
-        conn.commit()
 
-    cursor.execute("SELECT id_produto FROM produtos;")
-    ids = [linha[0] for linha in cursor.fetchall()]
-    total = len(ids)
-    print(f"📦 Total de produtos: {total:,}")
+# ===========================================================
+# FUNÇÃO: gerar_codigo_busca
+# ===========================================================
 
-    codigos = list(range(10_000_000, 10_000_000 + total))
-    random.shuffle(codigos)
 
-    print("💾 Atualizando banco (pode demorar alguns minutos)...")
-    lotes = 50_000
-    for i in range(0, total, lotes):
-        batch = [(codigos[j], ids[j]) for j in range(i, min(i + lotes, total))]
-        cursor.executemany("UPDATE produtos SET codigo_busca = ? WHERE id_produto = ?;", batch)
-        conn.commit()
-        print(f"✔️  {min(i + lotes, total):,}/{total:,} registros atualizados")
+def gerar_codigo_busca():
+    """
+    Sorteia novamente a coluna 'codigo_busca' de um banco existente.
+
+    Em vez de um UPDATE por linha, os novos códigos são gravados
+    em uma tabela temporária de mapeamento (ordem da linha ->
+    código) e a tabela é reconstruída com um único
+    INSERT ... SELECT juntando as duas. Tudo ocorre em uma
+    transação: em caso de falha, o banco original é preservado.
+    """
+
+    print("\n🎲 Iniciando geração dos códigos de busca...")
+    start_time = time.time()
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    conn.execute("PRAGMA cache_size = -262144")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    total = conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+    print(f"📦 Total de produtos: {total:,}")
+    codigos = gerar_codigos_embaralhados(total)
+
+    conn.execute("BEGIN")
+    conn.execute("CREATE TEMP TABLE mapa_codigos (ordem INTEGER PRIMARY KEY, codigo INTEGER NOT NULL)")
+    conn.executemany("INSERT INTO mapa_codigos (ordem, codigo) VALUES (?, ?)", enumerate(codigos, 1))
+    del codigos
+
+    print("💾 Reconstruindo a tabela com os novos códigos...")
+    conn.execute(ESQUEMA_PRODUTOS.format(tabela="produtos_novo"))
+    conn.execute("""
+        INSERT INTO produtos_novo (id_produto, nome_produto, preco, codigo_busca)
+        SELECT p.id_produto, p.nome_produto, p.preco, m.codigo
+        FROM (
+            SELECT id_produto, nome_produto, preco,
+                   ROW_NUMBER() OVER (ORDER BY id_produto) AS ordem
+            FROM produtos
+        ) AS p
+        JOIN mapa_codigos AS m ON m.ordem = p.ordem
+        ORDER BY p.id_produto
+    """)
+    conn.execute("DROP TABLE produtos")
+    conn.execute("ALTER TABLE produtos_novo RENAME TO produtos")
+    # Os gatilhos de rastreamento caíram com a tabela antiga: o
+    # registro é descartado para forçar a recarga completa
+    conn.execute("DROP TABLE IF EXISTS produtos_alteracoes")
+    conn.execute("DROP TABLE IF EXISTS produtos_rastreamento")
+    conn.execute("DROP TABLE mapa_codigos")
+    conn.execute("COMMIT")
 
     conn.close()
-    print("✅ Coluna 'codigo_busca' preenchida com sucesso!")
+    print(f"✅ Coluna 'codigo_busca' preenchida com sucesso em {time.time() - start_time:.2f} segundos!")
 
 
 # ===========================================================
@@ -175,7 +376,27 @@ def gerar_codigo_busca():
 
 
 if __name__ == "__main__":
-    criar_banco()
-    popular_banco()
-    gerar_codigo_busca()
+    parser = argparse.ArgumentParser(description="Cria e popula o banco de produtos fictícios.")
+    parser.add_argument("--rapido", action="store_true",
+                        help="modo rápido: PRAGMAs de carga, transação única e geração em lote")
+    parser.add_argument("--total", type=int, default=TOTAL_PRODUTOS,
+                        help="quantidade de produtos (padrão: 10.000.000)")
+    parser.add_argument("--semente", type=int,
+                        help="semente aleatória (gera sempre o mesmo banco)")
+    parser.add_argument("--reembaralhar", action="store_true",
+                        help="apenas sorteia novos códigos de busca no banco existente")
+    args = parser.parse_args()
+
+    if args.semente is not None:
+        random.seed(args.semente)
+
+    if args.reembaralhar:
+        gerar_codigo_busca()
+    else:
+        criar_banco()
+        if args.rapido:
+            popular_banco_rapido(args.total)
+        else:
+            popular_banco(args.total)
+    criar_indices()
     print("\n🚀 Processo finalizado com sucesso!")
@@ -0,0 +1,299 @@
+"""
+===========================================================
+CONSTRUÇÃO PARALELA DO BANCO EM FRAGMENTOS (SHARDS)
+
+Descrição:
+    Versão multiprocessada do modo rápido de
+    `popular_database.py`. A faixa de produtos é dividida entre
+    vários processos; cada um gera as suas linhas e grava um
+    banco SQLite próprio (um fragmento, sem disputa de escrita).
+    Ao final, os fragmentos são mesclados no banco principal com
+    `ATTACH` + `INSERT ... SELECT`, em ordem de id_produto
+    (acréscimos no fim da B-tree), e o índice de 'codigo_busca'
+    é criado uma única vez.
+
+Dados gerados:
+    - IDs consecutivos a partir de 10.000.000 (para 10.000.000
+      produtos, a mesma faixa dos demais modos)
+    - Nome e preço sorteados como no modo rápido
+    - Código de busca: permutação embaralhada de
+      10.000.000 ... 10.000.000 + total - 1, calculada linha a
+      linha por uma rede de Feistel (sem materializar a lista
+      inteira em nenhum processo, o que viabiliza 100 milhões)
+
+    Cada bloco de linhas tem a sua própria semente derivada de
+    --semente, então o banco gerado é o mesmo para qualquer
+    número de processos.
+
+Uso (relatório de eficiência por número de processos):
+    python -m src.popular_paralelo --tamanhos 1000000 10000000 --processos 1 2 4 8
+    python -m src.popular_paralelo --tamanhos 100000000 --processos 8 --semente 42
+
+===========================================================
+"""
+
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from multiprocessing import Pool
+from src.popular_database import (
+    DB_DIR, DB_FILE, ESQUEMA_PRODUTOS, PRAGMAS_CARGA, TOTAL_PRODUTOS,
+    _gerar_lote, criar_banco, criar_indices, gerar_nomes_possiveis, np,
+)
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+CODIGO_INICIAL = 10_000_000
+TAMANHO_BLOCO = 200_000
+RODADAS_FEISTEL = 4
+MASCARA_64 = (1 << 64) - 1
+MULTIPLICADOR = 0x9E3779B97F4A7C15
+
+
+# ===========================================================
+# PERMUTAÇÃO DOS CÓDIGOS (REDE DE FEISTEL)
+# ===========================================================
+
+
+def _gerar_chaves(semente):
+    """
+    Sorteia as chaves das rodadas da permutação.
+    """
+
+    gerador = random.Random(f"{semente}-codigos")
+    return [gerador.getrandbits(32) for _ in range(RODADAS_FEISTEL)]
+
+
+def permutar_indices(indices, total, chaves):
+    """
+    Aplica uma permutação pseudoaleatória de [0, total).
+
+    Uma rede de Feistel desbalanceada é uma bijeção sobre os
+    2^b valores de b bits (o menor b que cobre `total`); a cada
+    rodada, a parte baixa vai para o topo e a parte alta recebe
+    um XOR com a mistura da parte baixa. Resultados fora da faixa
+    são permutados de novo ("cycle walking") até caírem nela, o
+    que mantém a bijeção restrita a [0, total).
+
+    Parâmetros:
+        indices (iterable): índices globais das linhas
+        total (int): tamanho da faixa permutada
+        chaves (list): chaves das rodadas (`_gerar_chaves`)
+
+    Retorna:
+        list: posição embaralhada de cada índice
+    """
+
+    bits = max(1, (total - 1).bit_length())
+    rodadas = []
+    for numero, chave in enumerate(chaves):
+        baixo = bits // 2 if numero % 2 == 0 else bits - bits // 2
+        rodadas.append((chave, baixo, (1 << baixo) - 1, bits - baixo, (1 << (bits - baixo)) - 1))
+
+    if np is not None:
+        valores = np.array(indices, dtype=np.uint64)
+        pendentes = np.ones(len(valores), dtype=bool)
+        with np.errstate(over="ignore"):
+            while pendentes.any():
+                x = valores[pendentes]
+                for chave, baixo, mascara_baixo, alto, mascara_alto in rodadas:
+                    parte_baixa = x & np.uint64(mascara_baixo)
+                    mistura = ((parte_baixa ^ np.uint64(chave)) * np.uint64(MULTIPLICADOR)) >> np.uint64(29)
+                    x = (parte_baixa << np.uint64(alto)) | ((x >> np.uint64(baixo)) ^ (mistura & np.uint64(mascara_alto)))
+                valores[pendentes] = x
+                pendentes = valores >= np.uint64(total)
+        return valores.tolist()
+
+    resultado = []
+    for valor in indices:
+        while True:
+            for chave, baixo, mascara_baixo, alto, mascara_alto in rodadas:
+                parte_baixa = valor & mascara_baixo
+                mistura = ((parte_baixa ^ chave) * MULTIPLICADOR & MASCARA_64) >> 29
+                valor = (parte_baixa << alto) | ((valor >> baixo) ^ (mistura & mascara_alto))
+            if valor < total:
+                break
+        resultado.append(valor)
+    return resultado
+
+
+# ===========================================================
+# FUNÇÃO EXECUTADA NOS PROCESSOS: _construir_fragmento
+# ===========================================================
+
+
+def _construir_fragmento(caminho, inicio, fim, total, semente, chaves):
+    """
+    Gera as linhas [inicio, fim) em um banco de fragmento próprio.
+
+    Retorna:
+        tuple(str, int, float): caminho, linhas gravadas e segundos
+    """
+
+    start_time = time.time()
+    if os.path.exists(caminho):
+        os.remove(caminho)
+
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    for pragma in PRAGMAS_CARGA:
+        conn.execute(pragma)
+    conn.execute(ESQUEMA_PRODUTOS.format(tabela="produtos"))
+
+    nomes_possiveis = gerar_nomes_possiveis()
+    conn.execute("BEGIN")
+    for bloco_inicio in range(inicio, fim, TAMANHO_BLOCO):
+        bloco_fim = min(bloco_inicio + TAMANHO_BLOCO, fim)
+        random.seed(f"{semente}-{bloco_inicio // TAMANHO_BLOCO}")
+        indices = range(bloco_inicio, bloco_fim)
+        nomes, precos = _gerar_lote(nomes_possiveis, len(indices))
+        codigos = permutar_indices(indices, total, chaves)
+        conn.executemany(
+            "INSERT INTO produtos (id_produto, nome_produto, preco, codigo_busca) VALUES (?, ?, ?, ?)",
+            zip(range(CODIGO_INICIAL + bloco_inicio, CODIGO_INICIAL + bloco_fim), nomes, precos,
+                [CODIGO_INICIAL + codigo for codigo in codigos])
+        )
+    conn.execute("COMMIT")
+    conn.close()
+    return caminho, fim - inicio, time.time() - start_time
+
+
+# ===========================================================
+# FUNÇÃO: mesclar_fragmentos
+# ===========================================================
+
+
+def mesclar_fragmentos(caminhos, remover=True):
+    """
+    Copia os fragmentos, em ordem, para a tabela do banco principal.
+
+    Parâmetros:
+        caminhos (list): bancos de fragmento, em ordem de id_produto
+        remover (bool): apaga os fragmentos após a cópia
+    """
+
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    for pragma in PRAGMAS_CARGA:
+        conn.execute(pragma)
+
+    for caminho in caminhos:
+        conn.execute("ATTACH DATABASE ? AS fragmento", (caminho,))
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO produtos SELECT * FROM fragmento.produtos ORDER BY id_produto")
+        conn.execute("COMMIT")
+        conn.execute("DETACH DATABASE fragmento")
+        if remover:
+            os.remove(caminho)
+    conn.close()
+
+
+# ===========================================================
+# FUNÇÃO: popular_banco_paralelo
+# ===========================================================
+
+
+def popular_banco_paralelo(total_produtos=TOTAL_PRODUTOS, processos=None, semente=None):
+    """
+    Recria o banco principal com `total_produtos` linhas geradas
+    por `processos` processos em paralelo.
+
+    Parâmetros:
+        total_produtos (int): quantidade de produtos
+        processos (int | None): processos geradores (padrão:
+            número de núcleos disponíveis)
+        semente (int | None): semente dos dados (None = aleatória)
+
+    Retorna:
+        dict: tempos (s) de geração, mesclagem, índice e total
+    """
+
+    processos = processos or os.cpu_count() or 1
+    if semente is None:
+        semente = random.getrandbits(64)
+    chaves = _gerar_chaves(semente)
+
+    # Fragmentos alinhados aos blocos: cada bloco é gerado sempre
+    # com a mesma semente, independentemente do fragmento
+    blocos = -(-total_produtos // TAMANHO_BLOCO)
+    blocos_por_fragmento = -(-blocos // processos)
+    tarefas = []
+    for indice, bloco in enumerate(range(0, blocos, blocos_por_fragmento)):
+        inicio = bloco * TAMANHO_BLOCO
+        fim = min((bloco + blocos_por_fragmento) * TAMANHO_BLOCO, total_produtos)
+        caminho = os.path.join(DB_DIR, f"ecommerce.fragmento{indice:02d}.db")
+        tarefas.append((caminho, inicio, fim, total_produtos, semente, chaves))
+
+    criar_banco()
+    print(f"⚡ Gerando {total_produtos:,} produtos em {len(tarefas)} fragmento(s) "
+          f"com {processos} processo(s)...")
+    inicio_total = time.time()
+    with Pool(processos) as pool:
+        fragmentos = pool.starmap(_construir_fragmento, tarefas)
+    tempo_geracao = time.time() - inicio_total
+    for caminho, linhas, segundos in fragmentos:
+        print(f"🧱 {os.path.basename(caminho)}: {linhas:,} linhas em {segundos:.2f} s")
+
+    print("🔗 Mesclando fragmentos no banco principal...")
+    inicio = time.time()
+    mesclar_fragmentos([caminho for caminho, _, _ in fragmentos])
+    tempo_mesclagem = time.time() - inicio
+
+    inicio = time.time()
+    criar_indices()
+    tempo_indice = time.time() - inicio
+
+    tempos = {
+        "geracao": tempo_geracao,
+        "mesclagem": tempo_mesclagem,
+        "indice": tempo_indice,
+        "total": time.time() - inicio_total,
+    }
+    print(f"✅ Banco populado com sucesso em {tempos['total']:.2f} segundos!")
+    print(f"📈 {total_produtos / tempos['total']:,.0f} linhas/s")
+    return tempos
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL: RELATÓRIO DE EFICIÊNCIA
+# ===========================================================
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.popular_paralelo",
+        description="Construção paralela do banco em fragmentos.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[TOTAL_PRODUTOS],
+                        help="quantidades de produtos (ex.: 1000000 10000000 100000000)")
+    parser.add_argument("--processos", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    semente = args.semente if args.semente is not None else random.getrandbits(64)
+    relatorio = []
+    for total in args.tamanhos:
+        for processos in args.processos:
+            print(f"\n{'=' * 59}\n📦 {total:,} produtos | {processos} processo(s)\n{'=' * 59}")
+            relatorio.append((total, processos, popular_banco_paralelo(total, processos, semente)))
+
+    print(f"\n🖥️  Núcleos disponíveis: {os.cpu_count()}")
+    base = {}
+    for total, processos, tempos in relatorio:
+        base.setdefault(total, (processos, tempos))
+        processos_base, tempos_base = base[total]
+        speedup = tempos_base["total"] / tempos["total"]
+        speedup_geracao = tempos_base["geracao"] / tempos["geracao"]
+        print(f"   {total:>12,} | {processos:>2} processos: total {tempos['total']:7.2f} s "
+              f"(geração {tempos['geracao']:6.2f} s, mesclagem {tempos['mesclagem']:6.2f} s, "
+              f"índice {tempos['indice']:6.2f} s) | speedup {speedup:5.2f}x "
+              f"| eficiência {speedup * processos_base / processos:6.1%} "
+              f"(geração {speedup_geracao * processos_base / processos:6.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,734 @@
+"""
+===========================================================
+SERVIDOR HTTP/JSON DE BUSCAS (SEM INTERFACE)
+
+Descrição:
+    Modo servidor do sistema: os produtos são carregados uma
+    única vez e compartilhados por todas as requisições, que são
+    atendidas de forma concorrente por um servidor HTTP/1.1
+    mínimo em asyncio (apenas biblioteca padrão, com conexões
+    persistentes).
+
+    O laço de eventos cuida apenas da rede; cada busca roda em
+    um pool de threads, de modo que uma busca lenta (linear, ou
+    a primeira contagem de um termo muito comum) não bloqueia as
+    demais conexões.
+
+Rotas (GET, respostas em JSON):
+    /produto?codigo=N[&motor=binaria|linear]
+        Busca por código, com tempo e passos do algoritmo.
+    /lote?codigos=N1,N2,...     (ou POST /lote {"codigos": [...]})
+        Busca em lote (`buscar_lote`), até MAXIMO_LOTE códigos.
+    /busca?q=termo[&pagina=0][&tamanho=10]
+        Busca por nome paginada. A página sai do cursor preguiçoso
+        (lê só até ela); as posições do termo são contadas fora da
+        requisição e guardadas no cache (src.cache) se couberem
+        nele, e daí em diante o total é exato e as páginas saem
+        por fatia. Enquanto o total não é conhecido, "total" é null.
+    /precos?[min=X][&max=Y][&q=termo][&ordem=crescente|decrescente][&pagina=0][&tamanho=10]
+        Produtos na faixa de preços, ordenados por preço
+        (`IndicePrecos`); com q, apenas os resultados da busca
+        por nome: interseção com as posições do termo quando elas
+        são poucas, ou a faixa percorrida em ordem de preço
+        conferindo o nome de cada produto (termos amplos).
+    POST /atualizar
+        Aplica aos dados em memória (e aos índices de nomes e de
+        preços) as alterações feitas no banco desde a carga (ver
+        src.atualizacao); as demais rotas esperam a aplicação.
+    /saude
+        Backend e quantidade de produtos.
+    /estatisticas
+        Requisições atendidas por rota e contadores do cache.
+    /metricas[?formato=json|prometheus]
+        Métricas de src.metricas (ativas com --metricas).
+
+    Toda resposta de busca informa "tempo_ms" (execução da busca)
+    e "tempo_total_ms" (da leitura da requisição até a resposta,
+    incluindo a espera no pool).
+
+    Cada requisição tem um evento de cancelamento, sinalizado se
+    o cliente fecha a conexão ou se ela passa de TEMPO_MAXIMO
+    segundos (resposta 503); a busca linear e a leitura das
+    páginas o conferem e liberam a thread do pool.
+
+Uso:
+    python -m src.servidor                       # dados em memória, porta 8080
+    python -m src.servidor --backend banco --porta 8081
+    python -m src.servidor --metricas --perfil servidor.prof
+    curl "http://127.0.0.1:8080/busca?q=mouse+hyper&pagina=1"
+    curl "http://127.0.0.1:8080/precos?min=100&max=150&q=mouse&ordem=decrescente"
+    curl -X POST "http://127.0.0.1:8080/atualizar"
+
+===========================================================
+"""
+
+
+import argparse
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from src.atualizacao import RecargaNecessaria, aplicar_alteracoes, ler_alteracoes, podar_alteracoes
+from src.backend_banco import DatabaseBackend
+from src.cache import CacheLRU, chave_textual
+from src.database import DB_FILE, carregar_dados
+from src.indice_precos import IndicePrecos
+from src.indice_textual import IndiceTextual
+from src.metricas import ativar, capturar_perfil, contar, exportar_json, exportar_prometheus, span
+from src.paginacao import BuscaCancelada, CursorBusca
+
+
+# ===========================================================
+# CONFIGURAÇÕES
+# ===========================================================
+
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8080
+TRABALHADORES = 4
+MAXIMO_LOTE = 10_000
+MAXIMO_POR_PAGINA = 100
+MAXIMO_CABECALHO = 16 * 1024
+MAXIMO_CORPO = 1024 * 1024
+# /precos?q=: termos com até tantos resultados estimados são
+# materializados na requisição para a interseção com a faixa
+MAXIMO_INTERSECAO = 65_536
+# Requisições canceladas após tantos segundos (ou ao fechar a
+# conexão), conferido a cada INTERVALO_CANCELAMENTO segundos
+TEMPO_MAXIMO = 30.0
+INTERVALO_CANCELAMENTO = 0.05
+# Rotas que aceitam outros métodos além de GET
+METODOS = {"/lote": ("GET", "POST"), "/atualizar": ("POST",)}
+
+MENSAGENS_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class ErroRequisicao(Exception):
+    """
+    Erro de uma requisição, respondido com o status informado.
+    """
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES
+# ===========================================================
+
+
+def _inteiro(parametros, nome, padrao=None, minimo=None, maximo=None):
+    """
+    Lê um parâmetro inteiro da query string, validando a faixa.
+    """
+
+    valores = parametros.get(nome)
+    if not valores:
+        if padrao is None:
+            raise ErroRequisicao(400, f"parâmetro '{nome}' obrigatório")
+        return padrao
+    try:
+        valor = int(valores[0])
+    except ValueError:
+        raise ErroRequisicao(400, f"parâmetro '{nome}' deve ser inteiro") from None
+    if (minimo is not None and valor < minimo) or (maximo is not None and valor > maximo):
+        raise ErroRequisicao(400, f"parâmetro '{nome}' fora da faixa [{minimo}, {maximo}]")
+    return valor
+
+
+def _decimal(parametros, nome):
+    """
+    Lê um parâmetro numérico opcional da query string (None se ausente).
+    """
+
+    valores = parametros.get(nome)
+    if not valores or not valores[0]:
+        return None
+    try:
+        valor = float(valores[0])
+    except ValueError:
+        raise ErroRequisicao(400, f"parâmetro '{nome}' deve ser numérico") from None
+    if valor != valor:  # NaN
+        raise ErroRequisicao(400, f"parâmetro '{nome}' deve ser numérico")
+    return valor
+
+
+def _produto_json(produto):
+    """
+    Converte uma tupla (nome, preço, código) em dicionário.
+    """
+
+    if produto is None:
+        return None
+    nome, preco, codigo = produto
+    return {"nome": nome, "preco": preco, "codigo": codigo}
+
+
+def _resposta(status, dados, manter_conexao):
+    """
+    Monta os bytes de uma resposta HTTP com corpo JSON (ou texto,
+    quando `dados` é uma string).
+    """
+
+    if isinstance(dados, str):
+        corpo, tipo = dados.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        corpo, tipo = json.dumps(dados, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+    cabecalho = (
+        f"HTTP/1.1 {status} {MENSAGENS_STATUS[status]}\r\n"
+        f"Content-Type: {tipo}\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n"
+    )
+    return cabecalho.encode("latin-1") + corpo
+
+
+# ===========================================================
+# CLASSE: ServidorBusca
+# ===========================================================
+
+
+class ServidorBusca:
+    """
+    Rotas de busca sobre um conjunto de dados compartilhado.
+
+    Atributos:
+        produtos: ProductStore ou DatabaseBackend (busca por código)
+        indice: IndiceTextual ou DatabaseBackend (busca por nome)
+        precos: IndicePrecos ou DatabaseBackend (faixa de preços),
+            ou None se a rota /precos não estiver disponível
+        cache (CacheLRU): cursores materializados das buscas e
+            totais dos termos grandes demais para guardar
+        caminho_db (str | None): banco de origem dos dados em
+            memória (rota /atualizar), ou None
+        requisicoes (dict): requisições atendidas por rota
+    """
+
+    def __init__(self, produtos, indice, backend="memoria", trabalhadores=TRABALHADORES, cache=None, precos=None,
+                 caminho_db=None, tempo_maximo=TEMPO_MAXIMO):
+        """
+        Parâmetros:
+            produtos, indice, precos: fontes de dados já carregadas
+            backend (str): nome do backend, informado em /saude
+            trabalhadores (int): threads que executam as buscas
+                (0 = no próprio laço de eventos, uma por vez)
+            cache (CacheLRU | None): cache da busca por nome
+            caminho_db (str | None): banco de onde os dados em
+                memória foram carregados (habilita /atualizar)
+            tempo_maximo (float): segundos até uma requisição ser
+                cancelada
+        """
+
+        self.produtos = produtos
+        self.indice = indice
+        self.precos = precos
+        self.caminho_db = caminho_db
+        self.tempo_maximo = tempo_maximo
+        self.backend = backend
+        self.cache = cache if cache is not None else CacheLRU(maximo_itens=1024, maximo_bytes=256 * 1024 * 1024)
+        self.requisicoes = {}
+        self._executor = None
+        if trabalhadores > 0:
+            self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="servidor")
+        # Contagens fora das requisições, uma por vez e uma por chave
+        self._contagens = ThreadPoolExecutor(max_workers=1, thread_name_prefix="contagem")
+        self._contando = set()
+        self._trava_contagens = threading.Lock()
+        # Leituras dos dados x aplicação de alterações (exclusiva)
+        self._dados = threading.Condition()
+        self._leituras = 0
+        self._aplicando = False
+        self._trava_atualizacao = threading.Lock()
+        self._rotas = {
+            "/produto": self.rota_produto,
+            "/lote": self.rota_lote,
+            "/busca": self.rota_busca,
+            "/precos": self.rota_precos,
+            "/atualizar": self.rota_atualizar,
+            "/saude": self.rota_saude,
+            "/estatisticas": self.rota_estatisticas,
+            "/metricas": self.rota_metricas,
+        }
+
+    # -------------------------------------------------------
+    # Acesso aos dados compartilhados
+    # -------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _leitura(self):
+        """
+        Envolve uma leitura dos dados: espera uma aplicação de
+        alterações em andamento e a impede de começar até o fim.
+        """
+
+        with self._dados:
+            while self._aplicando:
+                self._dados.wait()
+            self._leituras += 1
+        try:
+            yield
+        finally:
+            with self._dados:
+                self._leituras -= 1
+                if not self._leituras:
+                    self._dados.notify_all()
+
+    @contextlib.contextmanager
+    def _escrita(self):
+        """
+        Envolve a aplicação de alterações: novas leituras esperam
+        e as em andamento terminam antes de ela começar.
+        """
+
+        with self._dados:
+            self._aplicando = True
+            while self._leituras:
+                self._dados.wait()
+        try:
+            yield
+        finally:
+            with self._dados:
+                self._aplicando = False
+                self._dados.notify_all()
+
+    def _executar(self, rota, parametros, corpo, cancelado):
+        if cancelado.is_set():
+            raise BuscaCancelada  # cancelada enquanto esperava no pool
+        if rota == self.rota_atualizar:
+            return rota(parametros, corpo, cancelado)
+        with self._leitura():
+            return rota(parametros, corpo, cancelado)
+
+    # -------------------------------------------------------
+    # Rotas (executadas no pool de threads)
+    # -------------------------------------------------------
+
+    def rota_produto(self, parametros, corpo, cancelado):
+        """
+        Busca por código com o motor escolhido (binária ou linear).
+        """
+
+        codigo = _inteiro(parametros, "codigo")
+        motor = parametros.get("motor", ["binaria"])[0]
+        if motor not in ("binaria", "linear"):
+            raise ErroRequisicao(400, "motor deve ser 'binaria' ou 'linear'")
+
+        inicio = time.perf_counter_ns()
+        if motor == "binaria":
+            encontrado, passos = self.produtos.busca_binaria(codigo)
+        else:
+            encontrado, passos = self.produtos.busca_linear(codigo, cancelado)
+            if cancelado.is_set():
+                raise BuscaCancelada
+        produto = self.produtos.produto(self.produtos.localizar(codigo)) if encontrado else None
+        tempo_ms = (time.perf_counter_ns() - inicio) / 1_000_000
+        return {"codigo": codigo, "motor": motor, "encontrado": encontrado,
+                "produto": _produto_json(produto), "passos": passos, "tempo_ms": tempo_ms}
+
+    def rota_lote(self, parametros, corpo, cancelado):
+        """
+        Busca em lote; os códigos vêm da query string ou do corpo JSON.
+        """
+
+        try:
+            if corpo:
+                codigos = [int(codigo) for codigo in json.loads(corpo)["codigos"]]
+            else:
+                codigos = [int(codigo) for codigo in parametros.get("codigos", [""])[0].split(",") if codigo]
+        except (ValueError, TypeError, KeyError):
+            raise ErroRequisicao(400, "informe 'codigos' como lista de inteiros") from None
+        if not codigos or len(codigos) > MAXIMO_LOTE:
+            raise ErroRequisicao(400, f"informe de 1 a {MAXIMO_LOTE} códigos")
+
+        inicio = time.perf_counter_ns()
+        produtos, passos = self.produtos.buscar_lote(codigos)
+        tempo_ms = (time.perf_counter_ns() - inicio) / 1_000_000
+        return {"quantidade": len(codigos), "encontrados": sum(p is not None for p in produtos),
+                "produtos": [_produto_json(produto) for produto in produtos],
+                "passos": passos, "tempo_ms": tempo_ms}
+
+    def _cursor_cache(self, chave, criar):
+        """
+        Retorna o cursor da chave: o do cache ou, na falta dele, um
+        cursor novo criado por `criar`.
+
+        O cursor novo não é percorrido aqui: se as suas posições
+        ainda não estão prontas, elas são contadas em segundo plano
+        (`_contar`) e, dali em diante, a chave sai do cache.
+
+        Retorna:
+            tuple(CursorBusca, bool): cursor e True se veio do cache
+        """
+
+        geracao = self.cache.geracao
+        cursor = self.cache.obter(chave)
+        if cursor is not None:
+            return cursor, True
+        cursor = criar()
+        if cursor.posicoes is not None:
+            self.cache.guardar(chave, cursor, cursor.tamanho_aproximado(), geracao)
+            return cursor, False
+
+        total = self.cache.obter(("total", chave))
+        if total is not None:
+            cursor.total_conhecido = total
+        else:
+            self._contar(chave, criar, geracao)
+        return cursor, False
+
+    def _contar(self, chave, criar, geracao):
+        """
+        Materializa, fora da requisição, as posições da chave e as
+        guarda no cache; se não couberem nele, guarda só o total.
+        """
+
+        with self._trava_contagens:
+            if chave in self._contando:
+                return
+            self._contando.add(chave)
+
+        def contar_chave():
+            try:
+                with self._leitura():
+                    cursor = criar()
+                    total = cursor.materializar(maximo_bytes=self.cache.maximo_bytes)
+                if cursor.posicoes is not None:
+                    self.cache.guardar(chave, cursor, cursor.tamanho_aproximado(), geracao)
+                else:
+                    self.cache.guardar(("total", chave), total, 64, geracao)
+            finally:
+                with self._trava_contagens:
+                    self._contando.discard(chave)
+
+        self._contagens.submit(contar_chave)
+
+    def _cursor_nome(self, termo):
+        return self._cursor_cache(chave_textual(termo), lambda: self.indice.cursor(termo))
+
+    def rota_busca(self, parametros, corpo, cancelado):
+        """
+        Busca por nome paginada ("total" é null enquanto o termo é contado).
+        """
+
+        termo = parametros.get("q", [""])[0].strip().lower()
+        if not termo:
+            raise ErroRequisicao(400, "parâmetro 'q' obrigatório")
+        pagina = _inteiro(parametros, "pagina", 0, minimo=0)
+        tamanho = _inteiro(parametros, "tamanho", 10, minimo=1, maximo=MAXIMO_POR_PAGINA)
+
+        inicio = time.perf_counter_ns()
+        cursor, em_cache = self._cursor_nome(termo)
+        produtos, ha_mais = cursor.pagina(pagina, tamanho, cancelado)
+        tempo_ms = (time.perf_counter_ns() - inicio) / 1_000_000
+        return {"termo": termo, "pagina": pagina, "tamanho": tamanho, "total": cursor.total_conhecido,
+                "ha_mais": ha_mais, "produtos": [_produto_json(produto) for produto in produtos],
+                "cache": em_cache, "tempo_ms": tempo_ms}
+
+    def rota_precos(self, parametros, corpo, cancelado):
+        """
+        Produtos em uma faixa de preços, ordenados por preço, com
+        filtro opcional por nome.
+        """
+
+        if self.precos is None:
+            raise ErroRequisicao(404, "índice de preços indisponível")
+        minimo, maximo = _decimal(parametros, "min"), _decimal(parametros, "max")
+        termo = parametros.get("q", [""])[0].strip().lower()
+        ordem = parametros.get("ordem", ["crescente"])[0]
+        if ordem not in ("crescente", "decrescente"):
+            raise ErroRequisicao(400, "ordem deve ser 'crescente' ou 'decrescente'")
+        pagina = _inteiro(parametros, "pagina", 0, minimo=0)
+        tamanho = _inteiro(parametros, "tamanho", 10, minimo=1, maximo=MAXIMO_POR_PAGINA)
+
+        inicio = time.perf_counter_ns()
+        decrescente = ordem == "decrescente"
+        if termo:
+            nome, _ = self._cursor_nome(termo)
+            estimar = getattr(self.indice, "estimar", None)
+            quantidade = len(nome.posicoes) if nome.posicoes is not None else estimar and estimar(termo)
+            if estimar is None or quantidade <= MAXIMO_INTERSECAO:
+                # Poucos resultados (ou backend em disco, sem filtro por nome): interseção com a faixa
+                def criar():
+                    nome.materializar()
+                    return self.precos.cursor_precos(minimo, maximo, nome.posicoes, decrescente)
+            else:
+                # Termo amplo: a faixa, em ordem de preço, conferindo o nome de cada linha
+                def criar():
+                    faixa = self.precos.cursor_precos(minimo, maximo, decrescente=decrescente).posicoes
+                    return CursorBusca(self.produtos, lambda: self.indice.filtrar(faixa, termo))
+            cursor, em_cache = self._cursor_cache(("precos", chave_textual(termo), minimo, maximo, decrescente), criar)
+        elif self.backend == "memoria":
+            # Fatia do índice: não há o que guardar no cache
+            cursor, em_cache = self.precos.cursor_precos(minimo, maximo, decrescente=decrescente), False
+        else:
+            cursor, em_cache = self._cursor_cache(
+                ("precos", "", minimo, maximo, decrescente),
+                lambda: self.precos.cursor_precos(minimo, maximo, decrescente=decrescente))
+        produtos, ha_mais = cursor.pagina(pagina, tamanho, cancelado)
+        tempo_ms = (time.perf_counter_ns() - inicio) / 1_000_000
+        return {"min": minimo, "max": maximo, "termo": termo, "ordem": ordem, "pagina": pagina,
+                "tamanho": tamanho, "total": cursor.total_conhecido, "ha_mais": ha_mais,
+                "produtos": [_produto_json(produto) for produto in produtos],
+                "cache": em_cache, "tempo_ms": tempo_ms}
+
+    def rota_atualizar(self, parametros, corpo, cancelado):
+        """
+        Aplica as alterações do banco aos dados em memória e aos
+        índices de nomes e de preços, e invalida o cache.
+        """
+
+        if self.caminho_db is None or getattr(self.produtos, "versao", None) is None:
+            raise ErroRequisicao(404, "atualização incremental indisponível "
+                                      "(backend em disco ou banco sem rastreamento)")
+        with self._trava_atualizacao:
+            inicio = time.perf_counter_ns()
+            try:
+                alteracoes = ler_alteracoes(self.produtos, self.caminho_db)
+            except RecargaNecessaria as erro:
+                raise ErroRequisicao(409, f"reinicie o servidor para recarregar os dados ({erro})") from None
+            with self._escrita():
+                contagem = aplicar_alteracoes(self.produtos, alteracoes, self.indice, self.precos)
+                self.cache.invalidar()
+            podar_alteracoes(self.caminho_db)
+        contagem["tempo_ms"] = (time.perf_counter_ns() - inicio) / 1_000_000
+        return contagem
+
+    def rota_saude(self, parametros, corpo, cancelado):
+        """
+        Informa o backend e a quantidade de produtos.
+        """
+
+        return {"status": "ok", "backend": self.backend, "produtos": len(self.produtos)}
+
+    def rota_estatisticas(self, parametros, corpo, cancelado):
+        """
+        Informa as requisições por rota e os contadores do cache.
+        """
+
+        return {"requisicoes": dict(self.requisicoes), "cache": self.cache.estatisticas()}
+
+    def rota_metricas(self, parametros, corpo, cancelado):
+        """
+        Exporta as métricas em JSON ou no formato do Prometheus.
+        """
+
+        formato = parametros.get("formato", ["json"])[0]
+        if formato == "prometheus":
+            return exportar_prometheus()
+        if formato != "json":
+            raise ErroRequisicao(400, "formato deve ser 'json' ou 'prometheus'")
+        return exportar_json()
+
+    # -------------------------------------------------------
+    # Protocolo HTTP (laço de eventos)
+    # -------------------------------------------------------
+
+    async def responder(self, metodo, alvo, corpo, desconectado=None):
+        """
+        Despacha uma requisição para a rota.
+
+        Parâmetros:
+            metodo (str), alvo (str), corpo (bytes): requisição
+            desconectado (callable | None): retorna True quando o
+                cliente fechou a conexão (a busca é cancelada)
+
+        Retorna:
+            tuple(int, dict): status HTTP e corpo da resposta
+        """
+
+        inicio = time.perf_counter_ns()
+        url = urlsplit(alvo)
+        rota = self._rotas.get(url.path)
+        try:
+            if rota is None:
+                raise ErroRequisicao(404, f"rota desconhecida: {url.path}")
+            if metodo not in METODOS.get(url.path, ("GET",)):
+                raise ErroRequisicao(405, f"método {metodo} não suportado em {url.path}")
+            parametros = parse_qs(url.query)
+            cancelado = threading.Event()
+            with span("http_requisicao", rota=url.path):
+                if self._executor is None:
+                    dados = self._executar(rota, parametros, corpo, cancelado)
+                else:
+                    dados = await self._aguardar(asyncio.get_running_loop().run_in_executor(
+                        self._executor, self._executar, rota, parametros, corpo, cancelado), cancelado, desconectado)
+            status = 200
+        except ErroRequisicao as erro:
+            status, dados = erro.status, {"erro": str(erro)}
+        except BuscaCancelada:
+            status, dados = 503, {"erro": f"requisição cancelada (conexão encerrada "
+                                          f"ou mais de {self.tempo_maximo} s)"}
+        except Exception as erro:
+            status, dados = 500, {"erro": f"{type(erro).__name__}: {erro}"}
+
+        if rota is not None:
+            self.requisicoes[url.path] = self.requisicoes.get(url.path, 0) + 1
+        contar("http_requisicoes", rota=url.path if rota is not None else "desconhecida", status=status)
+        if isinstance(dados, dict):
+            dados["tempo_total_ms"] = (time.perf_counter_ns() - inicio) / 1_000_000
+        return status, dados
+
+    async def _aguardar(self, futuro, cancelado, desconectado):
+        """
+        Aguarda a rota no pool, sinalizando `cancelado` se o cliente
+        desconectar ou o tempo máximo passar; a rota cancelada
+        termina antes da resposta (a thread fica livre).
+        """
+
+        prazo = time.monotonic() + self.tempo_maximo
+        while True:
+            feitos, _ = await asyncio.wait({futuro}, timeout=INTERVALO_CANCELAMENTO)
+            if feitos:
+                return futuro.result()
+            if time.monotonic() > prazo or (desconectado is not None and desconectado()):
+                cancelado.set()
+                return await futuro
+
+    async def atender(self, leitor, escritor):
+        """
+        Atende uma conexão, requisição após requisição (keep-alive).
+        """
+
+        try:
+            while True:
+                try:
+                    cabecalho = await leitor.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # conexão encerrada pelo cliente
+                except asyncio.LimitOverrunError:
+                    escritor.write(_resposta(400, {"erro": "cabeçalho muito grande"}, False))
+                    break
+
+                linhas = cabecalho.decode("latin-1").split("\r\n")
+                try:
+                    metodo, alvo, versao = linhas[0].split(" ")
+                except ValueError:
+                    escritor.write(_resposta(400, {"erro": "linha de requisição inválida"}, False))
+                    break
+                campos = {}
+                for linha in linhas[1:]:
+                    nome, _, valor = linha.partition(":")
+                    campos[nome.strip().lower()] = valor.strip()
+
+                conexao = campos.get("connection", "").lower()
+                manter = conexao == "keep-alive" if versao == "HTTP/1.0" else conexao != "close"
+                try:
+                    tamanho_corpo = int(campos.get("content-length", 0))
+                except ValueError:
+                    tamanho_corpo = -1
+                if not 0 <= tamanho_corpo <= MAXIMO_CORPO:
+                    escritor.write(_resposta(413, {"erro": "corpo inválido ou muito grande"}, False))
+                    break
+                corpo = await leitor.readexactly(tamanho_corpo) if tamanho_corpo else b""
+
+                status, dados = await self.responder(metodo, alvo, corpo, leitor.at_eof)
+                escritor.write(_resposta(status, dados, manter))
+                await escritor.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host=HOST_PADRAO, porta=PORTA_PADRAO, pronto=None):
+        """
+        Inicia o servidor e atende até ser cancelado.
+
+        Parâmetros:
+            host (str), porta (int): endereço de escuta (porta 0 =
+                porta livre escolhida pelo sistema)
+            pronto (callable | None): chamado com a porta efetiva
+                quando o servidor começa a aceitar conexões
+        """
+
+        servidor = await asyncio.start_server(self.atender, host, porta, limit=MAXIMO_CABECALHO)
+        porta = servidor.sockets[0].getsockname()[1]
+        print(f"🌐 Servidor ouvindo em http://{host}:{porta} ({self.backend}, {len(self.produtos):,} produtos)")
+        if pronto is not None:
+            pronto(porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+    def fechar(self):
+        """
+        Encerra os pools de threads.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._contagens.shutdown(wait=False, cancel_futures=True)
+
+
+# ===========================================================
+# EXECUÇÃO PRINCIPAL
+# ===========================================================
+
+
+def _servir_ate_interromper(servidor, host, porta):
+    try:
+        asyncio.run(servidor.servir(host, porta))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.servidor",
+                                     description="Servidor HTTP/JSON das buscas, sem interface gráfica.")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--backend", choices=["memoria", "banco"], default="memoria",
+                        help="memoria: carrega os produtos; banco: consulta o SQLite")
+    parser.add_argument("--banco", default=DB_FILE)
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES,
+                        help="threads que executam as buscas (0 = no laço de eventos)")
+    parser.add_argument("--tempo-maximo", type=float, default=TEMPO_MAXIMO,
+                        help="segundos até uma requisição ser cancelada")
+    parser.add_argument("--metricas", action="store_true", help="coleta métricas (rota /metricas)")
+    parser.add_argument("--perfil", help="grava um perfil cProfile/tracemalloc ao encerrar "
+                                         "(as rotas passam a rodar no laço de eventos)")
+    args = parser.parse_args(argv)
+    if args.metricas:
+        ativar()
+    if args.perfil:
+        # O cProfile mede apenas a thread em que foi ativado
+        args.trabalhadores = 0
+
+    caminho_db = None
+    if args.backend == "banco":
+        produtos = indice = precos = DatabaseBackend(args.banco)
+    else:
+        produtos = carregar_dados(args.banco)
+        indice = IndiceTextual(produtos)
+        precos = IndicePrecos(produtos)
+        caminho_db = args.banco
+
+    servidor = ServidorBusca(produtos, indice, args.backend, args.trabalhadores, precos=precos, caminho_db=caminho_db,
+                             tempo_maximo=args.tempo_maximo)
+    try:
+        if args.perfil:
+            with capturar_perfil(args.perfil):
+                _servir_ate_interromper(servidor, args.host, args.porta)
+        else:
+            _servir_ate_interromper(servidor, args.host, args.porta)
+    finally:
+        servidor.fechar()
+        if args.backend == "banco":
+            produtos.fechar()
+
+
+if __name__ == "__main__":
+    main()
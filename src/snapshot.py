@@ -0,0 +1,204 @@
+"""
+===========================================================
+SNAPSHOT BINÁRIO DO BANCO DE PRODUTOS
+
+Descrição:
+    Módulo que grava e abre um "snapshot" binário do
+    `ProductStore`, salvo ao lado de `db/ecommerce.db`
+    (arquivo `db/ecommerce.snap`).
+
+    Na primeira execução os dados são lidos do SQLite e o
+    snapshot é gravado. Nas execuções seguintes o arquivo é
+    aberto com `mmap`: as colunas viram visões (memoryview)
+    diretamente sobre as páginas do arquivo, sem cópia, e o
+    cache de páginas do sistema operacional é compartilhado
+    entre processos. A partida a quente deixa de depender da
+    quantidade de linhas.
+
+Formato do arquivo (versão 2, little-endian):
+    - Cabeçalho (64 bytes): assinatura, versão, total de
+      linhas, mtime_ns e tamanho do banco, contador de
+      alterações do SQLite, tamanho do bloco de nomes e
+      quantidade de nomes distintos (d)
+    - Códigos ordenados: int64 × n
+    - Preços: float64 × n
+    - Identificador do nome de cada linha: int32 × n (+
+      preenchimento até múltiplo de 8 bytes)
+    - Bloco de nomes distintos: UTF-8 separados pelo byte NUL (+
+      preenchimento até múltiplo de 8 bytes)
+    - Deslocamentos dos nomes distintos: int64 × (d + 1)
+
+    Os nomes seguem a codificação por dicionário do
+    `ProductStore` (`NomesCodificados`): apenas a tabela de
+    nomes distintos é decodificada na abertura, e a coluna de
+    identificadores é usada direto do arquivo. Snapshots da
+    versão 1 (um nome por linha) são ignorados e regravados.
+
+Invalidação:
+    O snapshot só é usado se o mtime, o tamanho e o contador
+    de alterações (file change counter do cabeçalho SQLite)
+    do banco forem iguais aos registrados no cabeçalho.
+
+===========================================================
+"""
+
+
+import mmap
+import os
+import struct
+from array import array
+from src.armazenamento import NomesCodificados, ProductStore
+
+
+# ===========================================================
+# CONFIGURAÇÕES DO FORMATO
+# ===========================================================
+
+
+ASSINATURA = b"ECOMSNAP"
+VERSAO = 2
+CABECALHO = struct.Struct("<8sIIqqqqqq")
+
+
+# ===========================================================
+# FUNÇÕES AUXILIARES
+# ===========================================================
+
+
+def caminho_snapshot(caminho_db):
+    """
+    Retorna o caminho do snapshot associado a um banco.
+    """
+
+    return os.path.splitext(caminho_db)[0] + ".snap"
+
+
+def assinatura_banco(caminho_db):
+    """
+    Retorna (mtime_ns, tamanho, contador_alteracoes) do banco.
+
+    O contador fica nos bytes 24–27 do cabeçalho SQLite e é
+    incrementado a cada transação de escrita.
+    """
+
+    info = os.stat(caminho_db)
+    with open(caminho_db, "rb") as arquivo:
+        cabecalho = arquivo.read(100)
+    contador = struct.unpack(">I", cabecalho[24:28])[0] if len(cabecalho) >= 28 else 0
+    return info.st_mtime_ns, info.st_size, contador
+
+
+# ===========================================================
+# FUNÇÃO: salvar_snapshot
+# ===========================================================
+
+
+def salvar_snapshot(produtos, caminho_db):
+    """
+    Grava o snapshot binário de um ProductStore.
+
+    O arquivo é escrito em um temporário e renomeado ao final,
+    de modo que leitores nunca enxergam um snapshot parcial.
+
+    Parâmetros:
+        produtos (ProductStore): produtos ordenados por código
+        caminho_db (str): banco de origem (define o caminho e a
+            assinatura de invalidação)
+    """
+
+    produtos = produtos.compactado()
+    destino = caminho_snapshot(caminho_db)
+    temporario = destino + ".tmp"
+    mtime_ns, tamanho_db, contador = assinatura_banco(caminho_db)
+    total = len(produtos)
+
+    distintos = [nome.encode("utf-8") for nome in produtos.nomes.distintos]
+    deslocamentos = array("q", [0])
+    for nome in distintos:
+        deslocamentos.append(deslocamentos[-1] + len(nome) + 1)
+    bloco = b"\0".join(distintos)
+    tamanho_bloco = len(bloco)
+
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(b"\0" * CABECALHO.size)
+        arquivo.write(produtos.codigos.tobytes())
+        arquivo.write(produtos.precos.tobytes())
+        arquivo.write(produtos.nomes.identificadores.tobytes())
+        arquivo.write(b"\0" * (-4 * total % 8))
+        arquivo.write(bloco)
+        arquivo.write(b"\0" * (-tamanho_bloco % 8))
+        arquivo.write(deslocamentos.tobytes())
+
+        arquivo.seek(0)
+        arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO, 0, total, mtime_ns, tamanho_db,
+                                     contador, tamanho_bloco, len(distintos)))
+
+    os.replace(temporario, destino)
+
+
+# ===========================================================
+# FUNÇÃO: abrir_snapshot
+# ===========================================================
+
+
+def abrir_snapshot(caminho_db):
+    """
+    Abre o snapshot de um banco via mmap, se ele for válido.
+
+    Parâmetros:
+        caminho_db (str): banco de origem
+
+    Retorna:
+        ProductStore | None: produtos com colunas mapeadas em
+            memória, ou None se o snapshot não existir, estiver
+            corrompido ou desatualizado em relação ao banco
+    """
+
+    caminho = caminho_snapshot(caminho_db)
+    if not os.path.exists(caminho) or not os.path.exists(caminho_db):
+        return None
+
+    with open(caminho, "rb") as arquivo:
+        if os.fstat(arquivo.fileno()).st_size < CABECALHO.size:
+            return None
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    assinatura, versao, _, total, mtime_ns, tamanho_db, contador, tamanho_bloco, quantidade_distintos = \
+        CABECALHO.unpack_from(mapa, 0)
+    if assinatura != ASSINATURA or versao != VERSAO:
+        mapa.close()
+        return None
+    if (mtime_ns, tamanho_db, contador) != assinatura_banco(caminho_db):
+        mapa.close()
+        return None
+
+    inicio_codigos = CABECALHO.size
+    inicio_precos = inicio_codigos + 8 * total
+    inicio_identificadores = inicio_precos + 8 * total
+    inicio_bloco = inicio_identificadores + 4 * total + (-4 * total % 8)
+    inicio_deslocamentos = inicio_bloco + tamanho_bloco + (-tamanho_bloco % 8)
+    fim = inicio_deslocamentos + 8 * (quantidade_distintos + 1)
+    if len(mapa) != fim:
+        mapa.close()
+        return None
+
+    visao = memoryview(mapa)
+    codigos = visao[inicio_codigos:inicio_precos].cast("q")
+    precos = visao[inicio_precos:inicio_identificadores].cast("d")
+    identificadores = visao[inicio_identificadores:inicio_identificadores + 4 * total].cast("i")
+    texto = str(visao[inicio_bloco:inicio_bloco + tamanho_bloco], "utf-8")
+
+    # Uma decodificação e uma conversão para minúsculas para a
+    # tabela inteira; os deslocamentos só são usados se algum
+    # nome contiver o próprio separador
+    distintos = texto.split("\0") if quantidade_distintos else []
+    minusculos = texto.lower().split("\0") if quantidade_distintos else []
+    if len(distintos) != quantidade_distintos or len(minusculos) != quantidade_distintos:
+        bloco = bytes(visao[inicio_bloco:inicio_bloco + tamanho_bloco])
+        deslocamentos = visao[inicio_deslocamentos:fim].cast("q").tolist()
+        distintos = [bloco[de:ate - 1].decode("utf-8") for de, ate in zip(deslocamentos, deslocamentos[1:])]
+        minusculos = None
+
+    produtos = ProductStore(codigos, precos, NomesCodificados(distintos, identificadores, minusculos))
+    produtos.mapa = mapa
+    return produtos
@@ -0,0 +1,140 @@
+"""
+===========================================================
+EXECUÇÃO DE BUSCAS EM SEGUNDO PLANO PARA A INTERFACE
+
+Descrição:
+    Módulo que tira as buscas pesadas da thread principal do
+    Tkinter. As funções são executadas em um pool de threads e
+    seus resultados voltam para a thread da interface por uma
+    fila, lida periodicamente com `janela.after` (o Tkinter não
+    deve ser acessado a partir de outras threads).
+
+    Cada busca pertence a um "canal" (ex.: "codigo", "texto").
+    Uma nova submissão em um canal substitui a anterior:
+        - se a anterior ainda não começou, ela é cancelada;
+        - se já está em execução, seu evento de cancelamento é
+          sinalizado (para funções que o verificam) e o seu
+          resultado é descartado ao chegar.
+
+===========================================================
+"""
+
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ===========================================================
+# CLASSE: ExecutorInterface
+# ===========================================================
+
+
+class ExecutorInterface:
+    """
+    Pool de threads com entrega de resultados na thread do Tkinter.
+    """
+
+    def __init__(self, janela, trabalhadores=2, intervalo_ms=16):
+        """
+        Parâmetros:
+            janela: janela Tk (usada para agendar a leitura da fila)
+            trabalhadores (int): número de threads do pool
+            intervalo_ms (int): intervalo de leitura da fila
+                (16 ms ≈ 60 quadros por segundo)
+        """
+
+        self._janela = janela
+        self._intervalo_ms = intervalo_ms
+        self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="busca")
+        self._fila = queue.SimpleQueue()
+        self._atuais = {}  # canal -> (geração, future, evento de cancelamento)
+        self._geracao = 0
+        self._janela.after(self._intervalo_ms, self._processar_fila)
+
+    def submeter(self, canal, funcao, ao_concluir, ao_falhar=None):
+        """
+        Executa `funcao(cancelado)` em segundo plano.
+
+        Parâmetros:
+            canal (str): canal da busca; substitui a busca anterior
+                do mesmo canal
+            funcao (callable): recebe um threading.Event sinalizado
+                quando a busca for substituída
+            ao_concluir (callable): chamada na thread da interface
+                com o resultado, apenas se a busca não foi substituída
+            ao_falhar (callable | None): chamada na thread da
+                interface com a exceção lançada pela função
+        """
+
+        self.cancelar(canal)
+        self._geracao += 1
+        cancelado = threading.Event()
+        futuro = self._executor.submit(self._executar, canal, self._geracao, funcao,
+                                       cancelado, ao_concluir, ao_falhar)
+        self._atuais[canal] = (self._geracao, futuro, cancelado)
+
+    def cancelar(self, canal):
+        """
+        Cancela a busca em andamento (ou pendente) de um canal.
+
+        Retorna:
+            Future | None: a busca cancelada (uma busca já em
+                execução termina ao conferir o evento; aguardar o
+                Future garante que ela não lê mais os dados)
+        """
+
+        atual = self._atuais.pop(canal, None)
+        if atual is None:
+            return None
+        _, futuro, cancelado = atual
+        cancelado.set()
+        futuro.cancel()
+        return futuro
+
+    def ocupado(self, canal):
+        """
+        Retorna True se existe uma busca ativa no canal.
+        """
+
+        return canal in self._atuais
+
+    def encerrar(self):
+        """
+        Cancela as buscas pendentes e encerra o pool.
+        """
+
+        for canal in list(self._atuais):
+            self.cancelar(canal)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _executar(self, canal, geracao, funcao, cancelado, ao_concluir, ao_falhar):
+        """
+        Executa a função no pool e enfileira o resultado.
+        """
+
+        try:
+            resultado = funcao(cancelado)
+        except Exception as erro:  # entregue à interface via ao_falhar
+            self._fila.put((canal, geracao, ao_falhar, erro))
+        else:
+            self._fila.put((canal, geracao, ao_concluir, resultado))
+
+    def _processar_fila(self):
+        """
+        Entrega os resultados prontos na thread da interface.
+        """
+
+        try:
+            while True:
+                canal, geracao, retorno, valor = self._fila.get_nowait()
+                atual = self._atuais.get(canal)
+                if atual is None or atual[0] != geracao:
+                    continue  # busca substituída: resultado descartado
+                del self._atuais[canal]
+                if retorno is not None:
+                    retorno(valor)
+        except queue.Empty:
+            pass
+        finally:
+            self._janela.after(self._intervalo_ms, self._processar_fila)
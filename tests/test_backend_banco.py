@@ -0,0 +1,120 @@
+"""
+===========================================================
+TESTES DO BACKEND EM DISCO
+
+Descrição:
+    Confere o `DatabaseBackend` contra a semântica da busca em
+    memória sobre um banco pequeno, criado em um diretório
+    temporário.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from src.backend_banco import DatabaseBackend, preparar_banco
+
+
+PRODUTOS = [
+    (1, "Fone de Ouvido Tech X100", 150.0, 10_000_003),
+    (2, "Fone de Ouvido Prime X200", 90.5, 10_000_001),
+    (3, "Mouse Tech X123", 45.0, 10_000_000),
+    (4, "Cadeira Gamer Eco X999", 899.9, 10_000_002),
+    (5, "Teclado Hyper X120", 120.0, 10_000_004),
+]
+
+
+class TesteBackendBanco(unittest.TestCase):
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.caminho_db = os.path.join(diretorio.name, "teste.db")
+        conn = sqlite3.connect(self.caminho_db)
+        conn.execute("CREATE TABLE produtos (id_produto INTEGER PRIMARY KEY, nome_produto TEXT NOT NULL, "
+                     "preco REAL NOT NULL, codigo_busca INTEGER)")
+        conn.executemany("INSERT INTO produtos VALUES (?, ?, ?, ?)", PRODUTOS)
+        conn.commit()
+        conn.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.backend = DatabaseBackend(self.caminho_db)
+        self.addCleanup(self.backend.fechar)
+
+    def buscar(self, termo):
+        return sorted(self.backend.produto(posicao)[2] for posicao in self.backend.cursor(termo))
+
+    def test_busca_por_nome_equivale_a_varredura(self):
+        # "de" tem menos de 3 caracteres: misturado a palavras longas
+        # no índice de trigramas, derrubava o processo (SQLite 3.40)
+        for termo in ["fone de ouvido", "de", "tech x1", "x1", "e o", "ouse", "gamer x9", "x_1", "zzz"]:
+            with self.subTest(termo=termo):
+                palavras = termo.split()
+                esperado = sorted(codigo for _, nome, _, codigo in PRODUTOS
+                                  if all(palavra in nome.lower() for palavra in palavras))
+                self.assertEqual(self.buscar(termo), esperado)
+
+    def test_lotes_de_leitura(self):
+        with mock.patch("src.backend_banco.TAMANHO_LOTE_LEITURA", 2):
+            self.assertEqual(self.buscar("x1"), [10_000_000, 10_000_003, 10_000_004])
+            self.assertEqual(self.backend.busca_linear(10_000_004), (True, 5))
+            crescente = self.backend.cursor_precos(40, 900)
+            self.assertEqual([preco for _, preco, _ in crescente.pagina(1, 2)[0]], [120.0, 150.0])
+            decrescente = self.backend.cursor_precos(40, 900, decrescente=True)
+            self.assertEqual([preco for _, preco, _ in decrescente.pagina(0, 5)[0]], [899.9, 150.0, 120.0, 90.5, 45.0])
+
+    def test_pagina_lida_nao_bloqueia_escritas(self):
+        # o cursor fica vivo (cache de páginas) sem manter leitura aberta
+        cursor = self.backend.cursor("x1")
+        with mock.patch("src.backend_banco.TAMANHO_LOTE_LEITURA", 2):
+            cursor.pagina(0, 1)
+        externo = sqlite3.connect(self.caminho_db, timeout=0)
+        self.addCleanup(externo.close)
+        externo.execute("UPDATE produtos SET preco = 1 WHERE id_produto = 1")
+        externo.commit()
+        self.assertEqual(len(cursor.pagina(1, 1)[0]), 1)
+
+    def test_total_acompanha_o_banco(self):
+        self.assertEqual(len(self.backend), 5)
+        externo = sqlite3.connect(self.caminho_db)
+        externo.execute("INSERT INTO produtos VALUES (6, 'Webcam Next X500', 300.0, 10000005)")
+        externo.commit()
+        externo.close()
+        self.assertEqual(len(self.backend), 6)
+
+    def test_codigos_repetidos(self):
+        caminho_db = os.path.join(os.path.dirname(self.caminho_db), "repetidos.db")
+        conn = sqlite3.connect(caminho_db)
+        conn.execute("CREATE TABLE produtos (id_produto INTEGER PRIMARY KEY, nome_produto TEXT NOT NULL, "
+                     "preco REAL NOT NULL, codigo_busca INTEGER)")
+        conn.executemany("INSERT INTO produtos VALUES (?, ?, ?, ?)",
+                         PRODUTOS + [(6, "Webcam Next X500", 300.0, 10_000_001)])
+        conn.commit()
+        conn.close()
+        with self.assertRaisesRegex(ValueError, "1 códigos de busca repetidos .*10000001"):
+            preparar_banco(caminho_db)
+
+    def test_busca_por_codigo(self):
+        self.assertEqual(self.backend.produto(self.backend.localizar(10_000_002)),
+                         ("Cadeira Gamer Eco X999", 899.9, 10_000_002))
+        self.assertIsNone(self.backend.localizar(1))
+        self.assertEqual(self.backend.busca_linear(10_000_004), (True, 5))
+        self.assertFalse(self.backend.busca_binaria(1)[0])
+        produtos, _ = self.backend.buscar_lote([10_000_001, 1, 10_000_001])
+        self.assertEqual([produto and produto[2] for produto in produtos], [10_000_001, None, 10_000_001])
+
+    def test_faixa_de_precos(self):
+        cursor = self.backend.cursor_precos(50, 200)
+        self.assertEqual([preco for _, preco, _ in cursor.pagina(0, 10)[0]], [90.5, 120.0, 150.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
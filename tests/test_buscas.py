@@ -0,0 +1,99 @@
+"""
+===========================================================
+TESTES DOS ALGORITMOS DE BUSCA
+
+Descrição:
+    Confere os motores registrados em `MOTORES` e a busca em
+    lote (`buscar_lote`, com e sem NumPy) contra a pertinência
+    em listas ordenadas de códigos.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import random
+import threading
+import unittest
+from array import array
+from src import buscas
+from src.armazenamento import ProductStore
+from src.buscas import MOTORES, busca_linear, buscar_lote, obter_motor
+
+
+GERADOR = random.Random(7)
+CODIGOS = sorted(GERADOR.sample(range(10_000_000, 20_000_000), 5_000))
+ALVOS = GERADOR.sample(CODIGOS, 300) + [1, 9_999_999, 20_000_001, CODIGOS[0], CODIGOS[-1], CODIGOS[7]] \
+    + [codigo + 1 for codigo in GERADOR.sample(CODIGOS, 100)]
+
+
+class TesteBuscarLote(unittest.TestCase):
+
+    def conferir(self, resultado, lista, alvos):
+        encontrados, posicoes, _ = resultado
+        presentes = set(lista)
+        self.assertEqual(encontrados, [alvo in presentes for alvo in alvos])
+        self.assertEqual([lista[posicao] if posicao >= 0 else None for posicao in posicoes],
+                         [alvo if alvo in presentes else None for alvo in alvos])
+
+    def test_merge(self):
+        for lista in (CODIGOS, array("q", CODIGOS), [], [CODIGOS[0]]):
+            for alvos in (ALVOS, ALVOS[:1], [], ALVOS + ALVOS):
+                with self.subTest(tamanho=len(lista), alvos=len(alvos)):
+                    self.conferir(buscas._buscar_lote_merge(lista, alvos), lista, alvos)
+
+    @unittest.skipIf(buscas.np is None, "NumPy não instalado")
+    def test_numpy(self):
+        for lista in (CODIGOS, array("q", CODIGOS), memoryview(array("q", CODIGOS))):
+            self.conferir(buscas._buscar_lote_numpy(lista, ALVOS), lista, ALVOS)
+
+    def test_buscar_lote(self):
+        self.conferir(buscar_lote(CODIGOS, iter(ALVOS)), CODIGOS, ALVOS)
+
+    def test_store(self):
+        produtos = ProductStore()
+        produtos.adicionar_lote([(codigo, f"Produto {codigo}", 1.0) for codigo in CODIGOS])
+        resultado, _ = produtos.buscar_lote([CODIGOS[3], 1, CODIGOS[3]])
+        self.assertEqual(resultado, [(f"Produto {CODIGOS[3]}", 1.0, CODIGOS[3]), None,
+                                     (f"Produto {CODIGOS[3]}", 1.0, CODIGOS[3])])
+
+
+class TesteMotores(unittest.TestCase):
+
+    def test_motores_equivalem_a_pertinencia(self):
+        listas = {
+            "aleatória": CODIGOS,
+            "vazia": [],
+            "unitária": [CODIGOS[0]],
+            "uniforme": list(range(10_000_000, 10_050_000, 10)),
+            "assimétrica": sorted({10_000_000 + i * i * i for i in range(2_000)}),  # pior caso da interpolação
+        }
+        for chave in MOTORES:
+            motor = obter_motor(chave)
+            for descricao, lista in listas.items():
+                with self.subTest(motor=chave, lista=descricao):
+                    estrutura = motor.preparar(lista)
+                    presentes = set(lista)
+                    alvos = (lista[::97] + [valor + 1 for valor in lista[::89]]
+                             + [0, 10_000_000, 30_000_000] + lista[-1:])
+                    for alvo in alvos:
+                        encontrado, passos = motor.buscar(estrutura, alvo)
+                        self.assertEqual(encontrado, alvo in presentes, alvo)
+                        self.assertGreaterEqual(passos, 0)
+
+    def test_motor_desconhecido(self):
+        with self.assertRaisesRegex(ValueError, "disponíveis: linear, binaria"):
+            obter_motor("quantica")
+
+    def test_busca_linear_cancelada(self):
+        cancelado = threading.Event()
+        self.assertEqual(busca_linear(CODIGOS, CODIGOS[-1], cancelado), (True, len(CODIGOS)))
+        self.assertEqual(busca_linear(iter(CODIGOS), CODIGOS[-1], cancelado), (True, len(CODIGOS)))
+        cancelado.set()
+        self.assertEqual(busca_linear(CODIGOS, CODIGOS[-1], cancelado), (False, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
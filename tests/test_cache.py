@@ -0,0 +1,73 @@
+"""
+===========================================================
+TESTES DO CACHE LRU
+
+Descrição:
+    Confere as remoções do `CacheLRU` por número de itens, por
+    bytes, por validade (TTL, com relógio controlado pelo teste)
+    e por geração, além da normalização das chaves textuais.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import unittest
+from src.cache import CacheLRU, chave_textual
+
+
+class TesteCacheLRU(unittest.TestCase):
+
+    def test_remove_o_menos_usado(self):
+        cache = CacheLRU(maximo_itens=2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        self.assertEqual(cache.obter("a"), 1)  # "b" passa a ser o menos usado
+        cache.guardar("c", 3)
+        self.assertIsNone(cache.obter("b"))
+        self.assertEqual((cache.obter("a"), cache.obter("c")), (1, 3))
+        self.assertEqual(cache.estatisticas()["remocoes"], 1)
+
+    def test_limite_de_bytes(self):
+        cache = CacheLRU(maximo_itens=10, maximo_bytes=100)
+        cache.guardar("a", "a", 40)
+        cache.guardar("b", "b", 40)
+        cache.guardar("a", "a", 30)  # substituir desconta o tamanho anterior
+        self.assertEqual(cache.estatisticas()["bytes"], 70)
+        cache.guardar("c", "c", 50)  # remove "b", o menos usado
+        self.assertEqual((cache.obter("a"), cache.obter("b"), cache.obter("c")), ("a", None, "c"))
+        self.assertFalse(cache.guardar("d", "d", 101))  # maior que o cache: nem entra
+        self.assertEqual(cache.estatisticas()["bytes"], 80)
+
+    def test_validade(self):
+        agora = [0.0]
+        cache = CacheLRU(ttl=10, relogio=lambda: agora[0])
+        cache.guardar("a", 1)
+        agora[0] = 9.9
+        self.assertEqual(cache.obter("a"), 1)
+        agora[0] = 10.0
+        self.assertIsNone(cache.obter("a"))
+        estatisticas = cache.estatisticas()
+        self.assertEqual((estatisticas["expirados"], estatisticas["itens"], estatisticas["bytes"]), (1, 0, 0))
+
+    def test_geracao(self):
+        cache = CacheLRU()
+        geracao = cache.geracao
+        cache.guardar("a", 1, geracao=geracao)
+        cache.invalidar()
+        self.assertIsNone(cache.obter("a"))
+        self.assertFalse(cache.guardar("b", 2, geracao=geracao))  # calculado antes da invalidação
+        self.assertTrue(cache.guardar("b", 2, geracao=cache.geracao))
+        estatisticas = cache.estatisticas()
+        self.assertEqual((estatisticas["invalidacoes"], estatisticas["itens"]), (1, 1))
+        self.assertAlmostEqual(estatisticas["taxa_acerto"], 0.0)
+
+    def test_chave_textual(self):
+        self.assertEqual(chave_textual("Mouse  Tech mouse"), chave_textual("tech MOUSE"))
+        self.assertEqual(chave_textual(" x1 "), "x1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+===========================================================
+TESTES DO ÍNDICE DE PREÇOS
+
+Descrição:
+    Confere os cursores do `IndicePrecos` (faixas, ordem
+    decrescente e interseção com linhas de uma busca por nome)
+    contra a filtragem e ordenação direta das linhas, e a
+    atualização incremental contra a reconstrução do índice.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import random
+import unittest
+from src.armazenamento import ProductStore
+from src.indice_precos import IndicePrecos
+
+
+GERADOR = random.Random(3)
+PRODUTOS = [(10_000_000 + 2 * i, f"Produto {i}", float(GERADOR.randrange(1, 400)) / 4)  # muitos empates
+            for i in range(3_000)]
+FAIXAS = [(None, None), (10.0, 20.0), (20.0, 10.0), (None, 0.25), (99.75, None), (0.0, 1_000.0),
+          (12.3, 12.4), (50.0, 50.0)]
+
+
+def esperado(produtos, minimo, maximo, linhas=None, decrescente=False):
+    minimo = float("-inf") if minimo is None else minimo
+    maximo = float("inf") if maximo is None else maximo
+    linhas = [linha for linha in range(len(produtos.nomes)) if produtos.nomes[linha]] if linhas is None else linhas
+    resultado = sorted((linha for linha in linhas if minimo <= produtos.precos[linha] <= maximo),
+                       key=lambda linha: (produtos.precos[linha], linha))
+    return resultado[::-1] if decrescente else resultado
+
+
+class TesteIndicePrecos(unittest.TestCase):
+
+    def setUp(self):
+        self.produtos = ProductStore()
+        self.produtos.adicionar_lote(PRODUTOS)
+        self.indice = IndicePrecos(self.produtos)
+
+    def test_faixas(self):
+        for minimo, maximo in FAIXAS:
+            for decrescente in (False, True):
+                with self.subTest(minimo=minimo, maximo=maximo, decrescente=decrescente):
+                    cursor = self.indice.cursor_precos(minimo, maximo, decrescente=decrescente)
+                    self.assertEqual(list(cursor.posicoes),
+                                     esperado(self.produtos, minimo, maximo, decrescente=decrescente))
+        self.assertEqual(self.indice.intervalo(20.0, 10.0)[0], self.indice.intervalo(20.0, 10.0)[1])
+
+    def test_paginas_por_preco(self):
+        cursor = self.indice.cursor_precos(10.0, 20.0)
+        pagina, ha_mais = cursor.pagina(2, 25)
+        self.assertTrue(ha_mais)
+        self.assertEqual(pagina, [self.produtos.produto(linha)
+                                  for linha in esperado(self.produtos, 10.0, 20.0)[50:75]])
+
+    def test_intersecao_com_linhas(self):
+        for quantidade in (0, 5, 200, 2_500):  # dos dois lados da comparação com a faixa
+            linhas = sorted(GERADOR.sample(range(len(PRODUTOS)), quantidade))
+            for minimo, maximo in FAIXAS:
+                with self.subTest(linhas=quantidade, minimo=minimo, maximo=maximo):
+                    for decrescente in (False, True):
+                        cursor = self.indice.cursor_precos(minimo, maximo, linhas, decrescente)
+                        self.assertEqual(list(cursor.posicoes),
+                                         esperado(self.produtos, minimo, maximo, linhas, decrescente))
+
+    def test_atualizar_equivale_a_reconstruir(self):
+        anterior = self.indice.cursor_precos(10.0, 20.0)
+        posicoes_anteriores = list(anterior.posicoes)
+        for rodada in range(5):
+            removidas = GERADOR.sample([linha for linha in range(len(self.produtos.nomes))
+                                        if self.produtos.nomes[linha]], 40)
+            restantes = sorted(set(range(len(PRODUTOS))) - set(removidas))
+            alteradas = [(linha, self.produtos.produto(linha)[2], self.produtos.nomes[linha],
+                          float(GERADOR.randrange(1, 400)) / 4)
+                         for linha in GERADOR.sample(restantes, 60) if self.produtos.nomes[linha]]
+            novas = [(30_000_000 + 100 * rodada + i, f"Novo {rodada}.{i}", float(GERADOR.randrange(1, 400)) / 4)
+                     for i in range(30)]
+
+            precos_antigos = [(linha, self.produtos.precos[linha]) for linha in removidas]
+            precos_antigos += [(linha, self.produtos.precos[linha]) for linha, _, _, preco in alteradas
+                               if self.produtos.precos[linha] != preco]
+            linhas_novas = self.produtos.aplicar_alteracoes(removidas, novas, alteradas)
+            self.indice.atualizar(precos_antigos,
+                                  [(linha, self.produtos.precos[linha]) for linha, _ in precos_antigos[40:]] +
+                                  [(linha, preco) for linha, (_, _, preco) in zip(linhas_novas, novas)])
+
+            with self.subTest(rodada=rodada):
+                reconstruido = IndicePrecos(self.produtos)
+                self.assertEqual(list(self.indice.precos), list(reconstruido.precos))
+                self.assertEqual(list(self.indice.linhas), list(reconstruido.linhas))
+                self.assertEqual(list(self.indice.cursor_precos(10.0, 20.0).posicoes),
+                                 esperado(self.produtos, 10.0, 20.0))
+        self.assertEqual(list(anterior.posicoes), posicoes_anteriores)  # cursores antigos não mudam
+
+    def test_atualizar_sem_alteracoes(self):
+        precos, linhas = self.indice.precos, self.indice.linhas
+        self.indice.atualizar()
+        self.assertIs(self.indice.precos, precos)
+        self.assertIs(self.indice.linhas, linhas)
+
+
+if __name__ == "__main__":
+    unittest.main()
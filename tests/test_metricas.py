@@ -0,0 +1,145 @@
+"""
+===========================================================
+TESTES DAS MÉTRICAS
+
+Descrição:
+    Confere os percentis do `HistogramaLatencia` contra os
+    valores ordenados (erro relativo abaixo de 1%), a mescla de
+    histogramas e as exportações JSON e Prometheus de um
+    `RegistroMetricas` ativo.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import math
+import random
+import unittest
+from src.metricas import FAIXAS_PROMETHEUS, HistogramaLatencia, RegistroMetricas
+
+
+GERADOR = random.Random(11)
+VALORES = [int(GERADOR.lognormvariate(12, 2)) for _ in range(20_000)]  # ~160 µs em ns, cauda longa
+FRACOES = [0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 0.999, 1.0]
+
+
+def percentil_exato(ordenados, fracao):
+    return ordenados[max(1, math.ceil(fracao * len(ordenados))) - 1]
+
+
+def histograma(valores):
+    resultado = HistogramaLatencia()
+    for valor in valores:
+        resultado.registrar(valor)
+    return resultado
+
+
+class TesteHistogramaLatencia(unittest.TestCase):
+
+    def test_percentis_com_erro_abaixo_de_1_por_cento(self):
+        medido, ordenados = histograma(VALORES), sorted(VALORES)
+        for fracao in FRACOES:
+            with self.subTest(fracao=fracao):
+                exato = percentil_exato(ordenados, fracao)
+                self.assertGreaterEqual(medido.percentil(fracao), exato)
+                self.assertLessEqual(medido.percentil(fracao), exato * 1.01)
+        self.assertEqual(medido.percentil(1.0), max(VALORES))
+        self.assertAlmostEqual(medido.media, sum(VALORES) / len(VALORES))
+
+    def test_valores_pequenos_sao_exatos(self):
+        pequenos = list(range(256))
+        medido = histograma(pequenos)
+        for fracao in FRACOES:
+            self.assertEqual(medido.percentil(fracao), percentil_exato(pequenos, fracao))
+        self.assertEqual(medido.contagem_ate(99), 100)
+        self.assertEqual(histograma([-5, 2.9]).percentil(1.0), 2)  # truncados, sem negativos
+
+    def test_vazio(self):
+        vazio = HistogramaLatencia()
+        self.assertEqual((vazio.percentil(0.5), vazio.media, vazio.distribuicao()), (0, 0.0, []))
+
+    def test_mesclar(self):
+        metade = len(VALORES) // 2
+        mesclado = histograma(VALORES[:metade])
+        mesclado.mesclar(histograma(VALORES[metade:]))
+        completo = histograma(VALORES)
+        self.assertEqual((mesclado.contagens, mesclado.total, mesclado.soma, mesclado.maximo),
+                         (completo.contagens, completo.total, completo.soma, completo.maximo))
+
+    def test_contagem_ate_nao_passa_do_limite(self):
+        medido, ordenados = histograma(VALORES), sorted(VALORES)
+        for limite in (1_000, 100_000, 1_000_000, 10 ** 9):
+            with self.subTest(limite=limite):
+                contagem = medido.contagem_ate(limite)
+                exata = sum(1 for valor in ordenados if valor <= limite)
+                self.assertLessEqual(contagem, exata)
+                self.assertGreaterEqual(contagem, sum(1 for valor in ordenados if valor <= limite * 0.99))
+
+    def test_distribuicao(self):
+        pontos = histograma(VALORES).distribuicao()
+        self.assertEqual([fracao for fracao, _, _ in pontos[:3]], [0.0, 1 - 0.5 ** 0.5, 0.5])
+        self.assertEqual(pontos[-1], (1.0, max(VALORES), len(VALORES)))
+        self.assertEqual([valor for _, valor, _ in pontos], sorted(valor for _, valor, _ in pontos))
+
+
+class TesteRegistroMetricas(unittest.TestCase):
+
+    def setUp(self):
+        self.registro = RegistroMetricas(ativo=True)
+
+    def test_inativo_nao_registra(self):
+        registro = RegistroMetricas()
+        with registro.span("busca", motor="binaria"):
+            pass
+        registro.contar("consultas")
+        registro.observar("carga", 1_000)
+        self.assertEqual((registro.contadores, registro.histogramas), ({}, {}))
+
+    def test_span_contar_e_observar(self):
+        with self.registro.span("busca", motor="binaria"):
+            pass
+        self.registro.contar("consultas", motor="binaria")
+        self.registro.contar("consultas", 2, motor="binaria")
+        self.registro.observar("busca", 5_000, motor="binaria")
+        self.assertEqual(self.registro.contadores, {("consultas", (("motor", "binaria"),)): 3})
+        self.assertEqual(self.registro.histogramas[("busca", (("motor", "binaria"),))].total, 2)
+        self.registro.limpar()
+        self.assertEqual((self.registro.contadores, self.registro.histogramas), ({}, {}))
+
+    def test_exportar_json(self):
+        self.registro.contar("consultas", motor="linear")
+        for nanossegundos in (1_000, 2_000, 3_000, 4_000):
+            self.registro.observar("busca", nanossegundos)
+        dados = self.registro.exportar_json()
+        self.assertEqual(dados["contadores"], [{"nome": "consultas", "rotulos": {"motor": "linear"}, "valor": 1}])
+        resumo = dados["histogramas"][0]
+        self.assertEqual((resumo["nome"], resumo["rotulos"], resumo["contagem"]), ("busca", {}, 4))
+        self.assertEqual((resumo["soma_ms"], resumo["max_us"]), (0.01, 4.0))
+        self.assertAlmostEqual(resumo["media_us"], 2.5)
+        self.assertAlmostEqual(resumo["p50_us"], 2.0, delta=0.02)
+        self.assertAlmostEqual(resumo["p99_us"], 4.0, delta=0.04)
+
+    def test_exportar_prometheus(self):
+        self.registro.contar("consultas", 3, motor='bin"aria')
+        self.registro.observar("busca", 500, fase="sql")        # 0,5 µs
+        self.registro.observar("busca", 2_000_000, fase="sql")  # 2 ms
+        linhas = self.registro.exportar_prometheus().splitlines()
+        self.assertEqual(linhas[:2], ["# TYPE ecommerce_consultas_total counter",
+                                      'ecommerce_consultas_total{motor="bin\\"aria"} 3'])
+        self.assertEqual(linhas[2], "# TYPE ecommerce_busca_seconds histogram")
+        faixas = {}
+        for linha in linhas[3:3 + len(FAIXAS_PROMETHEUS) + 1]:
+            rotulos, contagem = linha.rsplit(" ", 1)
+            self.assertTrue(rotulos.startswith('ecommerce_busca_seconds_bucket{fase="sql",le="'), linha)
+            faixas[rotulos.split('le="')[1].rstrip('"}')] = int(contagem)
+        self.assertEqual(faixas, {"1e-06": 1, "1e-05": 1, "0.0001": 1, "0.001": 1,
+                                  "0.01": 2, "0.1": 2, "1.0": 2, "10.0": 2, "+Inf": 2})
+        self.assertEqual(linhas[-2:], ['ecommerce_busca_seconds_sum{fase="sql"} 0.0020005',
+                                       'ecommerce_busca_seconds_count{fase="sql"} 2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+===========================================================
+TESTES DO CURSOR PAGINADO
+
+Descrição:
+    Confere as páginas do `CursorBusca` contra fatias de uma
+    lista (avançando, voltando e saltando), o limite de memória
+    de `materializar` e o cancelamento de fontes canceláveis.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import random
+import threading
+import unittest
+from src.paginacao import BuscaCancelada, CursorBusca, em_blocos
+
+
+POSICOES = list(range(0, 30_000, 3))
+
+
+class Posicoes:
+    """
+    Store cujo produto de cada posição é a própria posição.
+    """
+
+    @staticmethod
+    def produto(posicao):
+        return posicao
+
+
+def esperado(numero, tamanho, posicoes=POSICOES):
+    inicio = numero * tamanho
+    return posicoes[inicio:inicio + tamanho], inicio + tamanho < len(posicoes)
+
+
+class TesteCursorBusca(unittest.TestCase):
+
+    def test_paginas_equivalem_a_fatias(self):
+        cursor = CursorBusca(Posicoes(), lambda: iter(POSICOES))
+        gerador = random.Random(5)
+        numeros = [0, 1, 2, 2, 1, 0, 999, 1000, 1001, 5000, 3] + [gerador.randrange(1_100) for _ in range(300)]
+        for numero in numeros:
+            with self.subTest(numero=numero):
+                self.assertEqual(cursor.pagina(numero, 10), esperado(numero, 10))
+        self.assertEqual(cursor.total_conhecido, len(POSICOES))  # a última página foi alcançada
+        self.assertEqual(list(cursor), POSICOES)
+
+    def test_total_sob_demanda(self):
+        cursor = CursorBusca(Posicoes(), lambda: iter(POSICOES))
+        cursor.pagina(0, 10)
+        self.assertIsNone(cursor.total_conhecido)
+        self.assertEqual(cursor.contar(), len(POSICOES))
+        self.assertIsNone(cursor.posicoes)  # a contagem não guarda as posições
+
+    def test_materializar(self):
+        cursor = CursorBusca(Posicoes(), lambda: iter(POSICOES))
+        cursor.pagina(0, 10)
+        self.assertEqual(cursor.materializar(), len(POSICOES))
+        self.assertEqual(cursor.posicoes.typecode, "i")
+        self.assertIsNone(cursor._iterador)  # as páginas passam a ser fatias
+        self.assertEqual(cursor.tamanho_aproximado(), 256 + 4 * len(POSICOES))
+        self.assertEqual(cursor.pagina(7, 10), esperado(7, 10))
+
+    def test_materializar_acima_do_limite_apenas_conta(self):
+        cursor = CursorBusca(Posicoes(), lambda: iter(POSICOES))
+        self.assertEqual(cursor.materializar(maximo_bytes=4 * 1_000), len(POSICOES))
+        self.assertIsNone(cursor.posicoes)
+        self.assertEqual(cursor.tamanho_aproximado(), 256)
+        self.assertEqual(cursor.pagina(3, 10), esperado(3, 10))
+
+    def test_materializar_posicoes_acima_de_32_bits(self):
+        grandes = [1, 2 ** 40, 2 ** 40 + 1]
+        cursor = CursorBusca(Posicoes(), lambda: iter(grandes))
+        cursor.materializar()
+        self.assertEqual(cursor.posicoes.typecode, "q")
+        self.assertEqual(list(cursor.posicoes), grandes)
+
+    def test_cancelamento(self):
+        def fonte(cancelado):
+            for bloco in em_blocos(POSICOES, cancelado or threading.Event()):
+                yield from bloco
+
+        cursor = CursorBusca(Posicoes(), fonte, cancelavel=True)
+        cancelado = threading.Event()
+        cancelado.set()
+        with self.assertRaises(BuscaCancelada):
+            cursor.pagina(0, 10, cancelado)
+        self.assertIsNone(cursor.contar(cancelado))
+        self.assertIsNone(cursor.materializar(cancelado))
+        self.assertIsNone(cursor.total_conhecido)
+        self.assertEqual(cursor.pagina(1, 10), esperado(1, 10))  # a fonte é reiniciada
+
+    def test_paginas_em_varias_threads(self):
+        cursor = CursorBusca(Posicoes(), lambda: iter(POSICOES))
+        falhas = []
+
+        def paginar(semente):
+            gerador = random.Random(semente)
+            for _ in range(200):
+                numero = gerador.randrange(1_000)
+                if cursor.pagina(numero, 10) != esperado(numero, 10):
+                    falhas.append(numero)
+
+        threads = [threading.Thread(target=paginar, args=(semente,)) for semente in range(4)]
+        threads.append(threading.Thread(target=cursor.materializar))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(falhas, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
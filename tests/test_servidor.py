@@ -0,0 +1,117 @@
+"""
+===========================================================
+TESTES DO SERVIDOR HTTP/JSON
+
+Descrição:
+    Exercita as rotas do `ServidorBusca` sobre um ProductStore
+    pequeno em memória, chamando `responder` diretamente (sem
+    abrir uma porta), e o cancelamento da busca linear quando o
+    cliente fecha a conexão ou o tempo máximo passa.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import asyncio
+import json
+import time
+import unittest
+from src.armazenamento import ProductStore
+from src.indice_precos import IndicePrecos
+from src.indice_textual import IndiceTextual
+from src.servidor import ServidorBusca
+
+
+PRODUTOS = [  # (código, nome, preço), em ordem de código
+    (10_000_000, "Mouse Tech X123", 45.0),
+    (10_000_001, "Fone de Ouvido Prime X200", 90.5),
+    (10_000_002, "Cadeira Gamer Eco X999", 899.9),
+    (10_000_003, "Fone de Ouvido Tech X100", 150.0),
+    (10_000_004, "Teclado Hyper X120", 120.0),
+]
+
+
+class TesteServidor(unittest.TestCase):
+
+    def setUp(self):
+        self.produtos = ProductStore()
+        self.produtos.adicionar_lote(PRODUTOS)
+        self.servidor = ServidorBusca(self.produtos, IndiceTextual(self.produtos),
+                                      precos=IndicePrecos(self.produtos))
+        self.addCleanup(self.servidor.fechar)
+
+    def consultar(self, alvo, status=200, metodo="GET", corpo=b"", desconectado=None):
+        resposta = asyncio.run(self.servidor.responder(metodo, alvo, corpo, desconectado))
+        self.assertEqual(resposta[0], status, resposta[1])
+        return resposta[1]
+
+    def test_produto(self):
+        for motor in ("binaria", "linear"):
+            with self.subTest(motor=motor):
+                dados = self.consultar(f"/produto?codigo=10000003&motor={motor}")
+                self.assertTrue(dados["encontrado"])
+                self.assertEqual(dados["produto"], {"nome": "Fone de Ouvido Tech X100", "preco": 150.0,
+                                                    "codigo": 10_000_003})
+                self.assertFalse(self.consultar(f"/produto?codigo=1&motor={motor}")["encontrado"])
+        self.consultar("/produto?codigo=abc", 400)
+        self.consultar("/produto?codigo=1&motor=eytzinger", 400)
+
+    def test_lote(self):
+        esperado = [10_000_004, None, 10_000_004]
+        dados = self.consultar("/lote?codigos=10000004,1,10000004")
+        self.assertEqual([produto and produto["codigo"] for produto in dados["produtos"]], esperado)
+        corpo = json.dumps({"codigos": [10_000_004, 1, 10_000_004]}).encode()
+        dados = self.consultar("/lote", metodo="POST", corpo=corpo)
+        self.assertEqual(dados["encontrados"], 2)
+        self.consultar("/lote?codigos=", 400)
+        self.consultar("/lote", 400, metodo="POST", corpo=b'{"codigos": ["x"]}')
+
+    def test_busca_paginada(self):
+        primeira = self.consultar("/busca?q=Fone+de&tamanho=1")
+        segunda = self.consultar("/busca?q=de+fone&pagina=1&tamanho=1")
+        self.assertTrue(primeira["ha_mais"])
+        self.assertFalse(segunda["ha_mais"])
+        self.assertEqual(sorted(p["codigo"] for p in primeira["produtos"] + segunda["produtos"]),
+                         [10_000_001, 10_000_003])
+        self.assertEqual(self.consultar("/busca?q=zzz")["produtos"], [])
+        self.consultar("/busca?q=+", 400)
+        self.consultar("/busca?q=fone&tamanho=1000", 400)
+
+    def test_precos(self):
+        dados = self.consultar("/precos?min=50&max=200")
+        self.assertEqual([p["preco"] for p in dados["produtos"]], [90.5, 120.0, 150.0])
+        dados = self.consultar("/precos?min=50&ordem=decrescente&q=fone")
+        self.assertEqual([p["preco"] for p in dados["produtos"]], [150.0, 90.5])
+        self.consultar("/precos?ordem=aleatoria", 400)
+        self.consultar("/precos?min=x", 400)
+
+    def test_rotas_e_metodos(self):
+        self.assertEqual(self.consultar("/saude")["produtos"], len(PRODUTOS))
+        self.consultar("/inexistente", 404)
+        self.consultar("/busca?q=fone", 405, metodo="POST")
+        self.consultar("/atualizar", 405)
+        self.consultar("/atualizar", 404, metodo="POST")  # sem banco de origem
+        self.assertEqual(self.consultar("/estatisticas")["requisicoes"]["/saude"], 1)
+
+    def test_busca_linear_cancelada(self):
+        eventos = []
+
+        def busca_linear(codigo, cancelado):
+            eventos.append(cancelado)
+            return cancelado.wait(5), 0
+
+        self.produtos.busca_linear = busca_linear
+        inicio = time.perf_counter()
+        self.consultar("/produto?codigo=10000000&motor=linear", 503, desconectado=lambda: True)
+        self.servidor.tempo_maximo = 0.05
+        self.consultar("/produto?codigo=10000000&motor=linear", 503)
+        self.assertLess(time.perf_counter() - inicio, 2)
+        self.assertEqual(len(eventos), 2)
+        self.assertTrue(all(evento.is_set() for evento in eventos))
+
+
+if __name__ == "__main__":
+    unittest.main()
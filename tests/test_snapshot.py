@@ -0,0 +1,249 @@
+"""
+===========================================================
+TESTES DO SNAPSHOT E DA ATUALIZAÇÃO INCREMENTAL
+
+Descrição:
+    Verifica, sobre um banco pequeno gerado em um diretório
+    temporário, que:
+        - o snapshot (formato v2, nomes codificados por
+          dicionário) reabre exatamente os dados lidos do banco
+          e é descartado quando o banco muda;
+        - a carga não altera o banco;
+        - após uma atualização incremental (`src.atualizacao`,
+          ou a rota /atualizar do servidor),
+          os dados coincidem com uma nova carga do banco e as
+          buscas do `IndiceTextual` coincidem com uma varredura
+          dos nomes.
+
+Uso:
+    python -m unittest discover -s tests
+
+===========================================================
+"""
+
+
+import asyncio
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+from src.atualizacao import RecargaNecessaria, atualizar_dados, ler_versao, podar_alteracoes, preparar_rastreamento
+from src.database import carregar_dados
+from src.indice_precos import IndicePrecos
+from src.indice_textual import IndiceTextual
+from src.servidor import ServidorBusca
+from src.snapshot import abrir_snapshot, assinatura_banco, caminho_snapshot, salvar_snapshot
+
+
+# ===========================================================
+# DADOS DE TESTE
+# ===========================================================
+
+
+TOTAL_PRODUTOS = 2_000
+NOMES = ["Smartphone", "Notebook", "Teclado", "Mouse", "Monitor",
+         "Cadeira Gamer", "Fone de Ouvido", "Carregador", "Webcam", "Headset"]
+MARCAS = ["Tech", "Hyper", "Quantum", "Future", "Eco", "Stellar", "Prime", "Next"]
+TERMOS = ["mouse", "tech x1", "phon", "de ouvido", "x5", "e o", "novo", "renomeado prime", "zz"]
+
+
+def _nome(gerador):
+    return f"{gerador.choice(NOMES)} {gerador.choice(MARCAS)} X{gerador.randint(100, 999)}"
+
+
+def criar_banco(caminho_db, total, gerador):
+    """
+    Cria a tabela 'produtos' com códigos embaralhados.
+    """
+
+    codigos = list(range(10_000_000, 10_000_000 + total))
+    gerador.shuffle(codigos)
+    conn = sqlite3.connect(caminho_db)
+    conn.execute("CREATE TABLE produtos (id_produto INTEGER PRIMARY KEY, nome_produto TEXT NOT NULL, "
+                 "preco REAL NOT NULL, codigo_busca INTEGER)")
+    conn.executemany("INSERT INTO produtos VALUES (?, ?, ?, ?)",
+                     ((None, _nome(gerador), round(gerador.uniform(50, 5000), 2), codigo) for codigo in codigos))
+    conn.commit()
+    conn.close()
+
+
+def alterar_banco(caminho_db, gerador):
+    """
+    Insere, renomeia, altera preços e códigos e remove produtos.
+    """
+
+    conn = sqlite3.connect(caminho_db)
+    ids = [id_produto for (id_produto,) in conn.execute("SELECT id_produto FROM produtos")]
+    maior = conn.execute("SELECT MAX(codigo_busca) FROM produtos").fetchone()[0]
+    for id_produto in gerador.sample(ids, 60):
+        operacao = gerador.choice("inpcd")
+        if operacao == "i":
+            maior += 1
+            conn.execute("INSERT INTO produtos VALUES (NULL, ?, 9.9, ?)",
+                         (f"Produto Novo X{gerador.randint(100, 999)}", maior))
+        elif operacao == "n":
+            conn.execute("UPDATE produtos SET nome_produto = ? WHERE id_produto = ?",
+                         (f"Renomeado {gerador.choice(MARCAS)} X{gerador.randint(100, 999)}", id_produto))
+        elif operacao == "p":
+            conn.execute("UPDATE produtos SET preco = preco + 1 WHERE id_produto = ?", (id_produto,))
+        elif operacao == "c":
+            maior += 1
+            conn.execute("UPDATE produtos SET codigo_busca = ? WHERE id_produto = ?", (maior, id_produto))
+        else:
+            conn.execute("DELETE FROM produtos WHERE id_produto = ?", (id_produto,))
+    conn.commit()
+    conn.close()
+
+
+def carregar(caminho_db, usar_snapshot):
+    """
+    Carrega os dados sem as mensagens de andamento.
+    """
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return carregar_dados(caminho_db, usar_snapshot=usar_snapshot, progresso=lambda *_: None)
+
+
+def varrer(produtos, termo):
+    """
+    Códigos dos produtos cujo nome contém todas as palavras do
+    termo (semântica da busca textual original).
+    """
+
+    palavras = termo.lower().split()
+    return sorted(codigo for nome, _, codigo in produtos if all(palavra in nome.lower() for palavra in palavras))
+
+
+def codigos_encontrados(produtos, posicoes):
+    return sorted(produtos.produto(posicao)[2] for posicao in posicoes)
+
+
+# ===========================================================
+# TESTES
+# ===========================================================
+
+
+class TesteSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.caminho_db = os.path.join(diretorio.name, "teste.db")
+        self.gerador = random.Random(22)
+        criar_banco(self.caminho_db, TOTAL_PRODUTOS, self.gerador)
+
+    def test_snapshot_reabre_os_dados_do_banco(self):
+        produtos = carregar(self.caminho_db, usar_snapshot=False)
+        salvar_snapshot(produtos, self.caminho_db)
+        aberto = abrir_snapshot(self.caminho_db)
+
+        self.assertIsNotNone(aberto)
+        self.assertEqual(len(aberto), TOTAL_PRODUTOS)
+        self.assertEqual(list(aberto), list(produtos))
+        self.assertEqual(aberto.nomes.distintos, produtos.nomes.distintos)
+        for codigo in self.gerador.sample(list(produtos.codigos), 50) + [1, 10 ** 11]:
+            self.assertEqual(aberto.busca_binaria(codigo)[0], produtos.busca_binaria(codigo)[0])
+
+        indice, indice_aberto = IndiceTextual(produtos), IndiceTextual(aberto)
+        for termo in TERMOS:
+            with self.subTest(termo=termo):
+                self.assertEqual(codigos_encontrados(aberto, indice_aberto.buscar(termo)), varrer(produtos, termo))
+                self.assertEqual(codigos_encontrados(produtos, indice.buscar(termo)), varrer(produtos, termo))
+
+    def test_snapshot_descartado_quando_o_banco_muda(self):
+        carregar(self.caminho_db, usar_snapshot=True)
+        self.assertTrue(os.path.exists(caminho_snapshot(self.caminho_db)))
+        self.assertIsNotNone(abrir_snapshot(self.caminho_db))
+
+        alterar_banco(self.caminho_db, self.gerador)
+        self.assertIsNone(abrir_snapshot(self.caminho_db))
+
+    def test_carga_nao_altera_o_banco(self):
+        antes = assinatura_banco(self.caminho_db)
+        produtos = carregar(self.caminho_db, usar_snapshot=False)
+        self.assertIsNone(produtos.versao)  # rastreamento não ativado
+        self.assertEqual(assinatura_banco(self.caminho_db), antes)
+
+    def test_atualizacao_equivale_a_nova_carga_e_a_varredura(self):
+        self.assertTrue(preparar_rastreamento(self.caminho_db))
+        carregar(self.caminho_db, usar_snapshot=True)
+        produtos = carregar(self.caminho_db, usar_snapshot=True)  # colunas mapeadas do snapshot
+        self.assertIsNotNone(produtos.mapa)
+        indice = IndiceTextual(produtos)
+
+        for _ in range(3):
+            alterar_banco(self.caminho_db, self.gerador)
+            atualizar_dados(produtos, self.caminho_db, indice)
+
+            recarregado = carregar(self.caminho_db, usar_snapshot=False)
+            self.assertEqual(list(produtos), list(recarregado))
+            for termo in TERMOS:
+                with self.subTest(termo=termo):
+                    esperado = varrer(recarregado, termo)
+                    self.assertEqual(codigos_encontrados(produtos, indice.buscar(termo)), esperado)
+                    self.assertEqual(codigos_encontrados(produtos, indice.cursor(termo)), esperado)
+
+    def test_poda_preserva_os_leitores_atrasados(self):
+        self.assertTrue(preparar_rastreamento(self.caminho_db))
+        atrasado = carregar(self.caminho_db, usar_snapshot=False)
+        alterar_banco(self.caminho_db, self.gerador)
+        recente = carregar(self.caminho_db, usar_snapshot=False)
+        alterar_banco(self.caminho_db, self.gerador)
+
+        # Abaixo do limite, atualizar não grava no banco
+        antes = assinatura_banco(self.caminho_db)
+        atualizar_dados(recente, self.caminho_db)
+        self.assertEqual(assinatura_banco(self.caminho_db), antes)
+
+        conn = sqlite3.connect(self.caminho_db)
+        ultima = ler_versao(conn)[1]
+        conn.close()
+        manter = ultima - atrasado.versao[1] - 1
+        self.assertEqual(podar_alteracoes(self.caminho_db, manter=manter, limite=ultima), 0)
+        self.assertEqual(podar_alteracoes(self.caminho_db, manter=manter, limite=manter), ultima - manter)
+
+        alterar_banco(self.caminho_db, self.gerador)
+        atualizar_dados(recente, self.caminho_db)
+        self.assertEqual(list(recente), list(carregar(self.caminho_db, usar_snapshot=False)))
+        with self.assertRaises(RecargaNecessaria):
+            atualizar_dados(atrasado, self.caminho_db)
+
+    def test_servidor_atualiza_os_indices(self):
+        def servidor(produtos):
+            return ServidorBusca(produtos, IndiceTextual(produtos), trabalhadores=0,
+                                 precos=IndicePrecos(produtos), caminho_db=self.caminho_db)
+
+        def consultar(servidor, alvo, metodo="GET"):
+            status, dados = asyncio.run(servidor.responder(metodo, alvo, b""))
+            self.assertEqual(status, 200, dados)
+            return dados
+
+        def resultados(servidor):
+            # Empates de preço e a busca por nome seguem a ordem das
+            # linhas, que difere entre o store atualizado e uma nova carga
+            saida = []
+            for alvo in ("/precos?min=100&max=900&tamanho=100", "/precos?max=60&ordem=decrescente&tamanho=100",
+                         "/precos?min=9&max=10&tamanho=100", "/precos?min=100&max=3000&q=tech&tamanho=100",
+                         "/busca?q=renomeado&tamanho=100"):
+                produtos = consultar(servidor, alvo)["produtos"]
+                precos = [p["preco"] for p in produtos] if alvo.startswith("/precos") else None
+                saida.append((precos, sorted((p["codigo"], p["preco"]) for p in produtos)))
+            return saida
+
+        self.assertTrue(preparar_rastreamento(self.caminho_db))
+        atualizado = servidor(carregar(self.caminho_db, usar_snapshot=False))
+        self.addCleanup(atualizado.fechar)
+        resultados(atualizado)  # cursores e totais no cache
+        for _ in range(2):
+            alterar_banco(self.caminho_db, self.gerador)
+            self.assertGreater(consultar(atualizado, "/atualizar", "POST")["alterados"], 0)
+            novo = servidor(carregar(self.caminho_db, usar_snapshot=False))
+            self.addCleanup(novo.fechar)
+            self.assertEqual(resultados(atualizado), resultados(novo))
+
+
+if __name__ == "__main__":
+    unittest.main()